@@ -16,5 +16,6 @@ setup(
     packages=find_packages("src"),
     package_dir={"": "src"},
     python_requires=">=3.6",
+    extras_require={"batch": ["numpy>=1.17"], "parquet": ["pyarrow"]},
     tests_require=["hypothesis", "pytest", "pytest-cov"],
 )
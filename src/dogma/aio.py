@@ -0,0 +1,81 @@
+"""An asynchronous game loop, for players whose decisions are waited on.
+
+These functions play a `DogmaGame` through the same steps as its own methods
+do, except that any decision a player makes may be a coroutine, such as a
+bot answering over a socket or a person in a browser. Decisions that return
+at once are used as they are, so ordinary players can sit at the same table.
+Every vote in a round is waited on at the same time, and any number of games
+can share one event loop without a thread for each."""
+
+import asyncio
+import inspect
+
+from .game import ADJOURNED, METHODS
+
+
+async def decide(method, *args):
+    """Ask for a decision, waiting on it if it has to be waited on."""
+
+    answer = method(*args)
+    if inspect.isawaitable(answer):
+        answer = await answer
+
+    return answer
+
+
+async def run(steps):
+    """Play out one of the generators of decisions of a `DogmaGame`, as
+    `DogmaGame.run` does, but waiting on each decision, with everyone voting
+    at the same time. Returns what the generator does."""
+
+    answer = None
+    while True:
+        try:
+            kind, player, args = steps.send(answer)
+        except StopIteration as stop:
+            return stop.value
+
+        if kind == "vote":
+            answer = await asyncio.gather(
+                *(decide(voter.vote, *args) for voter in player)
+            )
+        else:
+            answer = await decide(getattr(player, METHODS[kind]), *args)
+
+
+async def turn(game):
+    """Play a complete turn of the game."""
+
+    return await run(game.turn_steps())
+
+
+async def play(game, max_turns=None):
+    """Play a game until one team wins, or until `max_turns` have passed, as
+    in `DogmaGame.play`."""
+
+    game.assign_roles()
+    game.inform_mavericks()
+
+    return await play_turns(game, max_turns)
+
+
+async def play_turns(game, max_turns=None):
+    """Play the turns of a game whose roles have been handed out, until one
+    team wins or `max_turns` have passed."""
+
+    no_winner = True
+    while no_winner:
+        if game.turns == max_turns:
+            game.end(ADJOURNED)
+            break
+
+        no_winner = not await turn(game)
+
+    return game.winner, game.message
+
+
+async def play_games(games, max_turns=None):
+    """Play many games at once on the running event loop. Returns the winner
+    and message of each game."""
+
+    return await asyncio.gather(*(play(game, max_turns) for game in games))
@@ -0,0 +1,343 @@
+"""A columnar archive of the full histories of many games.
+
+An archive is a directory of flat binary files, one for each column, in the
+machine's own byte order. The events of every game are stored one after
+another, split into four columns of one byte each: the code of each event
+and its three bytes of detail, as in `dogma.events`. Each game then has a
+row in the game columns below, and its events run from its offset to the
+next one.
+
+    ================= ====== ===============================================
+    File              Type   Contents
+    ================= ====== ===============================================
+    code, a, b, c     uint8  the events of every game, one after another
+    offset            uint64 where the events of each game start, and one
+                             more for where the last game ends
+    seed              int64  the seed of each game
+    players           uint8  the number of players in each game
+    turns             uint32 the number of turns each game took
+    outcome           uint8  the index of each outcome in `OUTCOMES`
+    publications_h    uint8  the heliocentric journals published
+    publications_g    uint8  the geocentric journals published
+    index_seed        int64  the seeds, in order
+    index_game        uint64 the game with each of those seeds
+    ================= ====== ===============================================
+
+Games are written in batches, as with the sinks of `dogma.results`. The
+offsets are written last, so a batch only counts once its offsets are on
+disk, and anything after the last complete batch is cut off when the
+archive is opened again. The seed index is rebuilt whenever a writer closes.
+
+An `Archive` opens every column with `mmap`, so looking up one game, or
+picking out games by their winner, reads only the pages it needs. Each
+column is a `memoryview`, which `numpy.frombuffer` can wrap without a copy.
+"""
+
+import bisect
+import json
+import mmap
+import os
+import sys
+from array import array
+
+from .events import EventLog
+from .game import OUTCOMES
+from .results import Sink, record_games, remaining
+
+FORMAT = 1
+EVENT_COLUMNS = {"code": "B", "a": "B", "b": "B", "c": "B"}
+GAME_COLUMNS = {
+    "seed": "q",
+    "players": "B",
+    "turns": "I",
+    "outcome": "B",
+    "publications_h": "B",
+    "publications_g": "B",
+}
+INDEX_COLUMNS = {"index_seed": "q", "index_game": "Q"}
+COLUMNS = dict(EVENT_COLUMNS, offset="Q", **GAME_COLUMNS, **INDEX_COLUMNS)
+
+
+def column_path(path, name):
+    """Get the path of the file for a column of an archive."""
+
+    return os.path.join(path, f"{name}.bin")
+
+
+def append(path, data):
+    """Add bytes to the end of a file and sync it to disk."""
+
+    with open(path, "ab") as file:
+        file.write(data)
+        file.flush()
+        os.fsync(file.fileno())
+
+
+class ArchiveSink(Sink):
+    """A sink that writes records made with `history` to an archive at
+    `path`, in batches of `batch_size` games."""
+
+    def __init__(self, path, batch_size=1024):
+
+        super().__init__(path, batch_size)
+        os.makedirs(path, exist_ok=True)
+
+        header = os.path.join(path, "archive.json")
+        if not os.path.exists(header):
+            with open(header, "w") as file:
+                json.dump(
+                    {
+                        "format": FORMAT,
+                        "byteorder": sys.byteorder,
+                        "columns": COLUMNS,
+                    },
+                    file,
+                )
+
+        self.trim("offset")
+        offsets = self.read("offset")
+        if not offsets:
+            offsets = array("Q", [0])
+            append(column_path(path, "offset"), offsets.tobytes())
+
+        self.games = len(offsets) - 1
+        self.events = offsets[-1]
+        self.repair()
+
+    def read(self, name):
+        """Read a whole column into an array."""
+
+        column = array(COLUMNS[name])
+        path = column_path(self.path, name)
+        if os.path.exists(path):
+            with open(path, "rb") as file:
+                column.frombytes(file.read())
+
+        return column
+
+    def trim(self, name, length=None):
+        """Cut a column back to `length` items, or to its last whole item if
+        no length is given."""
+
+        itemsize = array(COLUMNS[name]).itemsize
+        with open(column_path(self.path, name), "ab") as file:
+            if length is None:
+                length = file.tell() // itemsize
+            file.truncate(length * itemsize)
+
+    def repair(self):
+        """Cut every column back to the last batch that was committed, and
+        the offsets back to the last whole one."""
+
+        lengths = dict.fromkeys(EVENT_COLUMNS, self.events)
+        lengths.update(dict.fromkeys(GAME_COLUMNS, self.games))
+        for name, length in lengths.items():
+            self.trim(name, length)
+
+    def commit(self, records):
+
+        events = b"".join(record["events"] for record in records)
+        for position, name in enumerate(EVENT_COLUMNS):
+            append(column_path(self.path, name), events[position::4])
+
+        for name, typecode in GAME_COLUMNS.items():
+            if name == "outcome":
+                values = [
+                    OUTCOMES.index((record["winner"], record["message"]))
+                    for record in records
+                ]
+            else:
+                values = [record[name] for record in records]
+            append(
+                column_path(self.path, name), array(typecode, values).tobytes()
+            )
+
+        offsets = array("Q")
+        for record in records:
+            self.events += len(record["events"]) // 4
+            offsets.append(self.events)
+        append(column_path(self.path, "offset"), offsets.tobytes())
+        self.games += len(records)
+
+    def close(self):
+        """Write out the last batch, and rebuild the seed index."""
+
+        super().close()
+
+        seeds = self.read("seed")
+        games = sorted(range(len(seeds)), key=seeds.__getitem__)
+        for name, values in (
+            ("index_seed", [seeds[game] for game in games]),
+            ("index_game", games),
+        ):
+            temporary = column_path(self.path, f".{name}")
+            with open(temporary, "wb") as file:
+                array(COLUMNS[name], values).tofile(file)
+            os.replace(temporary, column_path(self.path, name))
+
+    def last_seed(self):
+
+        if not self.games:
+            return None
+
+        return self.read("seed")[-1]
+
+
+class Archive:
+    """An archive opened for reading, with each column mapped into memory.
+    Games are numbered in the order they were written."""
+
+    def __init__(self, path):
+
+        self.path = path
+        with open(os.path.join(path, "archive.json")) as file:
+            header = json.load(file)
+        if header["format"] != FORMAT or header["byteorder"] != sys.byteorder:
+            raise ValueError(f"Cannot read the archive at {path}.")
+
+        self.maps = []
+        self.columns = {}
+        for name, typecode in COLUMNS.items():
+            view = self.open(name)
+            stop = len(view) - len(view) % array(typecode).itemsize
+            self.columns[name] = view[:stop].cast(typecode)
+
+        self.games = len(self.columns["offset"]) - 1
+        if len(self.columns["index_seed"]) != self.games:
+            self.columns["index_seed"] = self.columns["index_game"] = None
+
+    def open(self, name):
+        """Map the file for a column into memory."""
+
+        path = column_path(self.path, name)
+        if not os.path.exists(path) or not os.path.getsize(path):
+            return memoryview(b"")
+
+        with open(path, "rb") as file:
+            memory = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.maps.append(memory)
+
+        return memoryview(memory)
+
+    def __enter__(self):
+
+        return self
+
+    def __exit__(self, *exc_info):
+
+        self.close()
+
+    def __len__(self):
+
+        return self.games
+
+    def __getitem__(self, game):
+        """Get the record of a game, with its event log."""
+
+        if not 0 <= game < self.games:
+            raise IndexError(f"There is no game {game} in the archive.")
+
+        columns = self.columns
+        outcome = columns["outcome"][game]
+        winner, message = OUTCOMES[outcome]
+        record = {name: columns[name][game] for name in GAME_COLUMNS}
+        record.update(winner=winner, message=message, log=self.log(game))
+
+        return record
+
+    def close(self):
+        """Let go of every column."""
+
+        for column in self.columns.values():
+            if column is not None:
+                column.release()
+        for memory in self.maps:
+            memory.close()
+        self.columns, self.maps = {}, []
+
+    def column(self, name):
+        """Get a column as a `memoryview`, trimmed to the games committed.
+        Release it before closing the archive."""
+
+        stop = self.columns["offset"][self.games]
+        if name == "offset":
+            stop = self.games + 1
+        elif name in GAME_COLUMNS:
+            stop = self.games
+
+        return self.columns[name][:stop]
+
+    def log(self, game):
+        """Get the event log of a game, read from its stretch of each event
+        column."""
+
+        offsets = self.columns["offset"]
+        start, stop = offsets[game], offsets[game + 1]
+        data = bytearray(4 * (stop - start))
+        for position, name in enumerate(EVENT_COLUMNS):
+            data[position::4] = self.columns[name][start:stop]
+
+        return EventLog(data)
+
+    def find(self, seed):
+        """Get the number of the game with a seed, by a binary search of the
+        seed index. Without an index, the seeds are searched one by one."""
+
+        seeds, games = self.columns["index_seed"], self.columns["index_game"]
+        if seeds is None:
+            for game, other in enumerate(self.column("seed")):
+                if other == seed:
+                    return game
+        else:
+            position = bisect.bisect_left(seeds, seed)
+            if position < len(seeds) and seeds[position] == seed:
+                return games[position]
+
+        raise KeyError(f"There is no game with seed {seed} in the archive.")
+
+    def select(self, winner=False, outcome=None):
+        """Iterate over the numbers of the games won by `winner` ("C", "M" or
+        `None` for no winner), or that ended with `outcome` from `OUTCOMES`,
+        reading only the outcome column. Either may be left out."""
+
+        wanted = {
+            index
+            for index, result in enumerate(OUTCOMES)
+            if result is not None
+            and (outcome is None or index == outcome)
+            and (winner is False or result[0] == winner)
+        }
+        for game, index in enumerate(self.column("outcome")):
+            if index in wanted:
+                yield game
+
+
+def stream_archive(
+    path,
+    strategies=None,
+    number_of_players=5,
+    seeds=range(1000),
+    max_turns=1000,
+    processes=1,
+    batch_size=1024,
+):
+    """Play a game for each seed and stream its history to an archive at
+    `path`, as `stream_results` does with records. Returns the number of
+    games written."""
+
+    count = 0
+    with ArchiveSink(path, batch_size) as sink:
+        seeds = remaining(seeds, sink.resume())
+        records = record_games(
+            strategies,
+            number_of_players,
+            seeds,
+            max_turns,
+            processes,
+            history=True,
+        )
+        for record in records:
+            sink.write(record)
+            count += 1
+
+    return count
@@ -0,0 +1,413 @@
+"""A vectorised engine for playing many games between `Random` players at once.
+
+When every player decides at random, nobody ever makes use of the order of the
+cards in the deck, so each game can be described by a handful of counters: how
+many of each card there are in the deck, the discard pile and the publications,
+along with the pressure to print and who is sitting where. The `BatchGame`
+class keeps those counters in NumPy arrays and plays every game in a batch in
+lockstep, one turn at a time, following the same rules as `DogmaGame.turn`.
+"""
+
+import multiprocessing
+from collections import Counter
+
+import numpy as np
+
+from .game import (
+    ADJOURNED,
+    ALTERED,
+    EXHAUSTED,
+    ONGOING,
+    OUSTED,
+    OUTCOMES,
+    QUELLED,
+    RHETORIC,
+    STANDARD,
+)
+
+STATE = (
+    "deck_h",
+    "deck_g",
+    "discard_h",
+    "discard_g",
+    "publications_h",
+    "publications_g",
+    "pressure_to_print",
+    "overrule_available",
+    "galileo",
+    "alive",
+    "dean",
+    "_dean",
+    "ex_dean",
+    "ex_editor",
+    "outcomes",
+)
+
+
+def make_tables(number_of_players):
+    """Precompute lookup tables over every set of seats, written as a bitmask.
+    These give the number of seats in each set, the seat of each rank within
+    a set, and the next seat in a set clockwise from any other seat."""
+
+    size = 2**number_of_players
+    seats = range(number_of_players)
+    counts = np.zeros(size, dtype=np.int8)
+    ranked = np.zeros((size, number_of_players), dtype=np.int8)
+    following = np.zeros((size, number_of_players), dtype=np.int8)
+
+    for mask in range(size):
+        members = [seat for seat in seats if mask >> seat & 1]
+        counts[mask] = len(members)
+        ranked[mask, : len(members)] = members
+        for seat in seats:
+            following[mask, seat] = next(
+                (
+                    (seat + step) % number_of_players
+                    for step in range(1, number_of_players + 1)
+                    if mask >> (seat + step) % number_of_players & 1
+                ),
+                seat,
+            )
+
+    return counts, ranked.ravel(), following.ravel()
+
+
+class BatchGame:
+    """A batch of games between `Random` players, played in lockstep. Each
+    element of the state arrays belongs to one game, and sets of seats (such as
+    those not yet denounced) are stored as bitmasks. Finished games are
+    dropped from the arrays every so often, and their outcomes are tallied in
+    `results`, which is indexed by the codes in `OUTCOMES`. The games are
+    played by the standard rules unless others are given as `rules`."""
+
+    def __init__(
+        self, number_of_players, number_of_games, seed=None, rules=STANDARD
+    ):
+
+        self.number_of_players = number_of_players
+        self.rules = rules
+        self.random = np.random.default_rng(seed)
+        self.results = np.zeros(len(OUTCOMES), dtype=np.int64)
+        self.turns = 0
+
+        self.counts, self.ranked, self.following = make_tables(
+            number_of_players
+        )
+
+        size = number_of_games
+        self.deck_h = np.full(size, rules.journals_h, dtype=np.int8)
+        self.deck_g = np.full(size, rules.journals_g, dtype=np.int8)
+        self.discard_h = np.zeros(size, dtype=np.int8)
+        self.discard_g = np.zeros(size, dtype=np.int8)
+        self.publications_h = np.zeros(size, dtype=np.int8)
+        self.publications_g = np.zeros(size, dtype=np.int8)
+        self.pressure_to_print = np.zeros(size, dtype=np.int8)
+        self.overrule_available = np.zeros(size, dtype=bool)
+
+        seats = self.random.integers(number_of_players, size=size)
+        self.galileo = seats.astype(np.int8)
+        self.alive = np.full(size, 2**number_of_players - 1, dtype=np.int64)
+        self.dean = np.full(size, -1, dtype=np.int8)
+        self._dean = np.zeros(size, dtype=np.int64)
+        self.ex_dean = np.zeros(size, dtype=np.int64)
+        self.ex_editor = np.zeros(size, dtype=np.int64)
+        self.outcomes = np.zeros(size, dtype=np.int8)
+        self.ongoing = size
+
+    def __len__(self):
+
+        return len(self.dean)
+
+    def elect_first_dean(self):
+        """Select the first dean of every game uniformly at random."""
+
+        seats = self.random.integers(self.number_of_players, size=len(self))
+        self.dean = seats.astype(np.int8)
+        self._dean = 1 << seats
+
+    def set_next_dean(self):
+        """Move each dean on to the next player clockwise who has not been
+        denounced."""
+
+        index = self.alive * self.number_of_players + self.dean
+        self.dean = self.following[index]
+        self._dean = 1 << self.dean.astype(np.int64)
+
+    def _get_players_for_nomination(self):
+        """Get the set of players that can be nominated in each game."""
+
+        excluded = self._dean | self.ex_editor
+        if self.number_of_players != 5:
+            excluded |= self.ex_dean
+
+        return self.alive & ~excluded
+
+    def _get_players_for_denouncement(self):
+        """Get the set of players that can be denounced in each game."""
+
+        return self.alive & ~self._dean
+
+    def _choose(self, masks):
+        """Choose a seat uniformly from each of a number of sets."""
+
+        counts = self.counts[masks]
+        ranks = self.random.random(len(masks)) * counts
+
+        return self.ranked[masks * self.number_of_players + ranks.astype(int)]
+
+    def cast_vote(self):
+        """Have every remaining player vote at random. Returns a mask of the
+        games in which the vote was successful."""
+
+        votes = self.random.integers(2**self.number_of_players, size=len(self))
+        ayes = self.counts[votes & self.alive]
+        successful = 2 * ayes > self.counts[self.alive]
+        self.pressure_to_print += ~successful
+
+        return successful
+
+    def _reshuffle(self, mask, num):
+        """Shuffle the discard pile back into the deck in those games picked out
+        by `mask` that have fewer than `num` cards left to draw. Returns a mask
+        of the games that still do not have enough cards."""
+
+        short = mask & (self.deck_h + self.deck_g < num)
+        self.deck_h += short * self.discard_h
+        self.deck_g += short * self.discard_g
+        self.discard_h[short] = 0
+        self.discard_g[short] = 0
+
+        return mask & (self.deck_h + self.deck_g < num)
+
+    def draw_journals(self, mask, num=3):
+        """Draw journal cards, one at a time, in those games picked out by
+        `mask`, which must all have enough cards left. Returns a mask for each
+        card drawn, in order, of the games where it was heliocentric. Games
+        that are not drawing, or that have drawn all of their `num` cards,
+        are left out of the later masks."""
+
+        uniform = self.random.random((int(np.max(num)), len(self)))
+        num = mask * np.asarray(num, dtype=np.int8)
+
+        cards = []
+        for position, uniform_ in enumerate(uniform):
+            drawing = num > position
+            heliocentric = drawing & (
+                uniform_ * (self.deck_h + self.deck_g) < self.deck_h
+            )
+            self.deck_h -= heliocentric
+            self.deck_g -= drawing & ~heliocentric
+            cards.append(heliocentric)
+
+        return cards
+
+    def form_publication(self, printing):
+        """Have each print team discard a card at random in turn, with the
+        option to overrule if it is available. Returns masks of the games in
+        which the team overruled, and those in which a heliocentric journal was
+        published.
+
+        Each player rejects a card uniformly at random, so the card kept, the
+        editor's rejection and the dean's rejection are just the three cards
+        drawn, in the order they were drawn."""
+
+        kept_h, editor_rejects_h, dean_rejects_h = self.draw_journals(printing)
+        self.discard_h += dean_rejects_h
+        self.discard_g += printing & ~dean_rejects_h
+
+        uniform = self.random.random((2, len(self)))
+        suggested = self.overrule_available & (uniform[0] < 0.5)
+        overruled = printing & suggested & (uniform[1] < 0.5)
+        self.pressure_to_print += 2 * overruled
+
+        published = printing & ~overruled
+        self.discard_h += published & editor_rejects_h
+        self.discard_g += published & ~editor_rejects_h
+
+        self.publications_h += published & kept_h
+        self.publications_g += published & ~kept_h
+        self.pressure_to_print[published] = 0
+
+        return overruled, published & kept_h
+
+    def emergency_publication(self, emergency):
+        """Publish the top card of the deck in those games picked out by
+        `emergency`, reshuffling the discard pile into an empty deck first.
+        Returns a mask of the games without a card to publish."""
+
+        exhausted = self._reshuffle(emergency, 1)
+        emergency = emergency & ~exhausted
+
+        heliocentric = self.draw_journals(emergency, 1)[0]
+
+        self.publications_h += emergency & heliocentric
+        self.publications_g += emergency & ~heliocentric
+        self.pressure_to_print[emergency] = 0
+
+        return exhausted
+
+    def perform_emergency_actions(self, actions):
+        """Peek at, denounce or unlock the overrule in those games picked out
+        by `actions`, according to the number of maverick publications and
+        the rules. Returns masks of the games where the deck ran out and where
+        Galileo was denounced."""
+
+        rules, published = self.rules, self.publications_h
+        peek = actions & np.isin(published, rules.peek)
+        exhausted = self._reshuffle(peek, 3)
+
+        denouncing = actions & np.isin(published, rules.denounce)
+        denounced = self._choose(self._get_players_for_denouncement())
+        self.alive &= ~(denouncing << denounced.astype(np.int64))
+        ousted = denouncing & (denounced == self.galileo)
+
+        self.overrule_available |= (
+            actions & np.isin(published, rules.overrule) & ~ousted
+        )
+
+        return exhausted, ousted
+
+    def turn(self):
+        """Play a complete turn of every game in the batch."""
+
+        self.turns += 1
+        if self.turns == 1:
+            self.elect_first_dean()
+        else:
+            self.set_next_dean()
+
+        nomination = self._choose(self._get_players_for_nomination())
+        successful = self.cast_vote()
+
+        rules = self.rules
+        outcomes = np.zeros(len(self), dtype=np.int8)
+        rhetoric = (
+            successful
+            & (nomination == self.galileo)
+            & (self.publications_h >= rules.rhetoric)
+        )
+        outcomes[rhetoric] = RHETORIC
+
+        printing = successful & ~rhetoric
+        exhausted = self._reshuffle(printing, 3)
+        outcomes[exhausted] = EXHAUSTED
+
+        printing &= ~exhausted
+        overruled, heliocentric = self.form_publication(printing)
+        published = printing & ~overruled
+        self.ex_dean = np.where(published, self._dean, self.ex_dean)
+        self.ex_editor = np.where(
+            published, 1 << nomination.astype(np.int64), self.ex_editor
+        )
+
+        playing = (outcomes == ONGOING) & ~overruled
+        emergency = playing & (self.pressure_to_print == rules.pressure)
+        outcomes[self.emergency_publication(emergency)] = EXHAUSTED
+
+        playing = (outcomes == ONGOING) & ~overruled
+        altered = playing & (self.publications_h >= rules.win_h)
+        quelled = playing & ~altered & (self.publications_g >= rules.win_g)
+        outcomes[altered] = ALTERED
+        outcomes[quelled] = QUELLED
+
+        actions = playing & ~altered & ~quelled & heliocentric
+        exhausted, ousted = self.perform_emergency_actions(actions)
+        outcomes[exhausted] = EXHAUSTED
+        outcomes[ousted] = OUSTED
+
+        self._finish(outcomes)
+
+    def _finish(self, outcomes):
+        """Record the outcomes of those games that have just finished. Their
+        rows are left in place, to be ignored, until at least half of the batch
+        has finished and it is worth dropping them."""
+
+        finished = (outcomes != ONGOING) & (self.outcomes == ONGOING)
+        self.outcomes[finished] = outcomes[finished]
+        self.ongoing -= np.count_nonzero(finished)
+
+        if 2 * self.ongoing <= len(self):
+            self._compact()
+
+    def _compact(self):
+        """Tally the outcomes of the finished games, and drop them from the
+        batch."""
+
+        finished = self.outcomes != ONGOING
+        self.results += np.bincount(
+            self.outcomes[finished], minlength=len(OUTCOMES)
+        )
+        for name in STATE:
+            setattr(self, name, getattr(self, name)[~finished])
+
+    def play(self, max_turns=None):
+        """Play every game in the batch until it is won, or abandon it after
+        `max_turns` turns. Returns a `Counter` of `(winner, message)` pairs
+        like those from `DogmaGame.play`."""
+
+        while self.ongoing:
+            if self.turns == max_turns:
+                self._finish(np.full(len(self), ADJOURNED, dtype=np.int8))
+                break
+
+            self.turn()
+
+        return Counter(
+            {
+                outcome: int(count)
+                for outcome, count in zip(OUTCOMES, self.results)
+                if count
+            }
+        )
+
+
+def play_batch(batch):
+    """Play a batch of games, given as a tuple of `(number_of_players,
+    number_of_games, seed, max_turns, rules)`, and return the counts of their
+    results."""
+
+    number_of_players, number_of_games, seed, max_turns, rules = batch
+    game = BatchGame(number_of_players, number_of_games, seed, rules)
+
+    return game.play(max_turns)
+
+
+def simulate(
+    number_of_players,
+    number_of_games,
+    seed=None,
+    max_turns=None,
+    size=2**16,
+    processes=1,
+    rules=STANDARD,
+):
+    """Play `number_of_games` games between `Random` players by `rules` in
+    batches of at most `size` games, so that memory use is bounded however
+    many games are played. Each batch has its own seed, spawned from `seed`,
+    so the results are the same however many processes the batches are
+    spread across.
+    Returns a `Counter` of the `(winner, message)` pairs of the games."""
+
+    starts = range(0, number_of_games, size)
+    seeds = np.random.SeedSequence(seed).spawn(len(starts))
+    batches = (
+        (
+            number_of_players,
+            min(size, number_of_games - start),
+            seed_,
+            max_turns,
+            rules,
+        )
+        for start, seed_ in zip(starts, seeds)
+    )
+
+    results = Counter()
+    if processes == 1:
+        for counts in map(play_batch, batches):
+            results.update(counts)
+    else:
+        with multiprocessing.Pool(processes) as pool:
+            for counts in pool.imap_unordered(play_batch, batches):
+                results.update(counts)
+
+    return results
@@ -0,0 +1,216 @@
+"""A benchmark suite for the hot paths of a game, and for whole games.
+
+Each micro-benchmark times one method of `DogmaGame` on fresh clones of a game
+whose print team has just been voted in, so setting the game up is not
+counted. Whole games are timed with `Random` players at five and six players,
+along with the peak memory allocated while playing a game.
+
+Run as a script to save the results as JSON, and to compare them with a
+baseline saved the same way::
+
+    python -m dogma.benchmark --output results.json \\
+        --baseline benchmarks/baseline.json
+
+The script exits with a status of one if anything has slowed down by more
+than the threshold."""
+
+import argparse
+import gc
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+from .game import DogmaGame
+from .strategies import Random
+from .tournament import play_game
+
+PLAYER_COUNTS = (5, 6)
+
+
+def prepared_game(number_of_players=5, seed=0):
+    """Set up a game of `Random` players as it is just after its first print
+    team has been voted in."""
+
+    players = [Random(str(seat)) for seat in range(number_of_players)]
+    game = DogmaGame(players, seed)
+    game.assign_roles()
+    game.inform_mavericks()
+    game.elect_first_dean()
+    game.editor = game.form_print_team()
+
+    return game
+
+
+def cast_vote(game):
+    """Put the sitting print team to a vote."""
+
+    return game.cast_vote(game.editor)
+
+
+MICRO_BENCHMARKS = {
+    "draw_journals": DogmaGame.draw_journals,
+    "set_next_dean": DogmaGame.set_next_dean,
+    "_get_players_for_nomination": DogmaGame._get_players_for_nomination,
+    "cast_vote": cast_vote,
+    "form_publication": DogmaGame.form_publication,
+    "turn": DogmaGame.turn,
+}
+
+
+def time_call(function, game, number=1000, repeat=5):
+    """Time `function` on `number` clones of `game`, taking the best of
+    `repeat` runs. As with `timeit`, garbage collection is turned off while
+    the calls are timed. Returns the time for a single call, in seconds."""
+
+    best = float("inf")
+    enabled = gc.isenabled()
+    for _ in range(repeat):
+        clones = [game.clone() for _ in range(number)]
+        gc.disable()
+        start = time.perf_counter()
+        for clone in clones:
+            function(clone)
+        best = min(best, time.perf_counter() - start)
+        if enabled:
+            gc.enable()
+
+    return best / number
+
+
+def games_per_second(number_of_players, games=200, max_turns=1000, repeat=3):
+    """Play `games` games of `Random` players, one for each seed, and get the
+    number played each second in the best of `repeat` runs."""
+
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for seed in range(games):
+            play_game([Random], number_of_players, seed, max_turns)
+        best = min(best, time.perf_counter() - start)
+
+    return games / best
+
+
+def peak_memory(number_of_players, games=20, max_turns=1000):
+    """Get the largest peak memory, in bytes, allocated while playing any one
+    of `games` games of `Random` players."""
+
+    peak = 0
+    for seed in range(games):
+        tracemalloc.start()
+        play_game([Random], number_of_players, seed, max_turns)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+
+    return peak
+
+
+def run_benchmarks(number=1000, repeat=5, games=200, max_turns=1000):
+    """Run every benchmark. Each result has a value and its unit."""
+
+    results = {}
+    game = prepared_game()
+    for name, function in MICRO_BENCHMARKS.items():
+        value = time_call(function, game, number, repeat)
+        results[name] = {"value": value, "unit": "s"}
+
+    for number_of_players in PLAYER_COUNTS:
+        value = games_per_second(number_of_players, games, max_turns)
+        results[f"games_per_second_{number_of_players}"] = {
+            "value": value,
+            "unit": "games/s",
+        }
+        value = peak_memory(number_of_players, max(games // 10, 1), max_turns)
+        results[f"peak_memory_{number_of_players}"] = {
+            "value": value,
+            "unit": "B",
+        }
+
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+
+def slowdown(result, base):
+    """Get how much worse a result is than its baseline, as a fraction. A
+    throughput is worse when it is lower; anything else when it is higher."""
+
+    if result["unit"] == "games/s":
+        return base["value"] / result["value"] - 1
+
+    return result["value"] / base["value"] - 1
+
+
+def compare(results, baseline, threshold=0.2):
+    """Find the benchmarks that are worse than the baseline by more than
+    `threshold`. Returns the slowdown of each of them, by name. Benchmarks
+    missing from either side are left out."""
+
+    regressions = {}
+    for name, result in results["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            continue
+
+        change = slowdown(result, base)
+        if change > threshold:
+            regressions[name] = change
+
+    return regressions
+
+
+def report(results, baseline=None):
+    """Lay out the results as a table, with the change from the baseline if
+    there is one."""
+
+    lines = []
+    for name, result in results["results"].items():
+        line = f"{name:<30}{result['value']:>14.6g} {result['unit']:<8}"
+        base = baseline and baseline["results"].get(name)
+        if base:
+            line += f"{slowdown(result, base):>+9.1%}"
+        lines.append(line.rstrip())
+
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    """Run the benchmarks from the command line."""
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", help="where to save the results as JSON")
+    parser.add_argument("--baseline", help="results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    parser.add_argument("--number", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--games", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.number, args.repeat, args.games)
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+            file.write("\n")
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+
+    print(report(results, baseline))
+    if baseline is None:
+        return 0
+
+    regressions = compare(results, baseline, args.threshold)
+    for name, change in regressions.items():
+        print(f"{name} is {change:.1%} worse than the baseline")
+
+    return int(bool(regressions))
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
@@ -0,0 +1,258 @@
+"""An on-disk cache of the outcomes of games, addressed by what they depend
+on.
+
+A game with a lineup of strategies is settled by the strategies in each
+seat, the rules, the turn limit and its seed, and by the engine that plays
+it. The first three are hashed into a key, along with a version for each
+strategy, which is its `version` attribute if it has one and a hash of its
+source otherwise, and a version of the engine, which is a hash of the
+source of the modules in `ENGINE`. Changes to anything else leave the cache
+as it was, and a change to a strategy or to the engine moves it to a new
+key.
+
+Outcomes are stored by their index in `OUTCOMES`, so `FORMAT` must be
+bumped whenever `OUTCOMES` is reordered or added to in the middle, as well
+as whenever the layout of a chunk changes. Old chunks are then left under
+keys that are never asked for again, and are evicted in time.
+
+Seeds are cached in chunks of `chunksize` consecutive seeds, one file to a
+chunk, so that a run over a range of seeds reads a few files and plays
+only the seeds that are missing::
+
+    cache = ResultCache("cache")
+    outcomes = cache.play([ISMCTS] + [Random] * 4, range(10_000))
+
+Every file is written to a temporary name and moved into place, so a
+reader never sees half a chunk, and any number of processes can share a
+cache. Two processes that add to the same chunk at once may lose some of
+each other's seeds, which are played again when they are next asked for.
+Reading a chunk marks it as used, and once the cache holds more than
+`max_bytes` the chunks used longest ago are removed. Each process keeps
+its own count of the cache's size and only looks at the whole cache when
+its count passes the limit, so the limit is kept roughly."""
+
+import functools
+import hashlib
+import importlib
+import inspect
+import json
+import multiprocessing
+import os
+import uuid
+
+from .game import OUTCOMES, STANDARD
+from .tournament import play_lineup
+
+FORMAT = 1
+ENGINE = (
+    "deck",
+    "game",
+    "inference",
+    "seating",
+    "tournament",
+    "worlds",
+    "strategies.ismcts",
+)
+
+
+@functools.lru_cache(maxsize=None)
+def strategy_version(Strategy):
+    """Get the version of a strategy: its `version` attribute if it has
+    one, or else a hash of the source of the class and those it inherits
+    from."""
+
+    version = getattr(Strategy, "version", None)
+    if version is not None:
+        return str(version)
+
+    digest = hashlib.sha256()
+    for cls in Strategy.__mro__[:-1]:
+        try:
+            source = inspect.getsource(cls)
+        except (OSError, TypeError):
+            source = f"{cls.__module__}.{cls.__qualname__}"
+        digest.update(source.encode())
+
+    return digest.hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def engine_version():
+    """Get the version of the engine: a hash of the source of the modules in
+    `ENGINE`, which play games and the searches some strategies make."""
+
+    digest = hashlib.sha256()
+    for name in ENGINE:
+        module = importlib.import_module(f".{name}", __package__)
+        digest.update(inspect.getsource(module).encode())
+
+    return digest.hexdigest()
+
+
+def cache_key(lineup, rules=STANDARD, max_turns=None):
+    """Hash everything but the seed that the outcome of a game depends
+    on."""
+
+    inputs = {
+        "format": FORMAT,
+        "engine": engine_version(),
+        "lineup": [
+            [
+                f"{Strategy.__module__}.{Strategy.__qualname__}",
+                strategy_version(Strategy),
+            ]
+            for Strategy in lineup
+        ],
+        "rules": rules._asdict(),
+        "max_turns": max_turns,
+    }
+    text = json.dumps(inputs, sort_keys=True)
+
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def play_chunk(job):
+    """Play the seeds of a chunk that are missing from the cache and add
+    them to it. The job is a tuple of `(cache, key, chunk, seeds, lineup,
+    rules, max_turns)`. Returns the outcomes of the seeds, by their index in
+    `OUTCOMES`."""
+
+    cache, key, chunk, seeds, lineup, rules, max_turns = job
+    outcomes = {
+        seed: OUTCOMES.index(play_lineup(lineup, seed, max_turns, rules=rules))
+        for seed in seeds
+    }
+    cache.put(key, chunk, outcomes)
+
+    return outcomes
+
+
+class ResultCache:
+    """A cache of outcomes in the directory at `path`, held to about
+    `max_bytes`, with seeds grouped in chunks of `chunksize`."""
+
+    def __init__(self, path, max_bytes=1 << 30, chunksize=256):
+
+        self.path = path
+        self.max_bytes = max_bytes
+        self.chunksize = chunksize
+        os.makedirs(path, exist_ok=True)
+        self.size = sum(size for _, _, size in self.entries())
+
+    def chunk_path(self, key, chunk):
+        """Get the path of the file for a chunk of seeds under a key."""
+
+        name = f"{key}-{self.chunksize}-{chunk}.json"
+
+        return os.path.join(self.path, key[:2], name)
+
+    def entries(self):
+        """List every chunk file in the cache as its path, when it was last
+        used and its size."""
+
+        entries = []
+        for directory, _, names in os.walk(self.path):
+            for name in names:
+                if not name.endswith(".json"):
+                    continue
+                path = os.path.join(directory, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((path, stat.st_mtime, stat.st_size))
+
+        return entries
+
+    def get(self, key, chunk):
+        """Get the outcomes cached for a chunk, as a dictionary from seeds
+        to their index in `OUTCOMES`, and mark the chunk as used."""
+
+        path = self.chunk_path(key, chunk)
+        try:
+            with open(path) as file:
+                outcomes = json.load(file)
+            os.utime(path)
+        except FileNotFoundError:
+            return {}
+
+        return {int(seed): outcome for seed, outcome in outcomes.items()}
+
+    def put(self, key, chunk, outcomes):
+        """Add outcomes to a chunk, keeping any already cached there."""
+
+        if not outcomes:
+            return
+
+        path = self.chunk_path(key, chunk)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        merged = self.get(key, chunk)
+        merged.update(outcomes)
+
+        temporary = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(temporary, "w") as file:
+            json.dump(merged, file)
+        self.size += os.path.getsize(temporary)
+        if os.path.exists(path):
+            self.size -= os.path.getsize(path)
+        os.replace(temporary, path)
+
+        if self.size > self.max_bytes:
+            self.evict()
+
+    def evict(self):
+        """Remove the chunks used longest ago until the cache fits within
+        its limit."""
+
+        entries = sorted(self.entries(), key=lambda entry: entry[1])
+        self.size = sum(size for _, _, size in entries)
+        for path, _, size in entries:
+            if self.size <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            self.size -= size
+
+    def play(
+        self,
+        lineup,
+        seeds,
+        max_turns=None,
+        rules=STANDARD,
+        processes=1,
+    ):
+        """Get the outcome of a game with a strategy in each seat for every
+        seed, as `(winner, message)` pairs in the order of `seeds`. Only the
+        seeds missing from the cache are played, a chunk at a time, across
+        a pool of processes that add to the cache as they go."""
+
+        lineup, seeds = tuple(lineup), list(seeds)
+        key = cache_key(lineup, rules, max_turns)
+
+        wanted = {}
+        for seed in seeds:
+            wanted.setdefault(seed // self.chunksize, set()).add(seed)
+
+        outcomes, jobs = {}, []
+        for chunk, chunk_seeds in wanted.items():
+            cached = self.get(key, chunk)
+            outcomes.update(cached)
+            missing = sorted(chunk_seeds - set(cached))
+            if missing:
+                jobs.append(
+                    (self, key, chunk, missing, lineup, rules, max_turns)
+                )
+
+        if processes > 1 and len(jobs) > 1:
+            with multiprocessing.Pool(processes) as pool:
+                played = list(pool.imap_unordered(play_chunk, jobs))
+            self.size = sum(size for _, _, size in self.entries())
+        else:
+            played = list(map(play_chunk, jobs))
+
+        for chunk_outcomes in played:
+            outcomes.update(chunk_outcomes)
+
+        return [OUTCOMES[outcomes[seed]] for seed in seeds]
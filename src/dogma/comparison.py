@@ -0,0 +1,191 @@
+"""A harness for comparing two lineups of strategies on the same deals.
+
+A deal is everything in a game that is down to chance before anyone plays:
+the order of the deck, the roles and the first dean. Each deal comes from a
+seed, and the players' own luck is seeded apart from it, so that two
+lineups can be played on identical deals. The difference between their
+results on one deal then comes from their strategies alone, and the
+difference between their mean results is far less noisy than it would be
+with fresh deals for each.
+
+Each deal is played by both lineups in one of these pairings:
+
+    =========== ==========================================================
+    Pairing     Games on each deal
+    =========== ==========================================================
+    common      one game as dealt
+    rotated     one game for each rotation of the lineup around the
+                table, so every strategy takes every seat and its role
+    antithetic  one game as dealt, and one with the deck turned upside
+                down, so a deck that favours one team early on is paired
+                with one that favours the other
+    =========== ==========================================================
+
+A lineup is scored on a deal by the mean of `SCORES` over its games there,
+which is one for a conformist win, nought for a maverick win and a half if
+no one won::
+
+    comparison = compare([Random] * 5, [ISMCTS] + [Random] * 4, range(200))
+    comparison.difference(), comparison.paired_error()
+"""
+
+import itertools
+import math
+import multiprocessing
+import statistics
+
+from .game import DogmaGame
+
+PAIRINGS = ("common", "rotated", "antithetic")
+SCORES = {"C": 1.0, "M": 0.0, None: 0.5}
+
+
+def play_deal(lineup, deal, antithetic=False, max_turns=None):
+    """Play a deal with a strategy in each seat, and get the winner. The
+    players' luck is seeded from the deal, but apart from it. With
+    `antithetic`, the deck is turned upside down before play."""
+
+    players = [Strategy(str(seat)) for seat, Strategy in enumerate(lineup)]
+    game = DogmaGame(players, deal, player_seed=f"players-{deal}")
+    if antithetic:
+        game.journal_cards = game.journal_cards[::-1]
+
+    game.play(max_turns)
+
+    return game.winner
+
+
+def pairing_games(lineup, pairing):
+    """Get the games to play on each deal for a lineup in a pairing, as
+    pairs of a lineup and whether the deck is turned."""
+
+    if pairing == "rotated":
+        return [
+            (lineup[seat:] + lineup[:seat], False)
+            for seat in range(len(lineup))
+        ]
+    if pairing == "antithetic":
+        return [(lineup, False), (lineup, True)]
+
+    return [(lineup, False)]
+
+
+def score_deal(lineup, deal, pairing="common", max_turns=None):
+    """Get the mean score of a lineup over its games on a deal."""
+
+    return statistics.mean(
+        SCORES[play_deal(seats, deal, antithetic, max_turns)]
+        for seats, antithetic in pairing_games(lineup, pairing)
+    )
+
+
+def score_deals(job):
+    """Score both lineups on every deal in a chunk. The job is a tuple of
+    `(first, second, deals, pairing, max_turns)`."""
+
+    first, second, deals, pairing, max_turns = job
+
+    return [
+        (
+            score_deal(first, deal, pairing, max_turns),
+            score_deal(second, deal, pairing, max_turns),
+        )
+        for deal in deals
+    ]
+
+
+class Comparison:
+    """The scores of two lineups on the same deals, in order."""
+
+    def __init__(self, first, second):
+
+        self.first = list(first)
+        self.second = list(second)
+
+    def __len__(self):
+
+        return len(self.first)
+
+    def differences(self):
+        """Get how far the first lineup outscored the second on each
+        deal."""
+
+        return [a - b for a, b in zip(self.first, self.second)]
+
+    def difference(self):
+        """Get the mean of the differences."""
+
+        return statistics.mean(self.differences())
+
+    def paired_error(self):
+        """Get the standard error of the difference, taking each deal's
+        pair of scores together. It is not a number without two deals."""
+
+        if len(self) < 2:
+            return math.nan
+
+        return statistics.stdev(self.differences()) / math.sqrt(len(self))
+
+    def unpaired_error(self):
+        """Get the standard error the difference would have if the lineups
+        had been played on separate deals."""
+
+        if len(self) < 2:
+            return math.nan
+
+        variance = statistics.variance(self.first) + statistics.variance(
+            self.second
+        )
+
+        return math.sqrt(variance / len(self))
+
+    def z(self):
+        """Get the difference in paired standard errors."""
+
+        difference, error = self.difference(), self.paired_error()
+        if not error:
+            return math.copysign(math.inf, difference) if difference else 0.0
+
+        return difference / error
+
+    def efficiency(self):
+        """Get how many times as many games it would take to get the same
+        standard error without pairing."""
+
+        return (self.unpaired_error() / self.paired_error()) ** 2
+
+
+def compare(
+    first,
+    second,
+    deals=range(1000),
+    pairing="common",
+    max_turns=1000,
+    processes=1,
+    chunksize=64,
+):
+    """Play two lineups of the same size on every deal in `deals` in one of
+    the `PAIRINGS`, spreading chunks of deals across a pool of processes.
+    Returns a `Comparison` of their scores."""
+
+    first, second = tuple(first), tuple(second)
+    if len(first) != len(second):
+        raise ValueError("Lineups must be the same size to share deals.")
+    if pairing not in PAIRINGS:
+        raise ValueError(f"There is no pairing called {pairing!r}.")
+
+    deals = iter(deals)
+    chunks = iter(lambda: list(itertools.islice(deals, chunksize)), [])
+    jobs = ((first, second, chunk, pairing, max_turns) for chunk in chunks)
+
+    if processes == 1:
+        scores = map(score_deals, jobs)
+        pairs = list(itertools.chain.from_iterable(scores))
+    else:
+        with multiprocessing.Pool(processes) as pool:
+            scores = pool.imap(score_deals, jobs)
+            pairs = list(itertools.chain.from_iterable(scores))
+
+    return Comparison(
+        (score for score, _ in pairs), (score for _, score in pairs)
+    )
@@ -0,0 +1,113 @@
+"""The deck of journal cards and its discard pile."""
+
+import random
+
+from .events import DECK
+
+
+class EmptyDeckError(Exception):
+    """Raised when there are too few journal cards left to draw, even with the
+    discard pile shuffled back in."""
+
+
+class Deck:
+    """A deck of journal cards, along with a discard pile.
+
+    The cards are kept in a single list with a pointer to the top of the deck,
+    so drawing and peeking never rebuild the list, and the number of each kind
+    of card left in the deck and the discard pile are kept up to date as cards
+    move between them. The list itself is only ever replaced, never changed,
+    so copies of a deck can share it. Each reshuffle is written to `log`, if
+    there is one."""
+
+    def __init__(self, cards, discards=(), state=None, log=None):
+
+        self.cards = list(cards)
+        self.top = 0
+        self.discards = list(discards)
+        self.random = state or random.Random()
+        self.log = log
+
+        self.counts = {"H": 0, "G": 0}
+        for card in self.cards:
+            self.counts[card] += 1
+
+        self.discarded = {"H": 0, "G": 0}
+        for card in self.discards:
+            self.discarded[card] += 1
+
+    def __len__(self):
+
+        return len(self.cards) - self.top
+
+    def remaining(self):
+        """Get the cards left in the deck, from the top down."""
+
+        top = self.top
+
+        return self.cards[top:]
+
+    def reshuffle(self):
+        """Shuffle the discard pile back into the rest of the deck."""
+
+        top = self.top
+        cards = self.cards[top:] + self.discards
+        self.random.shuffle(cards)
+        self.cards, self.top = cards, 0
+        if self.log is not None:
+            self.log.record_cards(DECK, cards)
+
+        for card, count in self.discarded.items():
+            self.counts[card] += count
+            self.discarded[card] = 0
+        self.discards.clear()
+
+    def _ensure(self, num):
+        """Make sure there are at least `num` cards in the deck, reshuffling if
+        need be."""
+
+        if len(self) < num:
+            self.reshuffle()
+            if len(self) < num:
+                raise EmptyDeckError(
+                    f"Cannot draw {num} journals from {len(self)}."
+                )
+
+    def peek(self, num=3):
+        """Look at the top `num` cards of the deck without removing them."""
+
+        self._ensure(num)
+
+        start, stop = self.top, self.top + num
+
+        return self.cards[start:stop]
+
+    def draw(self, num=3):
+        """Draw `num` cards from the top of the deck."""
+
+        cards = self.peek(num)
+        self.top += num
+        for card in cards:
+            self.counts[card] -= 1
+
+        return cards
+
+    def copy(self, state=None):
+        """Make a copy of the deck that shares its cards but not its discard
+        pile, drawing any shuffles from `state` if it is given."""
+
+        deck = object.__new__(type(self))
+        deck.__dict__.update(self.__dict__)
+        deck.discards = list(self.discards)
+        deck.counts = dict(self.counts)
+        deck.discarded = dict(self.discarded)
+        if state is not None:
+            deck.random = state
+
+        return deck
+
+    def discard(self, card):
+        """Put a card on the discard pile."""
+
+        self.discards.append(card)
+        self.discarded[card] += 1
@@ -0,0 +1,355 @@
+"""A vectorised environment for training agents to play, in the style of Gym.
+
+A `VectorEnv` plays a number of games in lockstep. Every game is always
+waiting on one decision from one seat, and each call to `step` takes an
+action for every game, plays each of them on to its next decision, and
+writes what the acting seat can see into NumPy arrays. The arrays are made
+once, when the environment is, and filled in place at every step, so they
+can be handed straight to a model without copying. A game that finishes is
+replaced by a fresh one with the next seed.
+
+Every decision is made with a single whole number, checked against the
+action mask of its game:
+
+    ============= ========================================================
+    Decision      Action
+    ============= ========================================================
+    NOMINATE      the seat to nominate as editor
+    VOTE          one for yes, nought for no
+    DEAN          the position in the hand of the card to discard
+    EDITOR        the position in the hand of the card to discard, or two
+                  to suggest an overrule
+    AGREE         one to agree to the editor's overrule, nought to refuse
+    DENOUNCE      the seat to denounce
+    ============= ========================================================
+"""
+
+import itertools
+
+import numpy as np
+
+from .game import ADJOURNED, DECISIONS, OUTCOMES, DogmaGame
+from .strategies import Random
+
+NOMINATE, VOTE, DEAN, EDITOR, AGREE, DENOUNCE = range(len(DECISIONS))
+
+ROLES = {"C": 0, "M": 1, "G": 2}
+PARTNERS = {"C": None, "M": "G", "G": "M"}
+CARDS = {"H": 1, "G": -1}
+UNKNOWN = -1
+MAX_PRESSURE = 127
+
+HEADER = (
+    "decision",
+    "seat",
+    "heliocentric",
+    "geocentric",
+    "pressure",
+    "overrule_available",
+    "dean",
+    "editor",
+    "nominee",
+)
+HAND = {
+    "".join(cards): bytes(CARDS[card] & 255 for card in cards).ljust(3, b"\0")
+    for size in range(4)
+    for cards in itertools.product("HG", repeat=size)
+}
+
+
+def play(game, max_turns=None):
+    """Play a game, yielding each decision as the player to make it, the kind
+    of decision and what it is made from, and being sent back the action
+    taken. The game ends as `DogmaGame.play` would end it."""
+
+    game.assign_roles()
+    game.inform_mavericks()
+
+    while True:
+        if game.turns == max_turns:
+            game.end(ADJOURNED)
+            return
+
+        if (yield from act(game, game.turn_steps())):
+            return
+
+
+def act(game, steps):
+    """Play out one of the generators of decisions of a game, as
+    `DogmaGame.run` does, but with each decision made by an action. Each
+    vote is put to its voter on their own, and each action is turned into
+    the answer the game expects. Returns what the generator does."""
+
+    answer = None
+    while True:
+        try:
+            kind, player, args = steps.send(answer)
+        except StopIteration as stop:
+            return stop.value
+
+        decision = DECISIONS.index(kind)
+        if decision == VOTE:
+            (nomination,) = args
+            answer = []
+            for voter in player:
+                vote = yield voter, VOTE, nomination
+                answer.append("yes" if vote else "no")
+        elif decision == NOMINATE or decision == DENOUNCE:
+            (options,) = args
+            answer = game.player_at((yield player, decision, options))
+        elif decision == DEAN:
+            (hand,) = args
+            reject = hand.pop((yield player, DEAN, hand))
+            answer = hand, reject, False
+        elif decision == EDITOR:
+            hand, _ = args
+            action = yield player, EDITOR, args
+            if action == 2:
+                answer = hand[:1], hand[1], True
+            else:
+                answer = [hand[1 - action]], hand[action], False
+        else:
+            answer = bool((yield player, AGREE, None))
+
+
+class VectorEnv:
+    """A batch of `number_of_games` games of `number_of_players`, stepped in
+    lockstep. The games are seeded one after another from `seed`, and any
+    game that reaches `max_turns` is adjourned.
+
+    The observation is a dictionary of arrays with a row for each game, all
+    seen from the seat that is to act:
+
+        - `decision` and `seat`: the kind of decision and who makes it.
+        - `heliocentric` and `geocentric`: the journals published.
+        - `pressure`, `overrule_available` and `turn`. An overrule can push
+          the pressure to print past the point of an emergency publication,
+          and it is shown as no more than `MAX_PRESSURE`.
+        - `dean`, `editor` and `nominee`: seats, or -1 if there is none.
+        - `alive`: which seats are still in the game.
+        - `roles`: the roles the acting seat knows, by the codes in
+          `ROLES`, and -1 for those it does not.
+        - `hand` and `seen`: the cards in the acting seat's hand, and any
+          they were shown on top of the deck, by the codes in `CARDS`, and
+          nought for none.
+        - `votes`: the votes of the last `history` turns, in the row for the
+          turn modulo `history`, with one for yes, -1 for no and nought for
+          no vote.
+        - `mask`: the actions that are allowed.
+
+    Apart from `turn` and `votes`, every array is a view of one buffer with
+    a row of bytes for each game, and each step rewrites the row of each game
+    with a single copy of bytes made from lookup tables.
+
+    When a game ends, `rewards` gives one to each seat on the winning side
+    and -1 to the others, `dones` is set and `outcomes` holds the code of
+    its outcome from `OUTCOMES`, all until the next step."""
+
+    def __init__(
+        self,
+        number_of_games,
+        number_of_players=5,
+        seed=0,
+        max_turns=1000,
+        history=8,
+    ):
+
+        self.number_of_games = number_of_games
+        self.number_of_players = number_of_players
+        self.max_turns = max_turns
+        self.history = history
+        self.number_of_actions = max(number_of_players, 3)
+        self.seeds = itertools.count(seed)
+
+        seats, actions = number_of_players, self.number_of_actions
+        self.sets = [
+            bytes(mask >> seat & 1 for seat in range(actions))
+            for mask in range(1 << seats)
+        ]
+        self.roles = {}
+
+        fields = [(name, 1) for name in HEADER] + [
+            ("alive", seats),
+            ("roles", seats),
+            ("hand", 3),
+            ("seen", 3),
+            ("mask", actions),
+        ]
+        self.width = sum(size for _, size in fields)
+        self.buffer = bytearray(number_of_games * self.width)
+        table = np.frombuffer(self.buffer, dtype=np.int8)
+        table = table.reshape(number_of_games, self.width)
+
+        self.observation, start = {}, 0
+        for name, size in fields:
+            stop = start + size
+            view = table[:, start:stop]
+            if size == 1 and name in HEADER:
+                view = view[:, 0]
+            if name in ("overrule_available", "alive", "mask"):
+                view = view.view(bool)
+            self.observation[name] = view
+            start = stop
+
+        self.turns = bytearray(4 * number_of_games)
+        self.observation["turn"] = np.frombuffer(self.turns, dtype=np.int32)
+        self._turns = memoryview(self.turns).cast("i")
+
+        self.votes = bytearray(number_of_games * history * seats)
+        self.observation["votes"] = np.frombuffer(
+            self.votes, dtype=np.int8
+        ).reshape(number_of_games, history, seats)
+        self._votes = memoryview(self.votes).cast("b")
+
+        self.rewards = np.zeros((number_of_games, seats), dtype=np.float32)
+        self.dones = np.zeros(number_of_games, dtype=bool)
+        self.outcomes = np.zeros(number_of_games, dtype=np.int8)
+
+        self.games = [None] * number_of_games
+        self.plays = [None] * number_of_games
+        self.requests = [None] * number_of_games
+
+    def reset(self):
+        """Start a fresh game in every slot, and get the first
+        observation."""
+
+        self.rewards.fill(0)
+        self.dones.fill(False)
+        self.outcomes.fill(0)
+        for index in range(self.number_of_games):
+            self.start(index)
+
+        return self.observation
+
+    def start(self, index):
+        """Start a fresh game in a slot, and observe its first decision."""
+
+        players = [Random(str(seat)) for seat in range(self.number_of_players)]
+        game = self.games[index] = DogmaGame(players, next(self.seeds))
+        self.plays[index] = play(game, self.max_turns)
+
+        for turn in range(self.history):
+            self.clear_votes(index, turn)
+        self.observe(index, next(self.plays[index]))
+
+    def step(self, actions):
+        """Take an action in every game, and play each on to its next
+        decision. Returns the observation, rewards and dones."""
+
+        self.rewards.fill(0)
+        self.dones.fill(False)
+        self.outcomes.fill(0)
+        offset = self.width - self.number_of_actions
+        for index, action in enumerate(np.asarray(actions).tolist()):
+            allowed = 0 <= action < self.number_of_actions
+            if (
+                not allowed
+                or not self.buffer[index * self.width + offset + action]
+            ):
+                raise ValueError(
+                    f"Action {action} is not allowed in game {index}."
+                )
+
+            player, decision, _ = self.requests[index]
+            if decision == VOTE:
+                self.record_vote(index, player, action)
+
+            try:
+                request = self.plays[index].send(action)
+            except StopIteration:
+                self.finish(index)
+                self.start(index)
+            else:
+                self.observe(index, request)
+
+        return self.observation, self.rewards, self.dones
+
+    def clear_votes(self, index, turn):
+        """Wipe the votes of an earlier turn from the history of a game."""
+
+        size = self.number_of_players
+        start = (index * self.history + turn % self.history) * size
+        stop = start + size
+        self.votes[start:stop] = bytes(size)
+
+    def record_vote(self, index, player, action):
+        """Write a vote into the history of its game."""
+
+        game = self.games[index]
+        row = index * self.history + game.turns % self.history
+        seat = game.seating.seats[player]
+        self._votes[row * self.number_of_players + seat] = 1 if action else -1
+
+    def finish(self, index):
+        """Hand out the rewards for a game that has ended."""
+
+        game = self.games[index]
+        self.dones[index] = True
+        self.outcomes[index] = OUTCOMES.index((game.winner, game.message))
+        if game.winner is not None:
+            for seat, player in enumerate(game.seating.players):
+                won = (player.role == "C") == (game.winner == "C")
+                self.rewards[index, seat] = 1 if won else -1
+
+    def observe(self, index, request):
+        """Write what the player to act can see of a game into its row of
+        the observation buffer."""
+
+        self.requests[index] = request
+        player, decision, options = request
+        game = self.games[index]
+        seating = game.seating
+        seats, bits = seating.seats, seating.bits
+        seat = seats[player]
+        editor = nominee = UNKNOWN
+
+        if decision == NOMINATE or decision == DENOUNCE:
+            chosen = 0
+            for option in options:
+                chosen |= bits[option]
+            mask, hand = self.sets[chosen], HAND[""]
+            if decision == NOMINATE:
+                self.clear_votes(index, game.turns)
+        elif decision == VOTE:
+            mask, hand, nominee = self.sets[0b11], HAND[""], seats[options]
+        else:
+            editor = seats[game.editor]
+            cards, choices = "", 0b11
+            if decision == DEAN:
+                cards, choices = options, 0b111
+            elif decision == EDITOR:
+                cards, overrule_available = options
+                choices |= overrule_available << 2
+            mask, hand = self.sets[choices], HAND["".join(cards)]
+
+        partner = seats.get(player.partner)
+        roles = self.roles.get((seat, player.role, partner))
+        if roles is None:
+            roles = bytearray([UNKNOWN & 255] * self.number_of_players)
+            roles[seat] = ROLES[player.role]
+            if partner is not None:
+                roles[partner] = ROLES[PARTNERS[player.role]]
+            roles = self.roles[seat, player.role, partner] = bytes(roles)
+
+        publications = game.publications
+        header = bytes(
+            (
+                decision,
+                seat,
+                publications["H"],
+                publications["G"],
+                min(game.pressure_to_print, MAX_PRESSURE),
+                game.overrule_available,
+                seats[game.dean],
+                editor & 255,
+                nominee & 255,
+            )
+        )
+        seen = HAND["".join(player.seen)] if player.seen else HAND[""]
+
+        start = index * self.width
+        stop = start + self.width
+        self.buffer[start:stop] = b"".join(
+            (header, self.sets[seating.alive], roles, hand, seen, mask)
+        )
+        self._turns[index] = game.turns
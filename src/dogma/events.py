@@ -0,0 +1,113 @@
+"""A compact log of the events of a game.
+
+Every event is four bytes: a code and three bytes of detail. Players are
+given by their seats, and runs of journal cards are packed into the three
+bytes together, with the number of cards in the lowest five bits and a bit
+for each card above them, set for a heliocentric card. A run of more than
+`RUN` cards, such as a large deck, is split across events of the same code,
+each of `RUN` cards but the last, and read back by joining the cards of
+events that follow one another.
+
+    ======== ============================================================
+    Code     Detail
+    ======== ============================================================
+    START    number of players
+    DECK     the order of the whole deck, after a shuffle
+    ROLES    the seats of Galileo and the maverick
+    TURN     the seat of the dean
+    NOMINATE the seat of the nominee
+    VOTE     bitmasks of the seats voting yes, and of everyone voting
+    DRAW     the cards drawn
+    DISCARD  the card discarded
+    OVERRULE whether the dean agreed to the editor's overrule
+    PUBLISH  the card published, and whether in an emergency
+    PEEK     the cards seen by the dean
+    DENOUNCE the seat of the player denounced
+    UNLOCK   nothing; the overrule has become available
+    END      the index of the outcome in `OUTCOMES`
+    ======== ============================================================
+"""
+
+import struct
+
+(
+    START,
+    DECK,
+    ROLES,
+    TURN,
+    NOMINATE,
+    VOTE,
+    DRAW,
+    DISCARD,
+    OVERRULE,
+    PUBLISH,
+    PEEK,
+    DENOUNCE,
+    UNLOCK,
+    END,
+) = range(14)
+CARDS = ("G", "H")
+EVENT = struct.Struct("4B")
+RUN = 19
+
+
+def pack(cards):
+    """Pack up to nineteen journal cards into three bytes."""
+
+    value = len(cards)
+    for position, card in enumerate(cards, 5):
+        if card == "H":
+            value |= 1 << position
+
+    return value & 255, value >> 8 & 255, value >> 16
+
+
+def unpack(a, b, c):
+    """Unpack journal cards from three bytes."""
+
+    value = a | b << 8 | c << 16
+
+    return [
+        CARDS[value >> position & 1] for position in range(5, 5 + value % 32)
+    ]
+
+
+class EventLog:
+    """A record of the events of a game, kept as bytes."""
+
+    def __init__(self, data=b""):
+
+        self.data = bytearray(data)
+
+    def __len__(self):
+
+        return len(self.data) // EVENT.size
+
+    def __iter__(self):
+
+        return EVENT.iter_unpack(self.data)
+
+    def __bytes__(self):
+
+        return bytes(self.data)
+
+    def since(self, index):
+        """Iterate over the events from the one at `index` onwards."""
+
+        start = index * EVENT.size
+
+        return EVENT.iter_unpack(bytes(self.data[start:]))
+
+    def record(self, code, a=0, b=0, c=0):
+        """Add an event to the log."""
+
+        self.data.extend((code, a, b, c))
+
+    def record_cards(self, code, cards):
+        """Add an event to the log whose detail is a run of cards, or as
+        many as it takes if there are more than `RUN` of them."""
+
+        for start in range(0, max(len(cards), 1), RUN):
+            stop = start + RUN
+            self.data.append(code)
+            self.data.extend(pack(cards[start:stop]))
@@ -1,31 +1,203 @@
 """The essential classes and functions to run a game instance."""
 
 import random
+from collections import namedtuple
+
+from .deck import Deck, EmptyDeckError
+from .events import (
+    DECK,
+    DENOUNCE,
+    DISCARD,
+    DRAW,
+    END,
+    NOMINATE,
+    OVERRULE,
+    PEEK,
+    PUBLISH,
+    ROLES,
+    START,
+    TURN,
+    UNLOCK,
+    VOTE,
+)
+from .player import answers_in_batches, ask_in_batches
+from .seating import Seating
+
+OUTCOMES = (
+    None,
+    ("M", "Galileo's rhetorical prowess has dominated."),
+    ("M", "The maverick thinkers have altered the status quo."),
+    ("C", "The conformists have quelled the free-thinkers."),
+    ("C", "The conformists have successfully ousted Galileo."),
+    (None, "The society has adjourned without a verdict."),
+    (None, "The society has run out of journals to print."),
+)
+ONGOING, RHETORIC, ALTERED, QUELLED, OUSTED, ADJOURNED, EXHAUSTED = range(7)
+TEAMS = {"C": "C", "M": "M", "G": "M"}
+DECISIONS = ("nominate", "vote", "dean", "editor", "agree", "denounce")
+METHODS = {
+    "nominate": "nominate",
+    "vote": "vote",
+    "dean": "choose_cards_to_submit",
+    "editor": "choose_cards_to_submit",
+    "agree": "agree_to_overrule",
+    "denounce": "denounce",
+}
+
+
+class Rules(
+    namedtuple(
+        "Rules",
+        (
+            "journals_h",
+            "journals_g",
+            "win_h",
+            "win_g",
+            "rhetoric",
+            "peek",
+            "denounce",
+            "overrule",
+            "pressure",
+        ),
+        defaults=(11, 6, 6, 5, 3, (3,), (4, 5), (5,), 3),
+    )
+):
+    """The rules of a game that can be changed for balance studies, which
+    are those of the standard game by default:
+
+        - `journals_h` and `journals_g`: the journal cards of each kind in
+          the deck.
+        - `win_h` and `win_g`: the publications of each kind that win the
+          game for their team.
+        - `rhetoric`: the heliocentric publications needed for Galileo to
+          win by being made editor.
+        - `peek`, `denounce` and `overrule`: the numbers of heliocentric
+          publications after which each emergency power is given.
+        - `pressure`: the pressure to print that forces an emergency
+          publication.
+    """
+
+    __slots__ = ()
+
+    def deck(self):
+        """Get the journal cards of a deck, unshuffled."""
+
+        return ["H"] * self.journals_h + ["G"] * self.journals_g
+
+
+STANDARD = Rules()
+
+
+class Decision(namedtuple("Decision", ("kind", "player", "args"))):
+    """A decision that a turn is waiting on: which of the `DECISIONS` it is,
+    the player to make it and the arguments to the method they make it with.
+    A vote is put to everyone still in the game at once, so the `player` of
+    a vote is the list of voters, and its answer is their votes in order.
+    The name of the method for each kind of decision is in `METHODS`."""
+
+    __slots__ = ()
+
+
+class Snapshot(
+    namedtuple(
+        "Snapshot",
+        (
+            "roles",
+            "journal_cards",
+            "discard_pile",
+            "publications",
+            "last_successfully_published",
+            "pressure_to_print",
+            "overrule_available",
+            "alive",
+            "dean",
+            "editor",
+            "ex_dean",
+            "ex_editor",
+            "turns",
+            "winner",
+            "message",
+            "random",
+        ),
+    )
+):
+    """The state of a game at a moment in time. Players are referred to by
+    their seats, so a snapshot can be restored into any game with the same
+    number of players."""
+
+    __slots__ = ()
+
+
+def spawn(state):
+    """Derive a new, independent random state from an existing one. The child
+    is seeded from the parent's stream, so it is reproducible whenever the
+    parent is."""
+
+    return random.Random(state.getrandbits(64))
 
 
 class DogmaGame:
-    """A class to represent and manage the components of a game."""
-
-    def __init__(self, players, seed=None):
-
-        if isinstance(seed, int):
-            random.seed(seed)
+    """A class to represent and manage the components of a game. If an
+    `EventLog` is given as `log`, everything that happens is recorded in it.
+    If a `Profiler` is given as `profiler`, it times each phase of a turn.
+    The game is played by the standard rules unless others are given as
+    `rules`.
+
+    The deck, the roles and the first dean are dealt from `seed`. The
+    players' own random states are derived from it too, unless they are
+    seeded apart by `player_seed`, so that one deal can be played with
+    different players' luck, or different deals with the same.
+
+    A turn is played by plain methods that ask the players for their
+    decisions directly, such as `turn`, which keeps whole games fast. Each
+    step of a turn that waits on the players also has a generator of the same
+    name ending in `_steps`, which yields each `Decision` it waits on and is
+    sent back its answer. Loops that ask for decisions their own way, such as
+    those of `dogma.aio` and `dogma.env`, drive these, and `run` plays them
+    out the same way as the plain methods."""
+
+    def __init__(
+        self,
+        players,
+        seed=None,
+        log=None,
+        profiler=None,
+        rules=STANDARD,
+        player_seed=None,
+    ):
 
         self.players = players
         self.seed = seed
+        self.log = log
+        self.rules = rules
         self.winner = None
         self.message = None
-
-        cards = ["H"] * 11 + ["G"] * 6
-        random.shuffle(cards)
-        self.journal_cards = cards
-        self.discard_pile = []
+        self.turns = 0
+        self.batched = False
+        self._seating = None
+
+        root = random.Random(seed)
+        self.random = spawn(root)
+        self.player_random = spawn(root)
+        if player_seed is not None:
+            self.player_random = random.Random(player_seed)
+
+        cards = rules.deck()
+        self.random.shuffle(cards)
+        self.deck = Deck(cards, state=self.random, log=log)
+        if log is not None:
+            log.record(START, len(players))
+            log.record_cards(DECK, cards)
 
         self.publications = {"H": 0, "G": 0}
         self.last_successfully_published = None
         self.pressure_to_print = 0
         self.overrule_available = False
 
+        self.profiler = None
+        if profiler is not None:
+            profiler.attach(self)
+
         self.galileo = None
         self.maverick = None
         self.dean = None
@@ -33,17 +205,195 @@ class DogmaGame:
         self.ex_dean = None
         self.ex_editor = None
 
+    @property
+    def journal_cards(self):
+        """The journal cards left in the deck, from the top down."""
+
+        return self.deck.remaining()
+
+    @journal_cards.setter
+    def journal_cards(self, cards):
+
+        self.deck = Deck(cards, self.deck.discards, self.random, self.log)
+
+    @property
+    def discard_pile(self):
+        """The journal cards that have been discarded since the last
+        reshuffle."""
+
+        return self.deck.discards
+
+    @discard_pile.setter
+    def discard_pile(self, cards):
+
+        self.deck = Deck(self.journal_cards, cards, self.random, self.log)
+
+    @property
+    def seating(self):
+        """The seating plan of the players, which is drawn up the first time
+        it is needed."""
+
+        if self._seating is None:
+            self._seating = Seating(self.players)
+
+        return self._seating
+
+    def seat_of(self, player):
+        """Get the seat of a player, if there is one."""
+
+        return None if player is None else self.seating.seats[player]
+
+    def player_at(self, seat):
+        """Get the player in a seat, if there is one."""
+
+        return None if seat is None else self.seating.players[seat]
+
+    def snapshot(self):
+        """Take a snapshot of the state of the game."""
+
+        return Snapshot(
+            tuple(player.role for player in self.seating.players),
+            tuple(self.deck.remaining()),
+            tuple(self.deck.discards),
+            (self.publications["H"], self.publications["G"]),
+            self.last_successfully_published,
+            self.pressure_to_print,
+            self.overrule_available,
+            self.seating.alive,
+            self.seat_of(self.dean),
+            self.seat_of(self.editor),
+            self.seat_of(self.ex_dean),
+            self.seat_of(self.ex_editor),
+            self.turns,
+            self.winner,
+            self.message,
+            self.random.getstate(),
+        )
+
+    def restore(self, snapshot):
+        """Put the game back into the state of a snapshot. The roles in the
+        snapshot are handed to the players in the same seats. If the snapshot
+        has no random state, the game carries on with its own."""
+
+        self.galileo = self.maverick = None
+        for player, role in zip(self.seating.players, snapshot.roles):
+            player.role = role
+            if role == "G":
+                self.galileo = player
+            if role == "M":
+                self.maverick = player
+
+        if snapshot.random is not None:
+            self.random.setstate(snapshot.random)
+        self.deck = Deck(
+            snapshot.journal_cards, snapshot.discard_pile, self.random, self.log
+        )
+
+        helio, geo = snapshot.publications
+        self.publications = {"H": helio, "G": geo}
+        self.last_successfully_published = snapshot.last_successfully_published
+        self.pressure_to_print = snapshot.pressure_to_print
+        self.overrule_available = snapshot.overrule_available
+
+        self.seating.alive = snapshot.alive
+        self.seating.link()
+        self.dean = self.player_at(snapshot.dean)
+        self.editor = self.player_at(snapshot.editor)
+        self.ex_dean = self.player_at(snapshot.ex_dean)
+        self.ex_editor = self.player_at(snapshot.ex_editor)
+
+        self.turns = snapshot.turns
+        self.winner = snapshot.winner
+        self.message = snapshot.message
+
+    def clone(self, state=None):
+        """Make a copy of the game that can be played on without changing this
+        one. The copy shares the players and anything that is never changed in
+        place. Its random state is a copy of this game's unless `state` is
+        given. The copy is neither logged nor profiled."""
+
+        game = object.__new__(type(self))
+        game.__dict__.update(self.__dict__)
+        if state is None:
+            state = random.Random()
+            state.setstate(self.random.getstate())
+
+        game.random = state
+        game.log = None
+        if self.profiler is not None:
+            self.profiler.detach(game)
+        game.deck = self.deck.copy(state)
+        game.deck.log = None
+        game._seating = self.seating.copy()
+        game.publications = dict(self.publications)
+
+        return game
+
+    def record(self, code, a=0, b=0, c=0):
+        """Record an event in the game's log, if it has one."""
+
+        if self.log is not None:
+            self.log.record(code, a, b, c)
+
+    def end(self, outcome):
+        """Bring the game to an end with one of the `OUTCOMES`."""
+
+        self.winner, self.message = OUTCOMES[outcome]
+        self.record(END, outcome)
+
+    def run(self, steps):
+        """Play out the generator of decisions `steps`, asking each player
+        for theirs as it comes. Returns what the generator does."""
+
+        answer = None
+        while True:
+            try:
+                decision = steps.send(answer)
+            except StopIteration as stop:
+                return stop.value
+            answer = self.decide(decision)
+
+    def decide(self, decision):
+        """Ask for a decision. The votes are asked for all at once if any of
+        the players votes in batches."""
+
+        kind, player, args = decision
+        if kind != "vote":
+            return getattr(player, METHODS[kind])(*args)
+
+        (nomination,) = args
+        if self.batched:
+            return ask_in_batches("vote", player, [nomination] * len(player))
+
+        return [voter.vote(nomination) for voter in player]
+
+    def seat_players(self):
+        """Give each player their own random state, derived in seating order
+        from the game's seed. Players must draw from this rather than the global
+        `random` module so that games do not interfere with one another. Each
+        player is also told which game they are in. If any of them votes in
+        batches, votes are collected that way."""
+
+        for player in self.players:
+            player.random = spawn(self.player_random)
+            player.game = self
+
+        self.batched = any(
+            answers_in_batches(type(player), "vote") for player in self.players
+        )
+
     def shuffle_roles(self):
         """Shuffle the available roles."""
 
         roles = ["C"] * (len(self.players) - 2) + ["M", "G"]
-        random.shuffle(roles)
+        self.random.shuffle(roles)
 
         return roles
 
     def assign_roles(self):
         """Assign the roles to the players."""
 
+        self.seat_players()
         roles = self.shuffle_roles()
         for player, role in zip(self.players, roles):
             player.role = role
@@ -53,6 +403,12 @@ class DogmaGame:
             if role == "M":
                 self.maverick = player
 
+        self.record(
+            ROLES,
+            self.seat_of(self.galileo),
+            self.seat_of(self.maverick),
+        )
+
     def inform_mavericks(self):
         """Reveal the identities of galileo and the maverick to one another."""
 
@@ -62,96 +418,179 @@ class DogmaGame:
     def elect_first_dean(self):
         """Select the first dean. This is done automatically (for now)."""
 
-        self.dean = random.choice(self.players)
+        self.dean = self.random.choice(self.players)
 
     def set_next_dean(self):
         """Set the dean to be the next player in a clockwise fashion. If that
         player has been denounced, move on."""
 
-        idx = (self.players.index(self.dean) + 1) % len(self.players)
-        self.dean = self.players[idx]
-        if self.dean.denounced:
-            self.set_next_dean()
+        self.dean = self.seating.next_player(self.dean)
 
     def _get_players_for_nomination(self):
         """Get the players that can be nominated."""
 
         if len(self.players) == 5:
-            return tuple(
-                p
-                for p in self.players
-                if p not in (self.dean, self.ex_editor) and not p.denounced
-            )
+            return self.seating.eligible(self.dean, self.ex_editor)
 
-        return tuple(
-            p
-            for p in self.players
-            if p not in (self.dean, self.ex_dean, self.ex_editor)
-            and not p.denounced
-        )
+        return self.seating.eligible(self.dean, self.ex_dean, self.ex_editor)
 
-    def form_print_team(self):
-        """Get a nomination from the dean for an editor."""
+    def form_print_team(self, nomination=None):
+        """Get a nomination from the dean for an editor, unless it has already
+        been made and is given as `nomination`."""
 
-        nomination = self.dean.nominate(self._get_players_for_nomination())
+        if nomination is None:
+            nomination = self.dean.nominate(self._get_players_for_nomination())
+        self.record(NOMINATE, self.seat_of(nomination))
 
         return nomination
 
-    def cast_vote(self, nomination):
-        """Cast a vote on the suggested print team."""
+    def form_print_team_steps(self, nomination=None):
+        """The steps of `form_print_team`."""
 
-        votes = {"yes": 0, "no": 0}
-        for player in self.players:
-            if not player.denounced:
-                votes[player.vote(nomination)] += 1
+        if nomination is None:
+            nomination = yield Decision(
+                "nominate", self.dean, (self._get_players_for_nomination(),)
+            )
+        self.record(NOMINATE, self.seat_of(nomination))
+
+        return nomination
+
+    def cast_vote(self, nomination, votes=None):
+        """Cast a vote on the suggested print team. The votes of everyone still
+        in the game may already have been collected, in which case they are
+        given in seating order as `votes`. Otherwise they are asked for, all
+        at once if any of the players votes in batches."""
+
+        voters = self.seating.eligible()
+        if votes is None and self.batched:
+            votes = ask_in_batches("vote", voters, [nomination] * len(voters))
+
+        if votes is not None:
+            return self.count_votes(voters, votes)
+
+        counts = {"yes": 0, "no": 0}
+        if self.log is None:
+            for player in voters:
+                counts[player.vote(nomination)] += 1
+        else:
+            bits, mask = self.seating.bits, 0
+            for player in voters:
+                vote = player.vote(nomination)
+                counts[vote] += 1
+                mask |= bits[player] * (vote == "yes")
+            self.log.record(VOTE, mask, self.seating.alive)
+
+        ayes, nays = counts.values()
+        self.pressure_to_print += 1 * (ayes <= nays)
+        return ayes > nays
+
+    def cast_vote_steps(self, nomination, votes=None):
+        """The steps of `cast_vote`."""
+
+        voters = self.seating.eligible()
+        if votes is None:
+            votes = yield Decision("vote", voters, (nomination,))
+
+        return self.count_votes(voters, votes)
+
+    def count_votes(self, voters, votes):
+        """Count the votes of the `voters`, given in the same order, and
+        settle the vote on them."""
+
+        ayes = votes.count("yes")
+        nays = len(votes) - ayes
+        if self.log is not None:
+            bits = self.seating.bits
+            mask = sum(
+                bits[player]
+                for player, vote in zip(voters, votes)
+                if vote == "yes"
+            )
+            self.log.record(VOTE, mask, self.seating.alive)
 
-        ayes, nays = votes.values()
         self.pressure_to_print += 1 * (ayes <= nays)
         return ayes > nays
 
     def draw_journals(self, num=3):
         """Draw a number of journal cards from the top of the deck (three by
         default). If there are not enough cards left, shuffle the remaining
-        cards with the discard pile and draw again."""
-
-        if len(self.journal_cards) >= num:
-            drawn = self.journal_cards[:num]
-            self.journal_cards = self.journal_cards[num:]
-            return drawn
+        cards with the discard pile and draw again. Raises `EmptyDeckError` if
+        there are still too few."""
 
-        cards = self.journal_cards + self.discard_pile
-        random.shuffle(cards)
+        cards = self.deck.draw(num)
+        if self.log is not None:
+            self.log.record_cards(DRAW, cards)
 
-        self.journal_cards = cards
-        self.discard_pile = []
-
-        return self.draw_journals()
+        return cards
 
     def form_publication(self):
         """With the dean and editor decided, form a publication from three
-        journal cards. If the overrule power is unlocked then"""
+        journal cards. Returns whether a card was published, which it is
+        not if the print team agree to overrule."""
 
         choices, reject, _ = self.dean.choose_cards_to_submit(
             self.draw_journals()
         )
-        self.discard_pile.append(reject)
+        self.discard(reject)
+
+        return self.edit_publication(choices, self.overrule_available)
+
+    def form_publication_steps(self):
+        """The steps of `form_publication`."""
+
+        choices, reject, _ = yield Decision(
+            "dean", self.dean, (self.draw_journals(),)
+        )
+        self.discard(reject)
+
+        return (
+            yield from self.edit_publication_steps(
+                choices, self.overrule_available
+            )
+        )
+
+    def edit_publication(self, choices, overrule_available):
+        """Have the editor pick which of the dean's cards to publish, or
+        suggest an overrule if it is available."""
 
         kept, reject, suggest_overrule = self.editor.choose_cards_to_submit(
-            choices, self.overrule_available
+            choices, overrule_available
         )
 
-        if suggest_overrule:
-            deans_decision = self.dean.agree_to_overrule()
-            if deans_decision:
-                self.pressure_to_print += 1
-                return False
+        if overrule_available and suggest_overrule:
+            return self.settle_overrule(kept, reject)
 
-            kept, reject, _ = self.editor.choose_cards_to_submit(
-                choices + [reject]
-            )
+        self.discard(reject)
+        self.publish(kept[0])
 
-        self.discard_pile.append(reject)
-        choice = kept[0]
+        return True
+
+    def edit_publication_steps(self, choices, overrule_available):
+        """The steps of `edit_publication`."""
+
+        kept, reject, suggest_overrule = yield Decision(
+            "editor", self.editor, (choices, overrule_available)
+        )
+
+        if overrule_available and suggest_overrule:
+            return (yield from self.settle_overrule_steps(kept, reject))
+
+        self.discard(reject)
+        self.publish(kept[0])
+
+        return True
+
+    def discard(self, card):
+        """Put a card rejected by the print team on the discard pile."""
+
+        self.deck.discard(card)
+        self.record(DISCARD, card == "H")
+
+    def publish(self, choice):
+        """Publish the card chosen by the print team, who become the last
+        print team to have published."""
+
+        self.record(PUBLISH, choice == "H")
 
         self.publications[choice] += 1
         self.last_successfully_published = choice
@@ -159,13 +598,37 @@ class DogmaGame:
         self.ex_dean = self.dean
         self.ex_editor = self.editor
 
-        return True
+    def settle_overrule(self, choices, reject):
+        """Ask the dean whether they agree to the editor's overrule. If not,
+        the editor has to publish one of their cards after all."""
+
+        agreed = self.dean.agree_to_overrule()
+        self.record(OVERRULE, bool(agreed))
+        if agreed:
+            self.pressure_to_print += 1
+            return False
+
+        return self.edit_publication(choices + [reject], False)
+
+    def settle_overrule_steps(self, choices, reject):
+        """The steps of `settle_overrule`."""
+
+        agreed = yield Decision("agree", self.dean, ())
+        self.record(OVERRULE, bool(agreed))
+        if agreed:
+            self.pressure_to_print += 1
+            return False
+
+        return (
+            yield from self.edit_publication_steps(choices + [reject], False)
+        )
 
     def emergency_publication(self):
         """The pressure to print has forced the society to print whatever is at
         the top of the deck."""
 
         choice = self.draw_journals(1)[0]
+        self.record(PUBLISH, choice == "H", True)
 
         self.publications[choice] += 1
         self.last_successfully_published = None
@@ -174,9 +637,7 @@ class DogmaGame:
     def _get_players_for_denouncement(self):
         """Get the players that can be denounced."""
 
-        return tuple(
-            p for p in self.players if p is not self.dean and not p.denounced
-        )
+        return self.seating.eligible(self.dean)
 
     def perform_emergency_actions(self):
         """As things become more desperate for the conformists, special powers
@@ -191,46 +652,86 @@ class DogmaGame:
               ability to opt out of publishing a journal by agreeing to throw
               out their hand. The editor instigates and if the dean does not
               agree then a publication must follow as normal.
+
+        These are the standard triggers, which can be changed in the rules.
         """
 
-        if self.publications["H"] == 3:
-            cards = self.draw_journals()
-            self.journal_cards = cards + self.journal_cards
-            self.dean.seen = cards
+        rules, published = self.rules, self.publications["H"]
+        if published in rules.peek:
+            self.reveal_top_cards()
 
-        if self.publications["H"] in [4, 5]:
+        if published in rules.denounce:
             player = self.dean.denounce(self._get_players_for_denouncement())
-            player.denounced = True
-            if self.galileo_denounced_win():
+            if self.remove_player(player):
                 return True
 
-        if self.publications["H"] == 5:
-            self.overrule_available = True
+        if published in rules.overrule:
+            self.unlock_overrule()
 
         return False
 
+    def perform_emergency_actions_steps(self):
+        """The steps of `perform_emergency_actions`."""
+
+        rules, published = self.rules, self.publications["H"]
+        if published in rules.peek:
+            self.reveal_top_cards()
+
+        if published in rules.denounce:
+            player = yield Decision(
+                "denounce", self.dean, (self._get_players_for_denouncement(),)
+            )
+            if self.remove_player(player):
+                return True
+
+        if published in rules.overrule:
+            self.unlock_overrule()
+
+        return False
+
+    def reveal_top_cards(self):
+        """Show the dean the next three journal cards to be drawn."""
+
+        self.dean.seen = self.deck.peek()
+        if self.log is not None:
+            self.log.record_cards(PEEK, self.dean.seen)
+
+    def remove_player(self, player):
+        """Remove a player denounced by the dean from the game, and check
+        whether that was Galileo."""
+
+        self.seating.denounce(player)
+        self.record(DENOUNCE, self.seat_of(player))
+
+        return self.galileo_denounced_win()
+
+    def unlock_overrule(self):
+        """Give print teams the power to overrule a publication."""
+
+        self.overrule_available = True
+        self.record(UNLOCK)
+
     def galileo_editor_win(self):
-        """Check if the mavericks win by installing Galileo as editor with at
-        least three favourable journals published."""
+        """Check if the mavericks win by installing Galileo as editor with
+        enough favourable journals published, which is three by default."""
 
-        if self.editor.role == "G" and self.publications["H"] >= 3:
-            self.winner = "M"
-            self.message = "Galileo's rhetorical prowess has dominated."
+        rhetoric = self.rules.rhetoric
+        if self.editor.role == "G" and self.publications["H"] >= rhetoric:
+            self.end(RHETORIC)
             return True
 
         return False
 
     def journal_count_win(self):
-        """Check if either team has filled its journal slots."""
+        """Check if either team has filled its journal slots, of which there
+        are six heliocentric and five geocentric by default."""
 
-        if self.publications["H"] == 6:
-            self.winner = "M"
-            self.message = "The maverick thinkers have altered the status quo."
+        if self.publications["H"] >= self.rules.win_h:
+            self.end(ALTERED)
             return True
 
-        if self.publications["G"] == 5:
-            self.winner = "C"
-            self.message = "The conformists have quelled the free-thinkers."
+        if self.publications["G"] >= self.rules.win_g:
+            self.end(QUELLED)
             return True
 
         return False
@@ -238,34 +739,95 @@ class DogmaGame:
     def galileo_denounced_win(self):
         """Check if Galileo has been denounced."""
 
-        if self.galileo.denounced:
-            self.winner = "C"
-            self.message = "The conformists have successfully ousted Galileo."
+        if self.seating.is_denounced(self.galileo):
+            self.end(OUSTED)
             return True
 
         return False
 
     def turn(self):
-        """Play a complete turn of the game."""
+        """Play a complete turn of the game. If the deck runs out of journals
+        on the way, the game is over with no winner."""
+
+        self.start_turn()
+
+        return self.hold_vote(self.form_print_team())
+
+    def turn_steps(self):
+        """The steps of `turn`."""
 
+        self.start_turn()
+        nomination = yield from self.form_print_team_steps()
+
+        return (yield from self.hold_vote_steps(nomination))
+
+    def play_out(self, resume, *args):
+        """Play out the rest of a turn by calling `resume` with `args`,
+        bringing the game to an end with no winner if the deck runs out of
+        journals on the way. Returns whether the game is over."""
+
+        try:
+            return resume(*args)
+        except EmptyDeckError:
+            self.end(EXHAUSTED)
+            return True
+
+    def start_turn(self):
+        """Start a turn by passing the role of dean on."""
+
+        self.turns += 1
         if self.dean is None:
             self.elect_first_dean()
         else:
             self.set_next_dean()
+        self.record(TURN, self.seat_of(self.dean))
+
+    def hold_vote(self, nomination, votes=None):
+        """Put a nomination to the vote, and play out the rest of the turn, as
+        in `play_out`. Votes already collected are passed on to
+        `cast_vote`."""
+
+        try:
+            if not self.cast_vote(nomination, votes):
+                return self.finish_turn(False)
+
+            self.editor = nomination
+            if self.galileo_editor_win():
+                return True
 
-        nomination = self.form_print_team()
-        successful = self.cast_vote(nomination)
+            return self.finish_turn(True, self.form_publication())
+        except EmptyDeckError:
+            self.end(EXHAUSTED)
+            return True
+
+    def hold_vote_steps(self, nomination, votes=None):
+        """The steps of `hold_vote`."""
+
+        try:
+            if not (yield from self.cast_vote_steps(nomination, votes)):
+                return (yield from self.finish_turn_steps(False))
 
-        if successful:
             self.editor = nomination
             if self.galileo_editor_win():
                 return True
 
-            if not self.form_publication():
-                self.pressure_to_print += 1
-                return False
+            published = yield from self.form_publication_steps()
+
+            return (yield from self.finish_turn_steps(True, published))
+        except EmptyDeckError:
+            self.end(EXHAUSTED)
+            return True
 
-        if self.pressure_to_print == 3:
+    def finish_turn(self, successful, published=True):
+        """Finish a turn once the vote, and any publication, are over. A
+        publication that was overruled adds to the pressure to print and ends
+        the turn there."""
+
+        if not published:
+            self.pressure_to_print += 1
+            return False
+
+        if self.pressure_to_print == self.rules.pressure:
             self.emergency_publication()
 
         if self.journal_count_win():
@@ -274,19 +836,40 @@ class DogmaGame:
         if successful and self.last_successfully_published == "H":
             self.perform_emergency_actions()
 
-        if self.galileo_denounced_win():
+        return self.galileo_denounced_win()
+
+    def finish_turn_steps(self, successful, published=True):
+        """The steps of `finish_turn`."""
+
+        if not published:
+            self.pressure_to_print += 1
+            return False
+
+        if self.pressure_to_print == self.rules.pressure:
+            self.emergency_publication()
+
+        if self.journal_count_win():
             return True
 
-        return False
+        if successful and self.last_successfully_published == "H":
+            yield from self.perform_emergency_actions_steps()
 
-    def play(self):
-        """Play a game of looping turns until one team wins."""
+        return self.galileo_denounced_win()
+
+    def play(self, max_turns=None):
+        """Play a game of looping turns until one team wins. If `max_turns` is
+        given and that many turns pass without a winner, or the deck runs out
+        of journals, the game is abandoned and there is no winner."""
 
         self.assign_roles()
         self.inform_mavericks()
 
         no_winner = True
         while no_winner:
+            if self.turns == max_turns:
+                self.end(ADJOURNED)
+                break
+
             no_winner = not self.turn()
 
         return self.winner, self.message
@@ -0,0 +1,322 @@
+"""An incremental Bayesian estimate of who Galileo and the maverick are.
+
+A `RoleBelief` keeps a probability for every way the two maverick roles could
+be dealt around the table, which is ``n * (n - 1)`` hypotheses for ``n``
+players. Each public event multiplies those probabilities by how likely the
+event is under each hypothesis, taken from the precomputed tables of a
+`Model`, and the result is normalised. Sets of seats are kept as bitmasks, so
+each update takes a constant amount of work per hypothesis.
+
+Some events are certain evidence, whatever the model. Galileo cannot have
+been denounced if the game goes on afterwards. Nor can Galileo have been
+voted in as editor once enough heliocentric journals are out for that to win
+the game, unless the game ends there. Both the model and the belief follow
+the standard rules unless they are given others.
+
+A player can keep a belief up to date from the log of their game before each
+decision::
+
+    class Sleuth(Random):
+        def nominate(self, players):
+            belief = self.belief.catch_up(self.game.log)
+            suspicion = belief.suspicion()
+            return min(players, key=lambda p: suspicion[self.game.seat_of(p)])
+"""
+
+from .events import DENOUNCE, END, NOMINATE, OVERRULE, PUBLISH, TURN, VOTE
+from .game import STANDARD
+from .solver import binomial
+
+CONFORMIST, MAVERICK = 0, 1
+
+
+def publication_odds(helio=11, geo=6):
+    """Get the chance that a print team publishes a heliocentric journal,
+    from three cards drawn from a deck of `helio` and `geo` cards, indexed by
+    the sides of the dean and the editor. Each side is taken to play its
+    best: a conformist passes on and publishes geocentric cards when they
+    can, and a maverick heliocentric ones."""
+
+    total = binomial(helio + geo, 3)
+    drawn = [
+        binomial(helio, count) * binomial(geo, 3 - count) / total
+        for count in range(4)
+    ]
+    at_least = [sum(drawn[count:]) for count in range(4)]
+
+    return (
+        (at_least[3], at_least[2]),
+        (at_least[2], at_least[1]),
+    )
+
+
+class Model:
+    """The likelihood tables behind a `RoleBelief`. Sides are indexed by
+    `CONFORMIST` and `MAVERICK`, and print teams by how many mavericks are in
+    them:
+
+        - `vote[side][team]` is the chance of voting for a print team.
+        - `nominate[dean][nominee]` and `denounce[dean][target]` are the
+          relative weights given to each player on offer.
+        - `publish[dean][editor]` is the chance of publishing a
+          heliocentric journal, which by default comes from the deck of
+          `rules`.
+        - `overrule[team]` is the chance of a dean agreeing to an overrule.
+
+    Every table is mixed with a player who acts at random, in proportion
+    `noise`, so that no action is ever ruled out by the tables alone."""
+
+    def __init__(
+        self,
+        vote=((0.5, 0.5, 0.5), (0.3, 0.8, 0.9)),
+        nominate=((1, 1), (1, 3)),
+        denounce=((1, 1), (1, 0.1)),
+        publish=None,
+        overrule=(0.6, 0.4, 0.2),
+        noise=0.1,
+        rules=STANDARD,
+    ):
+
+        self.vote = vote
+        self.nominate = nominate
+        self.denounce = denounce
+        self.publish = publish or publication_odds(
+            rules.journals_h, rules.journals_g
+        )
+        self.overrule = overrule
+        self.noise = noise
+
+
+class RoleBelief:
+    """A posterior over the seats of Galileo and the maverick, from the
+    point of view of the player in `seat` (a conformist, since the mavericks
+    know everything already), or of an onlooker if `seat` is `None`, in a
+    game played by `rules`.
+
+    The belief also follows the public state of the game, so it can be fed
+    the events of an `EventLog` one at a time with `observe`, or all those
+    since it last looked with `catch_up`."""
+
+    def __init__(
+        self, number_of_players, seat=None, model=None, rules=STANDARD
+    ):
+
+        self.number_of_players = number_of_players
+        self.rules = rules
+        self.model = model or Model(rules=rules)
+        self.hypotheses = [
+            (galileo, maverick)
+            for galileo in range(number_of_players)
+            for maverick in range(number_of_players)
+            if galileo != maverick
+        ]
+        self.masks = [
+            1 << galileo | 1 << maverick
+            for galileo, maverick in self.hypotheses
+        ]
+        self.popcount = [
+            bin(mask).count("1") for mask in range(1 << number_of_players)
+        ]
+        self.weights = [
+            float(seat not in hypothesis) for hypothesis in self.hypotheses
+        ]
+        self.normalise()
+
+        self.alive = (1 << number_of_players) - 1
+        self.dean = self.nominee = self.editor = None
+        self.ex_dean = self.ex_editor = None
+        self.helio = 0
+        self.unless_the_game_ends = None
+        self.position = 0
+
+    def normalise(self):
+        """Scale the weights to add up to one."""
+
+        total = sum(self.weights)
+        if not total:
+            raise ValueError("The evidence rules out every hypothesis.")
+
+        self.weights = [weight / total for weight in self.weights]
+
+    def update(self, likelihoods):
+        """Weigh each hypothesis by how likely the evidence is under it."""
+
+        self.weights = [
+            weight * likelihood
+            for weight, likelihood in zip(self.weights, likelihoods)
+        ]
+        self.normalise()
+
+    def nominated(self, dean, nominee, options):
+        """Update on the dean nominating an editor from the seats on offer."""
+
+        self.choice(self.model.nominate, dean, nominee, options)
+
+    def denounced(self, dean, target):
+        """Update on the dean denouncing a player. Whether that was Galileo
+        is only known once it is clear whether the game is over."""
+
+        options = self.alive & ~(1 << dean)
+        self.choice(self.model.denounce, dean, target, options)
+
+    def choice(self, weights, dean, target, options):
+        """Update on the dean choosing a target from a bitmask of options,
+        in proportion to the weights for each side."""
+
+        if not isinstance(options, int):
+            options = sum(1 << seat for seat in set(options))
+
+        noise = self.model.noise
+        random = noise / self.popcount[options]
+        likelihoods = []
+        for mask in self.masks:
+            side = weights[mask >> dean & 1]
+            mavericks = self.popcount[options & mask]
+            total = side[CONFORMIST] * (self.popcount[options] - mavericks)
+            total += side[MAVERICK] * mavericks
+            chosen = side[mask >> target & 1]
+            likelihoods.append((1 - noise) * chosen / total + random)
+
+        self.update(likelihoods)
+
+    def voted(self, dean, nominee, ayes, voters):
+        """Update on a vote on a print team, given bitmasks of the players
+        who voted for it and of everyone who voted."""
+
+        noise = self.model.noise
+        table = [
+            [(1 - noise) * chance + noise / 2 for chance in chances]
+            for chances in self.model.vote
+        ]
+        team = 1 << dean | 1 << nominee
+        count, yes = self.popcount[voters], self.popcount[ayes]
+        likelihoods = []
+        for mask in self.masks:
+            mavericks = self.popcount[team & mask]
+            conformist = table[CONFORMIST][mavericks]
+            maverick = table[MAVERICK][mavericks]
+            maverick_yes = self.popcount[ayes & mask]
+            maverick_no = self.popcount[voters & mask] - maverick_yes
+            conformist_yes = yes - maverick_yes
+            conformist_no = count - yes - maverick_no
+            likelihoods.append(
+                maverick**maverick_yes
+                * (1 - maverick) ** maverick_no
+                * conformist**conformist_yes
+                * (1 - conformist) ** conformist_no
+            )
+
+        self.update(likelihoods)
+
+    def published(self, dean, editor, card):
+        """Update on a print team publishing a card."""
+
+        noise = self.model.noise
+        likelihoods = []
+        for mask in self.masks:
+            chance = self.model.publish[mask >> dean & 1][mask >> editor & 1]
+            chance = (1 - noise) * chance + noise / 2
+            likelihoods.append(chance if card == "H" else 1 - chance)
+
+        self.update(likelihoods)
+
+    def overruled(self, dean, editor, agreed):
+        """Update on a dean agreeing to, or refusing, an overrule."""
+
+        noise = self.model.noise
+        team = 1 << dean | 1 << editor
+        likelihoods = []
+        for mask in self.masks:
+            chance = self.model.overrule[self.popcount[team & mask]]
+            chance = (1 - noise) * chance + noise / 2
+            likelihoods.append(chance if agreed else 1 - chance)
+
+        self.update(likelihoods)
+
+    def not_galileo(self, seat):
+        """Rule out a player being Galileo."""
+
+        self.update([float(galileo != seat) for galileo, _ in self.hypotheses])
+
+    def marginal(self, position):
+        """Get the chance of each seat holding one of the two roles."""
+
+        chances = [0.0] * self.number_of_players
+        for hypothesis, weight in zip(self.hypotheses, self.weights):
+            chances[hypothesis[position]] += weight
+
+        return chances
+
+    def galileo(self):
+        """Get the chance of each seat being Galileo."""
+
+        return self.marginal(0)
+
+    def maverick(self):
+        """Get the chance of each seat being the maverick."""
+
+        return self.marginal(1)
+
+    def suspicion(self):
+        """Get the chance of each seat being either maverick."""
+
+        return [
+            galileo + maverick
+            for galileo, maverick in zip(self.galileo(), self.maverick())
+        ]
+
+    def nomination_options(self):
+        """Get the bitmask of the players the dean could have nominated."""
+
+        excluded = [self.dean, self.ex_editor]
+        if self.number_of_players > 5:
+            excluded.append(self.ex_dean)
+
+        options = self.alive
+        for seat in excluded:
+            if seat is not None:
+                options &= ~(1 << seat)
+
+        return options
+
+    def observe(self, code, a=0, b=0, c=0):
+        """Update on an event from a game's log. Events that only some of the
+        players see, such as the cards drawn, are passed over."""
+
+        if self.unless_the_game_ends is not None and code != END:
+            self.not_galileo(self.unless_the_game_ends)
+        self.unless_the_game_ends = None
+
+        if code == TURN:
+            self.dean = a
+        elif code == NOMINATE:
+            self.nominee = a
+            self.nominated(self.dean, a, self.nomination_options())
+        elif code == VOTE:
+            self.voted(self.dean, self.nominee, a, b)
+            ayes = self.popcount[a]
+            if ayes > self.popcount[b] - ayes:
+                self.editor = self.nominee
+                if self.helio >= self.rules.rhetoric:
+                    self.unless_the_game_ends = self.editor
+        elif code == PUBLISH:
+            if not b:
+                self.published(self.dean, self.editor, "GH"[a])
+                self.ex_dean, self.ex_editor = self.dean, self.editor
+            self.helio += a
+        elif code == OVERRULE:
+            self.overruled(self.dean, self.editor, a)
+        elif code == DENOUNCE:
+            self.denounced(self.dean, a)
+            self.alive &= ~(1 << a)
+            self.unless_the_game_ends = a
+
+    def catch_up(self, log):
+        """Update on every event added to a log since the last catch up, and
+        return the belief."""
+
+        for event in log.since(self.position):
+            self.observe(*event)
+            self.position += 1
+
+        return self
@@ -0,0 +1,246 @@
+"""Tools for keeping track of how long players take over their decisions,
+and for holding them to a time limit.
+
+A `LatencyTracker` attached to a player wraps each of their decisions, timing
+them in histograms kept for each strategy and decision. With a `time_limit`,
+a decision that runs over is abandoned and a default, legal action is taken
+in its place. Where the operating system allows (on Unix, in the main
+thread), the decision is interrupted as soon as its time is up; elsewhere it
+is allowed to finish, but its answer is thrown away."""
+
+import functools
+import multiprocessing
+import signal
+import threading
+import time
+from collections import Counter
+
+from .profiling import Histogram
+from .strategies import all_strategies
+from .tournament import make_chunks, play_game
+
+DECISIONS = (
+    "nominate",
+    "vote",
+    "choose_cards_to_submit",
+    "agree_to_overrule",
+    "denounce",
+)
+
+
+class DecisionTimeout(Exception):
+    """Raised inside a decision that has run past its time limit."""
+
+
+def default_nominate(players):
+    """Nominate the first of the players on offer."""
+
+    return players[0]
+
+
+def default_vote(nominee):
+    """Vote against the nomination."""
+
+    return "no"
+
+
+def default_choose_cards_to_submit(choices, overrule_available=False):
+    """Reject the last card, and do not suggest an overrule."""
+
+    reject = choices.pop()
+
+    return choices, reject, False
+
+
+def default_agree_to_overrule():
+    """Refuse the overrule."""
+
+    return False
+
+
+def default_denounce(players):
+    """Denounce the first of the players on offer."""
+
+    return players[0]
+
+
+DEFAULTS = {
+    "nominate": default_nominate,
+    "vote": default_vote,
+    "choose_cards_to_submit": default_choose_cards_to_submit,
+    "agree_to_overrule": default_agree_to_overrule,
+    "denounce": default_denounce,
+}
+
+
+def _alarm(signum, frame):
+    """Interrupt a decision whose time is up."""
+
+    raise DecisionTimeout
+
+
+def can_interrupt():
+    """Check whether a decision can be interrupted when its time is up."""
+
+    return (
+        hasattr(signal, "setitimer")
+        and threading.current_thread() is threading.main_thread()
+    )
+
+
+def call_with_limit(method, args, time_limit):
+    """Call a method, raising `DecisionTimeout` if it takes longer than
+    `time_limit` seconds."""
+
+    if not can_interrupt():
+        start = time.perf_counter()
+        answer = method(*args)
+        if time.perf_counter() - start > time_limit:
+            raise DecisionTimeout
+
+        return answer
+
+    previous = signal.signal(signal.SIGALRM, _alarm)
+    signal.setitimer(signal.ITIMER_REAL, time_limit)
+    try:
+        return method(*args)
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+class LatencyTracker:
+    """Timings of the decisions of every player the tracker is attached to,
+    in nanoseconds, by strategy and decision. If there is a `time_limit`, in
+    seconds, any decision that runs over it is replaced by the default in
+    `DEFAULTS`, and counted in `timeouts`."""
+
+    def __init__(self, time_limit=None):
+
+        self.time_limit = time_limit
+        self.histograms = {}
+        self.timeouts = Counter()
+        self.deciding = False
+
+    def attach(self, player):
+        """Start timing the decisions of a player."""
+
+        strategy = type(player).__name__
+        for name in DECISIONS:
+            key = strategy, name
+            histogram = self.histograms.setdefault(key, Histogram())
+            method = getattr(player, name)
+            setattr(player, name, self.timed(method, key, histogram))
+
+    @staticmethod
+    def detach(player):
+        """Stop timing the decisions of a player."""
+
+        for name in DECISIONS:
+            player.__dict__.pop(name, None)
+
+    def timed(self, method, key, histogram):
+        """Wrap a decision so that the time it takes goes in a histogram, and
+        so that it keeps to the time limit. A decision made in the middle of
+        another, as when a player asks themselves whether to agree to an
+        overrule, counts towards the outer one."""
+
+        clock = time.perf_counter_ns
+        default = DEFAULTS[key[1]]
+
+        def wrapper(*args):
+
+            if self.deciding:
+                return method(*args)
+
+            self.deciding = True
+            start = clock()
+            try:
+                return self.decide(method, args, key, default)
+            finally:
+                histogram.add(clock() - start)
+                self.deciding = False
+
+        wrapper.__wrapped__ = method
+
+        return wrapper
+
+    def decide(self, method, args, key, default):
+        """Make a decision within the time limit, or fall back on the
+        default. Any list of cards handed over is put back as it was before
+        the default is used."""
+
+        if self.time_limit is None:
+            return method(*args)
+
+        original = [list(arg) for arg in args if isinstance(arg, list)]
+        try:
+            return call_with_limit(method, args, self.time_limit)
+        except DecisionTimeout:
+            self.timeouts[key] += 1
+            lists = (arg for arg in args if isinstance(arg, list))
+            for arg, before in zip(lists, original):
+                arg[:] = before
+
+            return default(*args)
+
+    def merge(self, other):
+        """Add the timings and timeouts from another tracker to this one."""
+
+        for key, histogram in other.histograms.items():
+            self.histograms.setdefault(key, Histogram()).merge(histogram)
+        self.timeouts.update(other.timeouts)
+
+    def export(self):
+        """Export the timings as a dictionary of plain values, by strategy and
+        then decision, ready to be saved as JSON."""
+
+        exported = {}
+        for (strategy, name), histogram in sorted(self.histograms.items()):
+            record = histogram.as_dict()
+            record["timeouts"] = self.timeouts[strategy, name]
+            exported.setdefault(strategy, {})[name] = record
+
+        return exported
+
+
+def track_chunk(chunk, time_limit=None):
+    """Play every seed in a chunk of games, as in `play_chunk`, keeping track
+    of every decision, and return the tracker."""
+
+    strategies, number_of_players, seeds, max_turns = chunk
+    tracker = LatencyTracker(time_limit)
+    for seed in seeds:
+        play_game(
+            strategies, number_of_players, seed, max_turns, tracker=tracker
+        )
+
+    return tracker
+
+
+def track_games(
+    strategies=None,
+    player_counts=(5, 6),
+    seeds=range(1000),
+    max_turns=1000,
+    time_limit=None,
+    processes=1,
+    chunksize=64,
+):
+    """Play the games of a tournament as in `run_tournament`, and keep track
+    of how long every decision takes, holding each to `time_limit`."""
+
+    strategies = strategies or all_strategies
+    chunks = make_chunks(strategies, player_counts, seeds, max_turns, chunksize)
+    track = functools.partial(track_chunk, time_limit=time_limit)
+    tracker = LatencyTracker(time_limit)
+
+    if processes == 1:
+        for other in map(track, chunks):
+            tracker.merge(other)
+    else:
+        with multiprocessing.Pool(processes) as pool:
+            for other in pool.imap_unordered(track, chunks):
+                tracker.merge(other)
+
+    return tracker
@@ -0,0 +1,197 @@
+"""A load test for the game server, with scripted clients who play at random.
+
+Each client opens its own connection, joins a table and answers every
+decision at random, as `strategies.Random` would, and then joins again until
+it has played its share of games. Once every client is done, the harness
+reports the number of games played each second and the time the server
+waited on each kind of decision, from asking to answer. Run it as a script,
+against a server of its own or one already running::
+
+    python -m dogma.loadtest --clients 1000 --games 5
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from .server import SIZES, Server
+
+
+async def open_connection(address):
+    """Connect to a server at a host and port, or at the path of a Unix
+    socket."""
+
+    if isinstance(address, str):
+        return await asyncio.open_unix_connection(address)
+
+    return await asyncio.open_connection(*address)
+
+
+def random_answer(state, message):
+    """Answer a decision at random."""
+
+    decision = message["decision"]
+    if decision in ("nominate", "denounce"):
+        return state.choice(message["options"])
+    if decision == "vote":
+        return state.choice(("yes", "no"))
+    if decision == "agree_to_overrule":
+        return state.choice((True, False))
+
+    overrule = message["overrule_available"] and state.choice((True, False))
+
+    return {"reject": state.choice(message["cards"]), "overrule": overrule}
+
+
+async def send(writer, message):
+    """Send a message to the server."""
+
+    writer.write(json.dumps(message).encode() + b"\n")
+    await writer.drain()
+
+
+async def scripted_client(address, name, players=5, games=1, seed=None):
+    """Connect to a server and play `games` games at random, one after
+    another, at tables of `players`. Returns the number of decisions made."""
+
+    reader, writer = await open_connection(address)
+    state = random.Random(seed)
+    decisions = 0
+    for _ in range(games):
+        await send(writer, {"type": "join", "name": name, "players": players})
+        while True:
+            message = json.loads(await reader.readline())
+            if message["type"] == "end":
+                break
+            if message["type"] == "decide":
+                answer = random_answer(state, message)
+                await send(
+                    writer,
+                    {"type": "answer", "id": message["id"], "answer": answer},
+                )
+                decisions += 1
+
+    writer.close()
+    await writer.wait_closed()
+
+    return decisions
+
+
+async def fetch_stats(address):
+    """Ask a server for its statistics."""
+
+    reader, writer = await open_connection(address)
+    await send(writer, {"type": "stats"})
+    stats = json.loads(await reader.readline())
+    writer.close()
+    await writer.wait_closed()
+
+    return stats
+
+
+async def load_test(
+    clients=1000,
+    players=5,
+    games=1,
+    address=None,
+    seed=0,
+    **options,
+):
+    """Drive `clients` scripted clients against a server, each playing
+    `games` games at tables of `players`. Without an `address`, a server is
+    started for the test with any other `options`. The latencies are those
+    recorded by the server since it started."""
+
+    if clients % players:
+        raise ValueError("The clients must fill every table.")
+
+    server = None
+    if address is None:
+        server = await Server(seed=seed, **options).start()
+        address = server.address
+
+    before = await fetch_stats(address)
+    start = time.perf_counter()
+    decisions = await asyncio.gather(
+        *(
+            scripted_client(address, str(i), players, games, seed + i)
+            for i in range(clients)
+        )
+    )
+    elapsed = time.perf_counter() - start
+    stats = await fetch_stats(address)
+
+    if server is not None:
+        await server.close()
+
+    played = stats["games"] - before["games"]
+
+    return {
+        "clients": clients,
+        "players": players,
+        "games": played,
+        "decisions": sum(decisions),
+        "elapsed": elapsed,
+        "games_per_second": played / elapsed,
+        "decisions_per_second": sum(decisions) / elapsed,
+        "latency": stats["decisions"],
+        "timeouts": stats["timeouts"],
+    }
+
+
+def report(results):
+    """Lay out the results of a load test as a table, with latencies in
+    microseconds."""
+
+    lines = [
+        f"{results['clients']} clients played {results['games']} games "
+        f"in {results['elapsed']:.2f}s",
+        f"{results['games_per_second']:.1f} games/s, "
+        f"{results['decisions_per_second']:.1f} decisions/s",
+        f"{'decision':<24}{'count':>9}{'mean':>10}{'p50':>10}{'p99':>10}",
+    ]
+    for decision, latency in results["latency"].items():
+        if not latency["count"]:
+            continue
+        figures = (
+            latency["mean"] / 1000,
+            latency["p50"] / 1000,
+            latency["p99"] / 1000,
+        )
+        lines.append(
+            f"{decision:<24}{latency['count']:>9}"
+            + "".join(f"{figure:>10.1f}" for figure in figures)
+        )
+
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    """Run a load test from the command line."""
+
+    parser = argparse.ArgumentParser(description="Load test a game server.")
+    parser.add_argument("--clients", type=int, default=1000)
+    parser.add_argument("--players", type=int, default=5, choices=SIZES)
+    parser.add_argument("--games", type=int, default=1)
+    parser.add_argument("--host", help="the host of a running server")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", help="the Unix socket of a running server")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="print JSON")
+    args = parser.parse_args(argv)
+
+    address = args.unix or (args.host and (args.host, args.port))
+    results = asyncio.run(
+        load_test(
+            args.clients, args.players, args.games, address or None, args.seed
+        )
+    )
+    print(json.dumps(results, indent=2) if args.json else report(results))
+
+    return results
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -0,0 +1,76 @@
+"""Tools for playing many games side by side, so that players can answer for
+all of them at once.
+
+Every game in a batch plays its turns in step with the others. At the start
+of each turn, every dean is asked for a nomination in one call to
+`nominate_batch` for each strategy, and then every voter in every game is
+asked in one call to `vote_batch` for each strategy. The rest of each turn is
+played out a game at a time. Since each player draws from their own random
+state, every game goes exactly as it would if it were played on its own."""
+
+from .game import ADJOURNED, DogmaGame
+from .player import ask_in_batches
+from .strategies import all_strategies
+from .tournament import choose_lineup
+
+
+def play_in_lockstep(games, max_turns=None):
+    """Play a batch of games in step with one another. A game that passes
+    `max_turns` is adjourned, and one that exhausts its journal deck is
+    abandoned. Returns the winner and message of each game."""
+
+    for game in games:
+        game.assign_roles()
+        game.inform_mavericks()
+
+    playing = list(games)
+    while playing:
+        for game in playing:
+            if game.turns == max_turns:
+                game.end(ADJOURNED)
+        playing = [game for game in playing if game.message is None]
+
+        for game in playing:
+            game.start_turn()
+
+        nominations = ask_in_batches(
+            "nominate",
+            [game.dean for game in playing],
+            [game._get_players_for_nomination() for game in playing],
+        )
+
+        voters, nominees = [], []
+        for game, nomination in zip(playing, nominations):
+            game.form_print_team(nomination)
+            group = game.seating.eligible()
+            voters.extend(group)
+            nominees.extend([nomination] * len(group))
+
+        votes = ask_in_batches("vote", voters, nominees)
+
+        start, still_playing = 0, []
+        for game, nomination in zip(playing, nominations):
+            stop = start + len(game.seating.eligible())
+            if not game.hold_vote(nomination, votes[start:stop]):
+                still_playing.append(game)
+            start = stop
+
+        playing = still_playing
+
+    return [(game.winner, game.message) for game in games]
+
+
+def play_games_in_lockstep(
+    strategies=None, number_of_players=5, seeds=range(100), max_turns=1000
+):
+    """Play a game for each seed, as in `play_game`, all in step with one
+    another."""
+
+    strategies = strategies or all_strategies
+    games = []
+    for seed in seeds:
+        lineup = choose_lineup(strategies, number_of_players, seed)
+        players = [Strategy(str(seat)) for seat, Strategy in enumerate(lineup)]
+        games.append(DogmaGame(players, seed))
+
+    return play_in_lockstep(games, max_turns)
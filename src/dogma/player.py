@@ -1,10 +1,15 @@
 """The player classes."""
 
 import abc
+import random
 
 
 class Player:
-    """A base player class to be inherited from."""
+    """A base player class to be inherited from. Any randomness in a strategy
+    should be drawn from `self.random`, which the game sets when the player
+    takes their seat. A player who needs one before then is given one of
+    their own, seeded from the system. The game they are sitting in is
+    `self.game`."""
 
     def __init__(self, name):
 
@@ -12,8 +17,41 @@ class Player:
         self.role = None
         self.partner = None
         self.seen = None
+        self.game = None
+        self.seating = None
         self.denounced = False
 
+    def __getattr__(self, name):
+
+        if name != "random":
+            raise AttributeError(
+                f"{type(self).__name__!r} object has no attribute {name!r}"
+            )
+
+        self.random = random.Random()
+        return self.random
+
+    @property
+    def denounced(self):
+        """Whether the player has been removed from the game. Once they have
+        a seat, this is read from and written to the seating plan of their
+        game."""
+
+        if self.seating is None:
+            return self._denounced
+
+        return self.seating.is_denounced(self)
+
+    @denounced.setter
+    def denounced(self, denounced):
+
+        self._denounced = denounced
+        if self.seating is not None:
+            if denounced:
+                self.seating.denounce(self)
+            else:
+                self.seating.reinstate(self)
+
     def __repr__(self):
 
         class_name = self.__class__.__name__
@@ -40,3 +78,56 @@ class Player:
     @abc.abstractmethod
     def denounce(self, players):
         """Placeholder for deciding who to denounce, if anyone."""
+
+    @classmethod
+    def nominate_batch(cls, players, options):
+        """Nominate an editor for each of a batch of deans, who may be in
+        different games, from the players on offer to each. Strategies that
+        can answer a batch faster than one at a time should override this."""
+
+        return [
+            player.nominate(players_)
+            for player, players_ in zip(players, options)
+        ]
+
+    @classmethod
+    def vote_batch(cls, players, nominees):
+        """Cast a vote for each of a batch of players on the nominee put to
+        them. Strategies that can answer a batch faster than one at a time
+        should override this."""
+
+        return [
+            player.vote(nominee) for player, nominee in zip(players, nominees)
+        ]
+
+
+def answers_in_batches(Strategy, decision):
+    """Check whether a strategy overrides the batch version of a decision."""
+
+    name = f"{decision}_batch"
+
+    return (
+        getattr(Strategy, name).__func__ is not getattr(Player, name).__func__
+    )
+
+
+def ask_in_batches(decision, players, arguments):
+    """Ask each player for a decision on their argument, with a single call to
+    the batch version of the decision for each strategy among them. The
+    answers come back in the order of the players."""
+
+    groups = {}
+    for index, player in enumerate(players):
+        groups.setdefault(type(player), []).append(index)
+
+    answers = [None] * len(players)
+    for Strategy, indices in groups.items():
+        batch = getattr(Strategy, f"{decision}_batch")
+        replies = batch(
+            [players[index] for index in indices],
+            [arguments[index] for index in indices],
+        )
+        for index, reply in zip(indices, replies):
+            answers[index] = reply
+
+    return answers
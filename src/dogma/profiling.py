@@ -0,0 +1,229 @@
+"""Tools for finding out where the time goes in a game.
+
+A `Profiler` attached to a game times each phase of a turn and keeps the
+timings in histograms. It does this by wrapping the methods of that one game,
+so a game without a profiler runs exactly the code it would otherwise. The
+phases that wait on the players are timed both as plain methods and as the
+generators of their steps, so they are timed however the game is driven, and
+include the time the players take.
+Profilers from different games, or different processes, can be merged, and
+exported as a dictionary once a batch of games is over."""
+
+import functools
+import inspect
+import multiprocessing
+import time
+from collections import Counter
+
+from .strategies import all_strategies
+from .tournament import make_chunks, play_game
+
+PHASES = {
+    "turn": ("turn", "turn_steps"),
+    "dean": ("elect_first_dean", "set_next_dean"),
+    "form_print_team": ("form_print_team", "form_print_team_steps"),
+    "cast_vote": ("cast_vote", "cast_vote_steps"),
+    "form_publication": ("form_publication", "form_publication_steps"),
+    "emergency_publication": ("emergency_publication",),
+    "perform_emergency_actions": (
+        "perform_emergency_actions",
+        "perform_emergency_actions_steps",
+    ),
+    "win_checks": (
+        "galileo_editor_win",
+        "journal_count_win",
+        "galileo_denounced_win",
+    ),
+}
+
+
+class Histogram:
+    """A histogram of durations in nanoseconds. Each duration goes in the
+    bucket for its bit length, so the bucket with bound `2 ** k` holds those
+    at least `2 ** (k - 1)` and below `2 ** k`."""
+
+    def __init__(self):
+
+        self.count = 0
+        self.total = 0
+        self.minimum = None
+        self.maximum = 0
+        self.buckets = Counter()
+
+    def add(self, duration):
+        """Add a duration to the histogram."""
+
+        self.count += 1
+        self.total += duration
+        if self.minimum is None or duration < self.minimum:
+            self.minimum = duration
+        if duration > self.maximum:
+            self.maximum = duration
+        self.buckets[duration.bit_length()] += 1
+
+    def merge(self, other):
+        """Add the durations from another histogram to this one."""
+
+        self.count += other.count
+        self.total += other.total
+        if other.count and (
+            self.minimum is None or other.minimum < self.minimum
+        ):
+            self.minimum = other.minimum
+        self.maximum = max(self.maximum, other.maximum)
+        self.buckets.update(other.buckets)
+
+    def quantile(self, q):
+        """Estimate a quantile of the durations by the upper bound of the
+        bucket it falls in. Returns `None` for an empty histogram."""
+
+        seen = 0
+        for length in sorted(self.buckets):
+            seen += self.buckets[length]
+            if seen >= q * self.count:
+                return 2**length
+
+        return None
+
+    def as_dict(self):
+        """Export the histogram as a dictionary of plain values."""
+
+        return {
+            "count": self.count,
+            "total": self.total,
+            "mean": self.total / self.count if self.count else None,
+            "min": self.minimum,
+            "max": self.maximum,
+            "p50": self.quantile(0.5),
+            "p99": self.quantile(0.99),
+            "buckets": {
+                str(2**length): self.buckets[length]
+                for length in sorted(self.buckets)
+            },
+        }
+
+
+class Profiler:
+    """Timings of the phases of every game the profiler is attached to, in
+    nanoseconds, along with the number of games."""
+
+    def __init__(self):
+
+        self.games = 0
+        self.histograms = {phase: Histogram() for phase in PHASES}
+
+    def attach(self, game):
+        """Start timing the phases of a game."""
+
+        self.games += 1
+        game.profiler = self
+        for phase, names in PHASES.items():
+            histogram = self.histograms[phase]
+            for name in names:
+                setattr(game, name, self.timed(getattr(game, name), histogram))
+
+    @staticmethod
+    def detach(game):
+        """Stop timing the phases of a game."""
+
+        game.profiler = None
+        for names in PHASES.values():
+            for name in names:
+                game.__dict__.pop(name, None)
+
+    @staticmethod
+    def timed(method, histogram):
+        """Wrap a method so that the time each call takes goes in a
+        histogram. For a generator, that is the time from its first step to
+        its last."""
+
+        clock = time.perf_counter_ns
+
+        if inspect.isgeneratorfunction(method):
+
+            @functools.wraps(method)
+            def steps(*args, **kwargs):
+
+                start = clock()
+                try:
+                    return (yield from method(*args, **kwargs))
+                finally:
+                    histogram.add(clock() - start)
+
+            return steps
+
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+
+            start = clock()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                histogram.add(clock() - start)
+
+        return wrapper
+
+    def merge(self, other):
+        """Add the timings from another profiler to this one."""
+
+        self.games += other.games
+        for phase, histogram in other.histograms.items():
+            self.histograms[phase].merge(histogram)
+
+    def counts(self):
+        """Get the number of times each phase has happened."""
+
+        return {
+            phase: histogram.count
+            for phase, histogram in self.histograms.items()
+        }
+
+    def export(self):
+        """Export everything as a dictionary of plain values, ready to be
+        saved as JSON."""
+
+        return {
+            "games": self.games,
+            "phases": {
+                phase: histogram.as_dict()
+                for phase, histogram in self.histograms.items()
+            },
+        }
+
+
+def profile_chunk(chunk):
+    """Play every seed in a chunk of games with a profiler attached to each,
+    as in `play_chunk`, and return the profiler."""
+
+    strategies, number_of_players, seeds, max_turns = chunk
+    profiler = Profiler()
+    for seed in seeds:
+        play_game(strategies, number_of_players, seed, max_turns, profiler)
+
+    return profiler
+
+
+def profile_games(
+    strategies=None,
+    player_counts=(5, 6),
+    seeds=range(1000),
+    max_turns=1000,
+    processes=1,
+    chunksize=64,
+):
+    """Play the games of a tournament as in `run_tournament`, and profile
+    them all together."""
+
+    strategies = strategies or all_strategies
+    chunks = make_chunks(strategies, player_counts, seeds, max_turns, chunksize)
+    profiler = Profiler()
+
+    if processes == 1:
+        for profile in map(profile_chunk, chunks):
+            profiler.merge(profile)
+    else:
+        with multiprocessing.Pool(processes) as pool:
+            for profile in pool.imap_unordered(profile_chunk, chunks):
+                profiler.merge(profile)
+
+    return profiler
@@ -0,0 +1,83 @@
+"""A replay engine to rebuild a game from its event log."""
+
+from .deck import Deck
+from .events import (
+    CARDS,
+    DECK,
+    DENOUNCE,
+    DISCARD,
+    DRAW,
+    END,
+    NOMINATE,
+    OVERRULE,
+    PEEK,
+    PUBLISH,
+    ROLES,
+    TURN,
+    UNLOCK,
+    VOTE,
+    unpack,
+)
+from .game import OUTCOMES, DogmaGame
+from .player import Player
+
+
+def replay(log, turns=None):
+    """Rebuild a game from its log, as it stood after `turns` turns, or at the
+    end if `turns` is not given. No strategy is consulted, so the players of
+    the game rebuilt are plain `Player` instances."""
+
+    game = players = nominee = previous = None
+    for code, a, b, c in log:
+        if code == TURN:
+            if game.turns == turns:
+                break
+            game.turns += 1
+            game.dean = players[a]
+        elif code == NOMINATE:
+            nominee = players[a]
+        elif code == VOTE:
+            ayes = bin(a).count("1")
+            if 2 * ayes > bin(b).count("1"):
+                game.editor = nominee
+            else:
+                game.pressure_to_print += 1
+        elif code == DRAW:
+            game.deck.draw(a % 32)
+        elif code == DISCARD:
+            game.deck.discard(CARDS[a])
+        elif code == OVERRULE:
+            game.pressure_to_print += 2 * a
+        elif code == PUBLISH:
+            card = CARDS[a]
+            game.publications[card] += 1
+            game.pressure_to_print = 0
+            if b:
+                game.last_successfully_published = None
+            else:
+                game.last_successfully_published = card
+                game.ex_dean, game.ex_editor = game.dean, game.editor
+        elif code == PEEK:
+            game.dean.seen = unpack(a, b, c)
+        elif code == DENOUNCE:
+            game.seating.denounce(players[a])
+        elif code == UNLOCK:
+            game.overrule_available = True
+        elif code == END:
+            game.winner, game.message = OUTCOMES[a]
+        elif code == DECK:
+            cards = unpack(a, b, c)
+            if previous == DECK:
+                cards = game.deck.remaining() + cards
+            game.deck = Deck(cards, (), game.random)
+        elif code == ROLES:
+            for seat, player in enumerate(players):
+                player.role = "G" if seat == a else "M" if seat == b else "C"
+            game.galileo, game.maverick = players[a], players[b]
+            game.inform_mavericks()
+        else:
+            players = [Player(str(seat)) for seat in range(a)]
+            game = DogmaGame(players)
+        previous = code
+
+    return game
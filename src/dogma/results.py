@@ -0,0 +1,365 @@
+"""Tools for streaming the result of every game in a large run to disk.
+
+Games are played and recorded one at a time, in seed order, and written out
+in batches, so memory use does not grow with the number of games. Each batch
+is committed to disk before the next is started, and a run that is
+interrupted picks up again after the last seed committed, once anything
+partly written after it has been thrown away by `Sink.resume`."""
+
+import abc
+import csv
+import functools
+import io
+import itertools
+import json
+import multiprocessing
+import os
+
+from .events import EventLog
+from .strategies import all_strategies
+from .tournament import choose_lineup, play_table
+
+FIELDS = (
+    "seed",
+    "players",
+    "strategies",
+    "roles",
+    "winner",
+    "message",
+    "turns",
+    "publications_h",
+    "publications_g",
+)
+TEXT = ("strategies", "roles", "winner", "message")
+
+
+def record_game(
+    strategies, number_of_players, seed, max_turns=None, history=False
+):
+    """Play a game as in `play_game`, and make a record of how it went. With
+    `history`, the record also holds the bytes of the game's event log."""
+
+    lineup = choose_lineup(strategies, number_of_players, seed)
+    game = play_table(lineup, seed, max_turns, EventLog() if history else None)
+
+    record = {
+        "seed": seed,
+        "players": number_of_players,
+        "strategies": ",".join(Strategy.__name__ for Strategy in lineup),
+        "roles": "".join(player.role for player in game.players),
+        "winner": game.winner,
+        "message": game.message,
+        "turns": game.turns,
+        "publications_h": game.publications["H"],
+        "publications_g": game.publications["G"],
+    }
+    if history:
+        record["events"] = bytes(game.log)
+
+    return record
+
+
+def record_games(
+    strategies=None,
+    number_of_players=5,
+    seeds=range(1000),
+    max_turns=1000,
+    processes=1,
+    chunksize=64,
+    history=False,
+):
+    """Yield a record of each game, in the order of `seeds`. With more than
+    one process, games are played in chunks of `chunksize` across a pool of
+    workers, a few chunks each at a time, so the pool never runs far ahead of
+    the records taken."""
+
+    strategies = strategies or all_strategies
+    record = functools.partial(
+        record_game,
+        strategies,
+        number_of_players,
+        max_turns=max_turns,
+        history=history,
+    )
+
+    if processes == 1:
+        yield from map(record, seeds)
+        return
+
+    seeds = iter(seeds)
+    window = 4 * processes * chunksize
+    with multiprocessing.Pool(processes) as pool:
+        batch = list(itertools.islice(seeds, window))
+        while batch:
+            yield from pool.imap(record, batch, chunksize)
+            batch = list(itertools.islice(seeds, window))
+
+
+def read_tail(file):
+    """Read back from the end of a file until the last two line breaks, or
+    the start of the file. Returns the position the tail starts at and its
+    bytes."""
+
+    position, tail = file.seek(0, os.SEEK_END), b""
+    while position and tail.count(b"\n") < 2:
+        step = min(position, 4096)
+        position -= step
+        file.seek(position)
+        tail = file.read(step) + tail
+
+    return position, tail
+
+
+def last_line(path):
+    """Get the last complete line of a file, as bytes, leaving out anything
+    after it that was only partly written. Returns `None` if there is no
+    complete line. The file is not changed; see `repair_lines`."""
+
+    with open(path, "rb") as file:
+        _, tail = read_tail(file)
+
+    stop = tail.rfind(b"\n") + 1
+    lines = tail[:stop].splitlines()
+
+    return lines[-1] if lines else None
+
+
+def repair_lines(path):
+    """Cut a file back to its last complete line, throwing away anything
+    after it that was only partly written, so that more lines can be added
+    on the end."""
+
+    with open(path, "rb+") as file:
+        position, tail = read_tail(file)
+        file.truncate(position + tail.rfind(b"\n") + 1)
+
+
+class Sink(abc.ABC):
+    """A file that records are written to in batches of `batch_size`. Each
+    batch is flushed and synced before the next is started. Use as a context
+    manager so that the last batch is written too."""
+
+    def __init__(self, path, batch_size=1024):
+
+        self.path = path
+        self.batch_size = batch_size
+        self.buffer = []
+
+    def __enter__(self):
+
+        return self
+
+    def __exit__(self, *exc_info):
+
+        self.close()
+
+    def write(self, record):
+        """Add a record to the current batch, writing the batch if it is
+        full."""
+
+        self.buffer.append(record)
+        if len(self.buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Write out and commit the current batch."""
+
+        if self.buffer:
+            self.commit(self.buffer)
+            self.buffer = []
+
+    def close(self):
+        """Write out anything left in the current batch."""
+
+        self.flush()
+
+    def repair(self):
+        """Throw away anything written after the last batch committed, as
+        an interrupted run may leave behind. Nothing needs doing by
+        default."""
+
+    def resume(self):
+        """Repair the sink and get the seed of the last record committed, if
+        there is one, so that a run can carry on after it."""
+
+        self.repair()
+
+        return self.last_seed()
+
+    @abc.abstractmethod
+    def commit(self, records):
+        """Placeholder for writing a batch of records to disk."""
+
+    @abc.abstractmethod
+    def last_seed(self):
+        """Placeholder for getting the seed of the last record committed, if
+        there is one."""
+
+
+class LineSink(Sink):
+    """A sink for text files with one record to a line."""
+
+    header = None
+
+    def commit(self, records):
+
+        new = not os.path.exists(self.path) or not os.path.getsize(self.path)
+        with open(self.path, "a", newline="") as file:
+            if new and self.header:
+                file.write(self.header)
+            file.write(self.format(records))
+            file.flush()
+            os.fsync(file.fileno())
+
+    def repair(self):
+
+        if os.path.exists(self.path):
+            repair_lines(self.path)
+
+    def last_seed(self):
+
+        if not os.path.exists(self.path):
+            return None
+
+        line = last_line(self.path)
+        if line is None or self.header and line.decode() == self.header.strip():
+            return None
+
+        return self.parse(line.decode())
+
+
+class NDJSONSink(LineSink):
+    """A sink that writes each record as a line of JSON."""
+
+    @staticmethod
+    def format(records):
+
+        return "".join(json.dumps(record) + "\n" for record in records)
+
+    @staticmethod
+    def parse(line):
+
+        return json.loads(line)["seed"]
+
+
+class CSVSink(LineSink):
+    """A sink that writes records to a CSV file with a header. Seeds are read
+    back as integers."""
+
+    header = ",".join(FIELDS) + "\r\n"
+
+    @staticmethod
+    def format(records):
+
+        text = io.StringIO()
+        csv.DictWriter(text, FIELDS).writerows(records)
+
+        return text.getvalue()
+
+    @staticmethod
+    def parse(line):
+
+        return int(next(csv.reader([line]))[0])
+
+
+class ParquetSink(Sink):
+    """A sink that writes each batch to its own Parquet file in the directory
+    at `path`. A batch file only appears once it is complete. This needs
+    `pyarrow`."""
+
+    def __init__(self, path, batch_size=1024):
+
+        import pyarrow
+        import pyarrow.parquet
+
+        super().__init__(path, batch_size)
+        self.pyarrow = pyarrow
+        self.parquet = pyarrow.parquet
+        self.schema = pyarrow.schema(
+            (field, pyarrow.string() if field in TEXT else pyarrow.int64())
+            for field in FIELDS
+        )
+        os.makedirs(path, exist_ok=True)
+
+    def parts(self):
+        """Get the names of the batch files written so far, in order."""
+
+        return sorted(
+            name for name in os.listdir(self.path) if name.endswith(".parquet")
+        )
+
+    def commit(self, records):
+
+        table = self.pyarrow.Table.from_pylist(records, self.schema)
+        name = f"part-{len(self.parts()):06d}.parquet"
+        temporary = os.path.join(self.path, f".{name}.tmp")
+        self.parquet.write_table(table, temporary)
+        os.replace(temporary, os.path.join(self.path, name))
+
+    def last_seed(self):
+
+        parts = self.parts()
+        if not parts:
+            return None
+
+        path = os.path.join(self.path, parts[-1])
+        seeds = self.parquet.read_table(path, columns=["seed"])["seed"]
+
+        return seeds[-1].as_py()
+
+
+SINKS = {".ndjson": NDJSONSink, ".jsonl": NDJSONSink, ".csv": CSVSink}
+
+
+def open_sink(path, batch_size=1024):
+    """Open the sink for a path: NDJSON or CSV by its extension, and Parquet
+    for anything else."""
+
+    Sink_ = SINKS.get(os.path.splitext(path)[1], ParquetSink)
+
+    return Sink_(path, batch_size)
+
+
+def remaining(seeds, last):
+    """Get the seeds that come after the last one committed. Raises a
+    `ValueError` if `last` is not one of `seeds`, as the run being resumed
+    must have played different seeds."""
+
+    seeds = iter(seeds)
+    if last is not None:
+        for seed in seeds:
+            if seed == last:
+                break
+        else:
+            raise ValueError(
+                f"The last seed committed, {last}, is not one of the seeds to "
+                "play. Resume a run with the seeds it was started with."
+            )
+
+    return seeds
+
+
+def stream_results(
+    path,
+    strategies=None,
+    number_of_players=5,
+    seeds=range(1000),
+    max_turns=1000,
+    processes=1,
+    batch_size=1024,
+):
+    """Play a game for each seed and stream the records to `path`, carrying
+    on after the last seed already committed there. Returns the number of
+    games written."""
+
+    count = 0
+    with open_sink(path, batch_size) as sink:
+        seeds = remaining(seeds, sink.resume())
+        records = record_games(
+            strategies, number_of_players, seeds, max_turns, processes
+        )
+        for record in records:
+            sink.write(record)
+            count += 1
+
+    return count
@@ -0,0 +1,111 @@
+"""The seating plan around the table of a game."""
+
+
+class Seating:
+    """The players of a game in their seats, clockwise around the table.
+
+    Each player has a bit in the `alive` bitmask until they are denounced,
+    and `following` holds the next seat clockwise from each seat whose player
+    is still alive. Both are updated as players are denounced, so finding the
+    next dean or a group of eligible players never has to search the table.
+    The groups themselves are built once for each bitmask and then reused,
+    even by copies of the seating."""
+
+    def __init__(self, players):
+
+        self.players = list(players)
+        self.seats = {player: seat for seat, player in enumerate(self.players)}
+        self.bits = {player: 1 << seat for player, seat in self.seats.items()}
+        self.bits[None] = 0
+
+        self.alive = 0
+        for player in self.players:
+            if not player.denounced:
+                self.alive |= self.bits[player]
+        self.link()
+
+        self._groups = {}
+        for player in self.players:
+            player.seating = self
+
+    def __len__(self):
+
+        return len(self.players)
+
+    def link(self):
+        """Point each seat at the next seat clockwise whose player is alive.
+        If nobody is alive, each seat points at the next one along."""
+
+        size = len(self)
+        self.following = [
+            next(
+                (
+                    (seat + step) % size
+                    for step in range(1, size + 1)
+                    if self.alive >> (seat + step) % size & 1
+                ),
+                (seat + 1) % size,
+            )
+            for seat in range(size)
+        ]
+
+    def copy(self):
+        """Make a copy of the seating that shares everything but who is still
+        alive. The players keep their place in this seating, not the copy."""
+
+        seating = object.__new__(type(self))
+        seating.__dict__.update(self.__dict__)
+        seating.following = list(self.following)
+
+        return seating
+
+    def group(self, mask):
+        """Get the players whose seats are picked out by `mask`, in seating
+        order."""
+
+        players = self._groups.get(mask)
+        if players is None:
+            players = tuple(
+                player for player in self.players if mask & self.bits[player]
+            )
+            self._groups[mask] = players
+
+        return players
+
+    def next_player(self, player):
+        """Get the next player clockwise from `player` who is still alive."""
+
+        return self.players[self.following[self.seats[player]]]
+
+    def is_denounced(self, player):
+        """Check whether a player has been taken out of the game."""
+
+        return not self.alive & self.bits[player]
+
+    def eligible(self, *excluded):
+        """Get the players who are still alive, less those in `excluded`. Any
+        of these may be `None`."""
+
+        mask = self.alive
+        for player in excluded:
+            mask &= ~self.bits[player]
+
+        return self.group(mask)
+
+    def denounce(self, player):
+        """Take a player out of the game, and have any seat that pointed at
+        them point past them instead."""
+
+        seat = self.seats[player]
+        if self.alive >> seat & 1:
+            self.alive &= ~self.bits[player]
+            skip = self.following[seat]
+            for other, following in enumerate(self.following):
+                if following == seat:
+                    self.following[other] = skip
+
+    def reinstate(self, player):
+        """Bring a denounced player back into the game."""
+
+        self.alive |= self.bits[player]
+        self.link()
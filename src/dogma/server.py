@@ -0,0 +1,449 @@
+"""A server that hosts many games at once for players connecting over a local
+socket.
+
+Messages are JSON objects, one to a line, over TCP or a Unix socket. A client
+sends ``{"type": "join", "name": ..., "players": 5}`` to wait in the lobby
+for a table of that size, five or six, and is seated as soon as the table
+is full. A client may only wait or play at one table at a time. Each
+game runs on the server's event loop, as in `dogma.aio`, and its players are
+sent these messages:
+
+    ======== ============================================================
+    Type     Contents
+    ======== ============================================================
+    seated   the table, the player's seat and the names around the table
+    role     the player's role, and the seat of their partner if they have
+             one (only the mavericks learn who each other are)
+    decide   an `id`, the `decision` to make, what it is to be made from,
+             and the player's `view` of the game
+    end      the winner and message of the game
+    ======== ============================================================
+
+A client answers a decision with ``{"type": "answer", "id": ..., "answer":
+...}``. Nominations and denouncements are answered with a seat from
+`options`, votes with "yes" or "no", cards with ``{"reject": card,
+"overrule": bool}`` and overrules with a bool. An answer that is not legal,
+or that does not come within the server's time limit, is replaced by the
+default in `dogma.latency.DEFAULTS`. Once a game is over, its players may
+join again. Sending ``{"type": "stats"}`` gets the number of games played
+and the time taken over each kind of decision, from asking to answer."""
+
+import argparse
+import asyncio
+import itertools
+import json
+import time
+from collections import Counter
+
+from . import aio
+from .game import DogmaGame
+from .latency import DECISIONS, DEFAULTS
+from .player import Player
+from .profiling import Histogram
+
+SIZES = (5, 6)
+
+
+def view(game, player):
+    """Get everything a player can see of a game."""
+
+    seat_of = game.seat_of
+    seating = game.seating
+
+    return {
+        "seat": seat_of(player),
+        "role": player.role,
+        "partner": seat_of(player.partner),
+        "seen": player.seen,
+        "turn": game.turns,
+        "dean": seat_of(game.dean),
+        "editor": seat_of(game.editor),
+        "ex_dean": seat_of(game.ex_dean),
+        "ex_editor": seat_of(game.ex_editor),
+        "publications": dict(game.publications),
+        "pressure_to_print": game.pressure_to_print,
+        "overrule_available": game.overrule_available,
+        "deck": len(game.deck),
+        "discards": len(game.deck.discards),
+        "denounced": [
+            seat
+            for seat, other in enumerate(seating.players)
+            if seating.is_denounced(other)
+        ],
+    }
+
+
+class Connection:
+    """A client's connection to the server. Requests are matched to their
+    answers by `id`, and `table` is the table the client is seated at, if
+    any."""
+
+    def __init__(self, reader, writer):
+
+        self.reader = reader
+        self.writer = writer
+        self.ids = itertools.count()
+        self.pending = {}
+        self.lock = asyncio.Lock()
+        self.closed = False
+        self.table = None
+
+    async def send(self, message):
+        """Send a message to the client."""
+
+        if self.closed:
+            return
+
+        self.writer.write(json.dumps(message).encode() + b"\n")
+        async with self.lock:
+            await self.writer.drain()
+
+    async def request(self, message):
+        """Send a request to the client and wait for their answer."""
+
+        number = next(self.ids)
+        future = asyncio.get_running_loop().create_future()
+        self.pending[number] = future
+        try:
+            await self.send(dict(message, id=number))
+            return await future
+        finally:
+            self.pending.pop(number, None)
+
+    def answer(self, message):
+        """Pass an answer on to the request waiting for it, if there is one."""
+
+        future = self.pending.get(message.get("id"))
+        if future is not None and not future.done():
+            future.set_result(message.get("answer"))
+
+    def close(self):
+        """Give up on every request still waiting for an answer."""
+
+        self.closed = True
+        for future in self.pending.values():
+            if not future.done():
+                future.set_result(None)
+
+
+class RemotePlayer(Player):
+    """A player who makes their decisions over a connection. Any answer that
+    is not legal is replaced by the default."""
+
+    def __init__(self, name, connection, server):
+
+        super().__init__(name)
+        self.connection = connection
+        self.server = server
+
+    async def ask(self, decision, **details):
+        """Ask the client for a decision, timing how long they take."""
+
+        if self.connection.closed:
+            return None
+
+        server = self.server
+        message = dict(
+            details,
+            type="decide",
+            decision=decision,
+            view=view(self.game, self),
+        )
+        start = time.perf_counter_ns()
+        try:
+            answer = await asyncio.wait_for(
+                self.connection.request(message), server.time_limit
+            )
+        except asyncio.TimeoutError:
+            server.timeouts[decision] += 1
+            answer = None
+        server.histograms[decision].add(time.perf_counter_ns() - start)
+
+        return answer
+
+    async def choose_player(self, decision, players):
+        """Choose one of the players on offer by their seat."""
+
+        seats = [self.game.seat_of(player) for player in players]
+        seat = await self.ask(decision, options=seats)
+        if seat not in seats:
+            return DEFAULTS[decision](players)
+
+        return self.game.player_at(seat)
+
+    async def nominate(self, players):
+        """Ask the client to nominate an editor."""
+
+        return await self.choose_player("nominate", players)
+
+    async def vote(self, nominee):
+        """Ask the client for their vote."""
+
+        answer = await self.ask("vote", nominee=self.game.seat_of(nominee))
+        if answer not in ("yes", "no"):
+            return DEFAULTS["vote"](nominee)
+
+        return answer
+
+    async def choose_cards_to_submit(self, choices, overrule_available=False):
+        """Ask the client which card to reject, and whether to suggest an
+        overrule."""
+
+        answer = await self.ask(
+            "choose_cards_to_submit",
+            cards=choices,
+            overrule_available=overrule_available,
+        )
+        if not isinstance(answer, dict) or answer.get("reject") not in choices:
+            return DEFAULTS["choose_cards_to_submit"](
+                choices, overrule_available
+            )
+
+        reject = answer["reject"]
+        choices.remove(reject)
+        overrule = overrule_available and bool(answer.get("overrule"))
+
+        return choices, reject, overrule
+
+    async def agree_to_overrule(self):
+        """Ask the client whether they agree to the overrule."""
+
+        answer = await self.ask("agree_to_overrule")
+        if not isinstance(answer, bool):
+            return DEFAULTS["agree_to_overrule"]()
+
+        return answer
+
+    async def denounce(self, players):
+        """Ask the client who to denounce."""
+
+        return await self.choose_player("denounce", players)
+
+
+class Table:
+    """A table of players waiting for, or playing, a game."""
+
+    def __init__(self, number, size, seed):
+
+        self.number = number
+        self.size = size
+        self.seed = seed
+        self.players = []
+        self.game = None
+
+    def is_full(self):
+        """Check whether everyone the table needs is seated."""
+
+        return len(self.players) == self.size
+
+    async def play(self, max_turns=None):
+        """Seat the players, tell them their roles and play the game. A game
+        that runs out of journal cards is abandoned."""
+
+        game = self.game = DogmaGame(self.players, self.seed)
+        game.assign_roles()
+        game.inform_mavericks()
+
+        names = [player.name for player in self.players]
+        for seat, player in enumerate(self.players):
+            await player.connection.send(
+                {
+                    "type": "seated",
+                    "table": self.number,
+                    "seat": seat,
+                    "players": names,
+                }
+            )
+            await player.connection.send(
+                {
+                    "type": "role",
+                    "role": player.role,
+                    "partner": game.seat_of(player.partner),
+                }
+            )
+
+        await aio.play_turns(game, max_turns)
+
+        for player in self.players:
+            player.connection.table = None
+            await player.connection.send(
+                {"type": "end", "winner": game.winner, "message": game.message}
+            )
+
+        return game.winner, game.message
+
+
+class Server:
+    """A server that seats players from its lobby at tables of the size they
+    ask for and plays their games. Tables are numbered in the order they
+    fill, and the game at each is seeded from `seed` and its number."""
+
+    def __init__(self, max_turns=1000, time_limit=None, seed=0):
+
+        self.max_turns = max_turns
+        self.time_limit = time_limit
+        self.seed = seed
+        self.numbers = itertools.count()
+        self.lobby = {}
+        self.playing = set()
+        self.results = Counter()
+        self.histograms = {decision: Histogram() for decision in DECISIONS}
+        self.timeouts = Counter()
+        self.server = None
+
+    async def start(self, host="127.0.0.1", port=0, path=None):
+        """Start listening on a TCP port, or on a Unix socket if a `path` is
+        given."""
+
+        if path is None:
+            self.server = await asyncio.start_server(self.handle, host, port)
+        else:
+            self.server = await asyncio.start_unix_server(self.handle, path)
+
+        return self
+
+    @property
+    def address(self):
+        """The address the server is listening on: a host and port, or the
+        path of a Unix socket."""
+
+        address = self.server.sockets[0].getsockname()
+        if isinstance(address, str):
+            return address
+
+        return address[:2]
+
+    async def close(self):
+        """Stop listening, and wait for the games being played to finish."""
+
+        self.server.close()
+        await self.server.wait_closed()
+        await asyncio.gather(*self.playing)
+
+    async def handle(self, reader, writer):
+        """Deal with the messages from one client until they leave."""
+
+        connection = Connection(reader, writer)
+        try:
+            async for line in reader:
+                await self.receive(connection, line)
+        finally:
+            connection.close()
+            writer.close()
+            self.leave(connection)
+
+    async def receive(self, connection, line):
+        """Deal with one message from a client."""
+
+        try:
+            message = json.loads(line)
+            kind = message["type"]
+        except (ValueError, TypeError, KeyError):
+            await connection.send({"type": "error", "message": "bad message"})
+            return
+
+        if kind == "answer":
+            connection.answer(message)
+        elif kind == "join":
+            size = message.get("players")
+            if connection.table is not None:
+                await connection.send(
+                    {"type": "error", "message": "already seated"}
+                )
+                return
+            if not isinstance(size, int) or size not in SIZES:
+                await connection.send(
+                    {"type": "error", "message": "tables seat five or six"}
+                )
+                return
+            self.join(connection, str(message.get("name", "")), size)
+        elif kind == "stats":
+            await connection.send(dict(self.stats(), type="stats"))
+        else:
+            await connection.send({"type": "error", "message": "unknown type"})
+
+    def join(self, connection, name, size):
+        """Seat a player at the open table of their chosen size, and start the
+        game there once it is full. The size must be one of `SIZES`, and the
+        connection must not be seated already."""
+
+        table = self.lobby.get(size)
+        if table is None:
+            number = next(self.numbers)
+            table = self.lobby[size] = Table(number, size, self.seed + number)
+
+        table.players.append(RemotePlayer(name, connection, self))
+        connection.table = table
+        if table.is_full():
+            del self.lobby[size]
+            task = asyncio.ensure_future(self.play(table))
+            self.playing.add(task)
+            task.add_done_callback(self.playing.discard)
+
+    def leave(self, connection):
+        """Take a client who has gone away out of the lobby."""
+
+        for table in self.lobby.values():
+            table.players = [
+                player
+                for player in table.players
+                if player.connection is not connection
+            ]
+
+    async def play(self, table):
+        """Play the game at a full table and count its result."""
+
+        self.results[await table.play(self.max_turns)] += 1
+
+    def stats(self):
+        """Get the number of games played, and how long each kind of decision
+        has taken, as plain values."""
+
+        return {
+            "games": sum(self.results.values()),
+            "waiting": sum(len(table.players) for table in self.lobby.values()),
+            "playing": len(self.playing),
+            "decisions": {
+                decision: histogram.as_dict()
+                for decision, histogram in self.histograms.items()
+            },
+            "timeouts": dict(self.timeouts),
+        }
+
+
+async def serve(host="127.0.0.1", port=8765, path=None, **options):
+    """Run a server until it is cancelled."""
+
+    server = await Server(**options).start(host, port, path)
+    try:
+        await server.server.serve_forever()
+    finally:
+        await server.close()
+
+
+def main(argv=None):
+    """Run a server from the command line."""
+
+    parser = argparse.ArgumentParser(description="Host games of Dogma.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", help="the path of a Unix socket to use")
+    parser.add_argument("--max-turns", type=int, default=1000)
+    parser.add_argument("--time-limit", type=float)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    asyncio.run(
+        serve(
+            args.host,
+            args.port,
+            args.unix,
+            max_turns=args.max_turns,
+            time_limit=args.time_limit,
+            seed=args.seed,
+        )
+    )
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -0,0 +1,373 @@
+"""An exact solver for the outcome probabilities of a table of `Random` players.
+
+Random players ignore everything they know, so the course of a game depends
+only on an abstract state: the numbers of each card in the deck and the
+discard pile, the publications so far, the pressure to print, whether the
+overrule is available, and who is sitting where. The `Solver` works through
+every state reachable from the start of the game, and combines the
+probabilities of their outcomes by dynamic programming, caching each state as
+it goes.
+
+All of the players behave the same, so the table can be rotated until Galileo
+sits in seat zero. The only way for a game to return to a state it has already
+been in is for the vote to fail while the pressure to print is stuck past the
+point of an emergency publication; those states form a ring of deans that is
+solved directly as a geometric series. Any pressure at or past that point is
+stored as the pressure of an emergency publication in the rules.
+"""
+
+import math
+from fractions import Fraction
+
+from .game import (
+    ALTERED,
+    EXHAUSTED,
+    OUSTED,
+    OUTCOMES,
+    QUELLED,
+    RHETORIC,
+    STANDARD,
+)
+
+GALILEO = 0
+CODES = (RHETORIC, ALTERED, QUELLED, OUSTED, EXHAUSTED)
+
+
+class Solver:
+    """Compute the probability of each outcome of a game between `Random`
+    players. Probabilities are floats by default, or exact fractions if
+    `exact` is set, at some cost in speed. The game is played by the standard
+    rules unless others are given as `rules`.
+
+    A state is the position at the start of a turn, once the dean for that
+    turn has been seated. It is a flat tuple of::
+
+        (deck_h, deck_g, discard_h, discard_g, publications_h, publications_g,
+         pressure_to_print, overrule_available, alive, dean, ex_dean,
+         ex_editor)
+
+    where `alive` is a bitmask of the seats of those players who have not been
+    denounced, and a missing ex-dean or ex-editor is -1. The ex-dean plays no
+    part in a game of five, so it is always -1 there. The outcome
+    probabilities of each state are cached as a tuple in the order of
+    `CODES`."""
+
+    def __init__(self, number_of_players, exact=False, rules=STANDARD):
+
+        self.number_of_players = number_of_players
+        self.rules = rules
+        self.stuck = rules.pressure
+        self.one = Fraction(1) if exact else 1.0
+        self.zero = (self.one * 0,) * len(CODES)
+        self.cache = {}
+        self._draws = {}
+
+        self.success = []
+        for voters in range(number_of_players + 1):
+            ayes = range(voters // 2 + 1, voters + 1)
+            ways = sum(binomial(voters, aye) for aye in ayes)
+            self.success.append(self.one * ways / 2**voters)
+
+        seats = range(number_of_players)
+        self.seats = [
+            [seat for seat in seats if alive >> seat & 1]
+            for alive in range(2**number_of_players)
+        ]
+        self.following = [
+            [
+                (
+                    next(
+                        (seat + step) % number_of_players
+                        for step in range(1, number_of_players + 1)
+                        if alive >> (seat + step) % number_of_players & 1
+                    )
+                    if alive
+                    else seat
+                )
+                for seat in seats
+            ]
+            for alive in range(2**number_of_players)
+        ]
+
+    def outcome(self, code):
+        """Get the outcome probabilities of a game that has just ended."""
+
+        vector = list(self.zero)
+        vector[CODES.index(code)] = self.one
+
+        return tuple(vector)
+
+    def draws(self, h, g, num):
+        """Get every sequence of `num` cards that could be drawn from the top
+        of a deck, along with its probability and the deck left behind."""
+
+        key = h, g, num
+        if key not in self._draws:
+            sequences = [((), self.one, h, g)]
+            for _ in range(num):
+                extended = []
+                for cards, probability, h_, g_ in sequences:
+                    total = h_ + g_
+                    if h_:
+                        p = probability * h_ / total
+                        extended.append((cards + (True,), p, h_ - 1, g_))
+                    if g_:
+                        p = probability * g_ / total
+                        extended.append((cards + (False,), p, h_, g_ - 1))
+                sequences = extended
+            self._draws[key] = sequences
+
+        return self._draws[key]
+
+    def solve(self):
+        """Get the probability of each `(winner, message)` outcome of a game,
+        from the moment the first dean is elected."""
+
+        alive = 2**self.number_of_players - 1
+        total = list(self.zero)
+        for dean in range(self.number_of_players):
+            state = (
+                self.rules.journals_h,
+                self.rules.journals_g,
+                0,
+                0,
+                0,
+                0,
+                0,
+                False,
+                alive,
+                dean,
+                -1,
+                -1,
+            )
+            add(total, self.value(state), self.one / self.number_of_players)
+
+        return {
+            OUTCOMES[code]: probability
+            for code, probability in zip(CODES, total)
+            if probability
+        }
+
+    def value(self, state):
+        """Get the outcome probabilities from a state, solving it if it has not
+        been seen before."""
+
+        vector = self.cache.get(state)
+        if vector is None:
+            if state[6] == self.stuck:
+                self.solve_ring(state)
+            else:
+                failure, rest = self.turn(state)
+                self.cache[state] = tuple(add(rest, failure, 1))
+            vector = self.cache[state]
+
+        return vector
+
+    def solve_ring(self, state):
+        """Solve the states in which the pressure to print is stuck, and which
+        differ only in their dean. When the vote fails, the next state in the
+        ring follows, so each is the sum of a geometric series."""
+
+        deans = self.seats[state[8]]
+        start = deans.index(state[9])
+        deans = deans[start:] + deans[:start]
+        ring = [state[:9] + (dean,) + state[10:] for dean in deans]
+        rests = [self.turn(member, cycle=True)[1] for member in ring]
+
+        fail = 1 - self.success[len(deans)]
+        scale = 1 / (1 - fail ** len(deans))
+        for i, member in enumerate(ring):
+            vector = list(self.zero)
+            for j in range(len(ring)):
+                add(vector, rests[(i + j) % len(ring)], fail**j)
+            self.cache[member] = tuple(p * scale for p in vector)
+
+    def turn(self, state, cycle=False):
+        """Play out a single turn from a state. Returns the outcome
+        probabilities for a failed vote and for everything else separately,
+        leaving out the failed vote altogether in a ring of stuck states."""
+
+        alive, dean, ex_dean, ex_editor = state[8:]
+        success = self.success[len(self.seats[alive])]
+
+        failure = list(self.zero)
+        if not cycle:
+            add(failure, self.fail(state), 1 - success)
+
+        excluded = (dean, ex_editor, ex_dean)
+        nominees = [s for s in self.seats[alive] if s not in excluded]
+        rest = list(self.zero)
+        for editor in nominees:
+            add(rest, self.succeed(state, editor), success / len(nominees))
+
+        return failure, rest
+
+    def proceed(self, state):
+        """Move on to the next turn, with the next dean."""
+
+        dean = self.following[state[8]][state[9]]
+
+        return self.value(state[:9] + (dean,) + state[10:])
+
+    def fail(self, state):
+        """Get the outcome probabilities after a failed vote."""
+
+        pressure = state[6]
+        if pressure + 1 != self.rules.pressure:
+            pressure = min(pressure + 1, self.stuck)
+            return self.proceed(state[:6] + (pressure,) + state[7:])
+
+        return self.emergency_publication(state)
+
+    def emergency_publication(self, state):
+        """Publish the top card of the deck, reshuffling the discard pile
+        into an empty deck first."""
+
+        deck_h, deck_g, discard_h, discard_g, pub_h, pub_g = state[:6]
+        if deck_h + deck_g < 1:
+            deck_h, deck_g = deck_h + discard_h, deck_g + discard_g
+            discard_h, discard_g = 0, 0
+            if deck_h + deck_g < 1:
+                return self.outcome(EXHAUSTED)
+
+        vector = list(self.zero)
+        for cards, probability, h, g in self.draws(deck_h, deck_g, 1):
+            heliocentric = cards[0]
+            after = (
+                h,
+                g,
+                discard_h,
+                discard_g,
+                pub_h + heliocentric,
+                pub_g + (not heliocentric),
+                0,
+            ) + state[7:]
+            add(vector, self.check_journal_count(after), probability)
+
+        return vector
+
+    def check_journal_count(self, state, heliocentric=False):
+        """Check whether either team has filled its journal slots, and move on
+        to any emergency actions if not."""
+
+        if state[4] >= self.rules.win_h:
+            return self.outcome(ALTERED)
+        if state[5] >= self.rules.win_g:
+            return self.outcome(QUELLED)
+        if heliocentric:
+            return self.perform_emergency_actions(state)
+
+        return self.proceed(state)
+
+    def succeed(self, state, editor):
+        """Get the outcome probabilities after a successful vote for an
+        editor. Each player rejects a card at random, so the card published,
+        the editor's rejection and the dean's rejection are simply the three
+        cards drawn, in that order."""
+
+        deck_h, deck_g, discard_h, discard_g, pub_h, pub_g = state[:6]
+        pressure, overrule_available, alive, dean = state[6:10]
+        if editor == GALILEO and pub_h >= self.rules.rhetoric:
+            return self.outcome(RHETORIC)
+
+        if deck_h + deck_g < 3:
+            deck_h, deck_g = deck_h + discard_h, deck_g + discard_g
+            discard_h, discard_g = 0, 0
+            if deck_h + deck_g < 3:
+                return self.outcome(EXHAUSTED)
+
+        overrule = self.one / 4 if overrule_available else 0
+        ex_dean = dean if self.number_of_players != 5 else -1
+        vector = list(self.zero)
+        for cards, probability, h, g in self.draws(deck_h, deck_g, 3):
+            kept, rejected, dean_rejected = cards
+            if overrule:
+                after = (
+                    h,
+                    g,
+                    discard_h + dean_rejected,
+                    discard_g + (not dean_rejected),
+                    pub_h,
+                    pub_g,
+                    min(pressure + 2, self.stuck),
+                ) + state[7:]
+                add(vector, self.proceed(after), probability * overrule)
+
+            rejected_h = rejected + dean_rejected
+            after = (
+                h,
+                g,
+                discard_h + rejected_h,
+                discard_g + 2 - rejected_h,
+                pub_h + kept,
+                pub_g + (not kept),
+                0,
+                overrule_available,
+                alive,
+                dean,
+                ex_dean,
+                editor,
+            )
+            add(
+                vector,
+                self.check_journal_count(after, kept),
+                probability * (1 - overrule),
+            )
+
+        return vector
+
+    def perform_emergency_actions(self, state):
+        """Get the outcome probabilities after the emergency actions that
+        follow a heliocentric publication."""
+
+        rules = self.rules
+        deck_h, deck_g, discard_h, discard_g, pub_h = state[:5]
+        if pub_h in rules.peek and deck_h + deck_g < 3:
+            deck_h, deck_g = deck_h + discard_h, deck_g + discard_g
+            if deck_h + deck_g < 3:
+                return self.outcome(EXHAUSTED)
+            state = (deck_h, deck_g, 0, 0) + state[4:]
+
+        overrule_available = state[7] or pub_h in rules.overrule
+        if pub_h not in rules.denounce:
+            return self.proceed(state[:7] + (overrule_available,) + state[8:])
+
+        alive, dean = state[8:10]
+        candidates = [seat for seat in self.seats[alive] if seat != dean]
+        weight = self.one / len(candidates)
+
+        vector = list(self.zero)
+        for seat in candidates:
+            if seat == GALILEO:
+                add(vector, self.outcome(OUSTED), weight)
+            else:
+                after = (
+                    state[:7]
+                    + (overrule_available, alive & ~(1 << seat))
+                    + state[9:]
+                )
+                add(vector, self.proceed(after), weight)
+
+        return vector
+
+
+def binomial(n, k):
+    """Get the number of ways of choosing `k` things from `n`."""
+
+    return math.factorial(n) // (math.factorial(k) * math.factorial(n - k))
+
+
+def add(vector, other, weight):
+    """Add a weighted vector of outcome probabilities to another, in place."""
+
+    for i, probability in enumerate(other):
+        vector[i] += weight * probability
+
+    return vector
+
+
+def solve(number_of_players, exact=False, rules=STANDARD):
+    """Get the probability of each `(winner, message)` outcome of a game
+    between `Random` players at a table of a given size, by `rules`."""
+
+    return Solver(number_of_players, exact, rules).solve()
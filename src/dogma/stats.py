@@ -0,0 +1,277 @@
+"""Streaming summaries of the results of many games.
+
+A `Summary` is fed the record of one game at a time, as made by
+`dogma.results.record_game`, and keeps only counts, running moments and a
+fixed-size sample, so it takes the same memory for a million games as for
+ten. Summaries made in separate processes are merged into one, and merging
+is associative, so the games can be split between workers in any way::
+
+    summary = summarise(player_counts=(5, 6), seeds=range(10 ** 6))
+    summary.win_rates("strategies"), summary.turns.mean
+
+Counts and moments come out the same however the games are split, up to
+rounding. A merged sample is a fair sample of all the games, though not
+the same one that a single pass would have drawn."""
+
+import functools
+import math
+import multiprocessing
+import random
+from collections import Counter, defaultdict
+
+from .game import TEAMS
+from .results import record_game
+from .strategies import all_strategies
+
+
+class Moments:
+    """The count, mean and variance of a stream of numbers, updated one at a
+    time by Welford's method, along with the least and greatest."""
+
+    def __init__(self):
+
+        self.count = 0
+        self.mean = 0.0
+        self.squares = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+
+    def add(self, value):
+        """Take in a number."""
+
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.squares += delta * (value - self.mean)
+        self.minimum = min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+
+    def merge(self, other):
+        """Take in every number another stream has, by the pairwise update
+        of Chan, Golub and LeVeque. Returns this stream."""
+
+        count = self.count + other.count
+        if not other.count:
+            return self
+
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.squares += (
+            other.squares + delta * delta * self.count * other.count / count
+        )
+        self.count = count
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+
+        return self
+
+    @property
+    def variance(self):
+        """The sample variance, which is not a number for fewer than two
+        values."""
+
+        if self.count < 2:
+            return math.nan
+
+        return self.squares / (self.count - 1)
+
+    @property
+    def std(self):
+        """The sample standard deviation."""
+
+        return math.sqrt(self.variance)
+
+
+class Reservoir:
+    """A sample of up to `size` items taken uniformly from a stream, by
+    Vitter's algorithm R, with its own random state seeded by `seed`."""
+
+    def __init__(self, size=100, seed=None):
+
+        self.size = size
+        self.seen = 0
+        self.items = []
+        self.random = random.Random(seed)
+
+    def add(self, item):
+        """Offer an item to the sample."""
+
+        self.seen += 1
+        if len(self.items) < self.size:
+            self.items.append(item)
+            return
+
+        position = self.random.randrange(self.seen)
+        if position < self.size:
+            self.items[position] = item
+
+    def merge(self, other):
+        """Take a sample of the items of both streams, as if from one
+        stream of them all, no bigger than either sample could be. Each
+        place is filled from one side with the chance that an item not yet
+        taken from the whole stream is from that side, and then with an
+        item picked at random from that side's sample. Returns this
+        sample."""
+
+        size = min(self.size, other.size)
+        pools = [self.items[:], other.items[:]]
+        left = [self.seen, other.seen]
+        items = []
+        while len(items) < size and sum(left):
+            side = int(self.random.randrange(sum(left)) >= left[0])
+            pool = pools[side]
+            items.append(pool.pop(self.random.randrange(len(pool))))
+            left[side] -= 1
+
+        self.size, self.items = size, items
+        self.seen += other.seen
+
+        return self
+
+
+def result(role, winner):
+    """Get whether a player with a role won, lost or drew a game."""
+
+    if winner is None:
+        return "draw"
+
+    return "win" if TEAMS[role] == winner else "loss"
+
+
+class Summary:
+    """A summary of the records of many games:
+
+    - `teams`, `messages` and `outcomes`: the number of games won by
+      each team, and ended by each message and `(winner, message)`
+      pair.
+    - `players`, `seats` and `strategies`: the number of wins, losses
+      and draws, as `(group, result)` pairs, for each player count,
+      seat and strategy. Each seat counts once per game, so a strategy
+      that sits twice at a table counts twice.
+    - `turns`: the `Moments` of the length of the games, and
+      `turns_by_players` those for each player count.
+    - `sample`: a `Reservoir` of up to `sample_size` records.
+    """
+
+    def __init__(self, sample_size=100, seed=None):
+
+        self.games = 0
+        self.teams = Counter()
+        self.messages = Counter()
+        self.outcomes = Counter()
+        self.players = Counter()
+        self.seats = Counter()
+        self.strategies = Counter()
+        self.turns = Moments()
+        self.turns_by_players = defaultdict(Moments)
+        self.sample = Reservoir(sample_size, seed)
+
+    def add(self, record):
+        """Take in the record of a game."""
+
+        winner, players = record["winner"], record["players"]
+        self.games += 1
+        self.teams[winner] += 1
+        self.messages[record["message"]] += 1
+        self.outcomes[winner, record["message"]] += 1
+
+        results = [result(role, winner) for role in record["roles"]]
+        self.players[players, "draw" if winner is None else winner] += 1
+        strategies = record["strategies"].split(",")
+        for seat, (strategy, outcome) in enumerate(zip(strategies, results)):
+            self.seats[seat, outcome] += 1
+            self.strategies[strategy, outcome] += 1
+
+        self.turns.add(record["turns"])
+        self.turns_by_players[players].add(record["turns"])
+        self.sample.add(record)
+
+    def merge(self, other):
+        """Take in every game in another summary. Returns this summary."""
+
+        self.games += other.games
+        for name in (
+            "teams",
+            "messages",
+            "outcomes",
+            "players",
+            "seats",
+            "strategies",
+        ):
+            getattr(self, name).update(getattr(other, name))
+
+        self.turns.merge(other.turns)
+        for players, moments in other.turns_by_players.items():
+            self.turns_by_players[players].merge(moments)
+        self.sample.merge(other.sample)
+
+        return self
+
+    def win_rates(self, table):
+        """Get the share of decided games won by each group in the `seats`
+        or `strategies` table, or by the conformists for each player count
+        in the `players` table."""
+
+        counts = getattr(self, table)
+        wins, decided = Counter(), Counter()
+        for (group, outcome), count in counts.items():
+            if outcome in ("win", "C"):
+                wins[group] += count
+            if outcome != "draw":
+                decided[group] += count
+
+        return {group: wins[group] / decided[group] for group in decided}
+
+
+def summarise_chunk(job):
+    """Summarise the games of a chunk of seeds. The job is a tuple of
+    `(strategies, number_of_players, seeds, max_turns, sample_size)`, and
+    the sample is seeded by the player count and the first seed."""
+
+    strategies, number_of_players, seeds, max_turns, sample_size = job
+    summary = Summary(sample_size, f"summary-{number_of_players}-{seeds[0]}")
+    for seed in seeds:
+        summary.add(record_game(strategies, number_of_players, seed, max_turns))
+
+    return summary
+
+
+def make_jobs(
+    strategies, player_counts, seeds, max_turns, chunksize, sample_size
+):
+    """Split the games to be summarised into chunks of consecutive seeds."""
+
+    for number_of_players in player_counts:
+        for start in range(0, len(seeds), chunksize):
+            stop = start + chunksize
+            chunk = seeds[start:stop]
+            yield strategies, number_of_players, chunk, max_turns, sample_size
+
+
+def summarise(
+    strategies=None,
+    player_counts=(5, 6),
+    seeds=range(1000),
+    max_turns=1000,
+    processes=1,
+    chunksize=1000,
+    sample_size=100,
+):
+    """Play a game for every combination of player count and seed, and
+    summarise them without keeping any record beyond the sample. Each
+    worker summarises a chunk of seeds at a time, and the summaries of the
+    chunks are merged in order."""
+
+    strategies = strategies or all_strategies
+    jobs = make_jobs(
+        strategies, player_counts, seeds, max_turns, chunksize, sample_size
+    )
+    summary = Summary(sample_size, "summary")
+
+    if processes == 1:
+        chunks = map(summarise_chunk, jobs)
+        return functools.reduce(Summary.merge, chunks, summary)
+
+    with multiprocessing.Pool(processes) as pool:
+        chunks = pool.imap(summarise_chunk, jobs)
+        return functools.reduce(Summary.merge, chunks, summary)
@@ -1,5 +1,8 @@
 """ Imports for the strategies subpackage. """
 
+from .ismcts import ISMCTS
 from .rand import Random
 
 all_strategies = [Random]
+
+__all__ = ["ISMCTS", "Random", "all_strategies"]
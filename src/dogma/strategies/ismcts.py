@@ -0,0 +1,537 @@
+"""A class for playing by information-set Monte Carlo tree search."""
+
+import copy
+import math
+import time
+from multiprocessing import Pool, current_process
+
+from dogma import DogmaGame
+from dogma.game import STANDARD, TEAMS, spawn
+from dogma.worlds import WorldSampler
+
+from .rand import Random
+
+
+class Node:
+    """The statistics of each action available from an information set."""
+
+    def __init__(self, actions):
+
+        self.visits = 0
+        self.stats = {action: [0, 0.0] for action in actions}
+
+    def select(self, state, exploration):
+        """Pick an action by UCB1, trying every action once first."""
+
+        untried = [action for action, (n, _) in self.stats.items() if not n]
+        if untried:
+            return state.choice(untried)
+
+        log = math.log(self.visits)
+
+        def bound(action):
+            n, total = self.stats[action]
+            return total / n + exploration * math.sqrt(log / n)
+
+        return max(self.stats, key=bound)
+
+    def update(self, action, reward):
+        """Count a playout through `action` that earned `reward`."""
+
+        self.visits += 1
+        self.stats[action][0] += 1
+        self.stats[action][1] += reward
+
+    def merge(self, other):
+        """Add the statistics of another node for the same information set."""
+
+        self.visits += other.visits
+        for action, (n, total) in other.stats.items():
+            self.stats[action][0] += n
+            self.stats[action][1] += total
+
+    def best(self):
+        """Get the action that has been visited most."""
+
+        return max(self.stats, key=lambda action: self.stats[action][0])
+
+
+def information_set(game, kind, extra):
+    """Get everything the player deciding knows about a game, other than
+    their own role and partner, as a key for the search tree."""
+
+    return (
+        kind,
+        extra,
+        game.turns,
+        game.publications["H"],
+        game.publications["G"],
+        game.pressure_to_print,
+        game.overrule_available,
+        game.seating.alive,
+        game.seat_of(game.dean),
+        game.seat_of(game.editor),
+        game.seat_of(game.ex_dean),
+        game.seat_of(game.ex_editor),
+        len(game.deck),
+        len(game.deck.discards),
+    )
+
+
+def resume_nominate(game):
+    """Play out the rest of a turn from the dean's nomination."""
+
+    return game.hold_vote(game.form_print_team())
+
+
+def resume_vote(game, nominee):
+    """Play out the rest of a turn from the vote on a nominee."""
+
+    return game.hold_vote(game.player_at(nominee))
+
+
+def resume_dean(game, hand):
+    """Play out the rest of a turn from the dean's choice of cards. The hand
+    is on top of the deck, so forming the publication draws it again."""
+
+    return game.finish_turn(True, game.form_publication())
+
+
+def resume_editor(game, choices, overrule_available):
+    """Play out the rest of a turn from the editor's choice of cards."""
+
+    return game.finish_turn(
+        True, game.edit_publication(list(choices), overrule_available)
+    )
+
+
+def resume_overrule(game, passed):
+    """Play out the rest of a turn from the dean's answer to an overrule. The
+    dean does not know which of the cards they passed on the editor would
+    have rejected."""
+
+    kept = list(passed)
+    reject = kept.pop(game.random.randrange(len(kept)))
+
+    return game.finish_turn(True, game.settle_overrule(kept, reject))
+
+
+def resume_denounce(game):
+    """Play out the rest of a turn from the dean's denouncement."""
+
+    return game.perform_emergency_actions() or game.galileo_denounced_win()
+
+
+RESUME = {
+    "nominate": resume_nominate,
+    "vote": resume_vote,
+    "dean": resume_dean,
+    "editor": resume_editor,
+    "overrule": resume_overrule,
+    "denounce": resume_denounce,
+}
+
+
+class Simulant(Random):
+    """The searching player's stand-in for their own seat in a playout. Their
+    decisions are taken from the search tree until the playout leaves it, and
+    at random after that."""
+
+    def __init__(self, name, search):
+
+        super().__init__(name)
+        self.search = search
+
+    def nominate(self, players):
+
+        game = self.search.sim
+        seats = tuple(game.seat_of(player) for player in players)
+        seat = self.search.decide("nominate", (), seats)
+        if seat is None:
+            return super().nominate(players)
+
+        return game.player_at(seat)
+
+    def vote(self, nominee):
+
+        nominee = self.search.sim.seat_of(nominee)
+        choice = self.search.decide("vote", nominee, ("yes", "no"))
+
+        return choice or super().vote(nominee)
+
+    def choose_cards_to_submit(self, choices, overrule_available=False):
+
+        kind, extra, actions = card_actions(
+            self.search.sim, self, choices, overrule_available
+        )
+        action = self.search.decide(kind, extra, actions)
+        if action is None:
+            return super().choose_cards_to_submit(choices, overrule_available)
+
+        reject, overrule = action
+        choices.remove(reject)
+
+        return choices, reject, overrule
+
+    def agree_to_overrule(self):
+
+        choice = self.search.decide("overrule", (), (True, False))
+        if choice is None:
+            return super().agree_to_overrule()
+
+        return choice
+
+    def denounce(self, players):
+
+        game = self.search.sim
+        seats = tuple(game.seat_of(player) for player in players)
+        seat = self.search.decide("denounce", (), seats)
+        if seat is None:
+            return super().denounce(players)
+
+        return game.player_at(seat)
+
+
+def card_actions(game, player, choices, overrule_available):
+    """Get the kind of card decision a player faces, what they know about it,
+    and the actions open to them. Each action is a card to reject and whether
+    to suggest an overrule."""
+
+    cards = sorted(set(choices))
+    actions = [(card, False) for card in cards]
+    if player is game.dean:
+        return "dean", tuple(sorted(choices)), actions
+
+    if overrule_available:
+        actions.append((cards[0], True))
+
+    return "editor", (tuple(sorted(choices)), overrule_available), actions
+
+
+class Search:
+    """A search of the decisions open to one player from a snapshot of their
+    game, sharing a tree of information sets with their earlier searches.
+
+    Each iteration deals out roles and journal cards that fit what the player
+    knows, then plays the game out from their decision with `Random` players
+    in every other seat. The player's own decisions follow the tree until a
+    new information set is reached, which is added to the tree, and are made
+    at random from there on. Worlds are dealt and played out by `rules`."""
+
+    def __init__(
+        self,
+        snapshot,
+        seat,
+        role,
+        partner,
+        known,
+        top,
+        tree,
+        state,
+        exploration,
+        horizon,
+        rules=STANDARD,
+    ):
+
+        self.snapshot = snapshot
+        self.seat = seat
+        self.role = role
+        self.partner = partner
+        self.known = known
+        self.top = top
+        self.worlds = WorldSampler(
+            snapshot, seat, role, partner, known, top, rules=rules
+        )
+        self.rules = rules
+        self.tree = tree
+        self.random = state
+        self.exploration = exploration
+        self.horizon = horizon
+
+        self.sim = None
+        self.path = []
+        self.expanded = False
+
+    def determine(self, kind):
+        """Get a snapshot of one world that fits what the player knows."""
+
+        world = self.worlds.sample(self.random)
+        if kind == "dean":
+            world = world._replace(
+                journal_cards=self.known + world.journal_cards
+            )
+
+        return world
+
+    def decide(self, kind, extra, actions):
+        """Pick an action for the player's stand-in, or `None` if they are
+        playing out at random."""
+
+        if self.expanded:
+            return None
+
+        key = information_set(self.sim, kind, extra)
+        node = self.tree.get(key)
+        if node is None:
+            node = self.tree[key] = Node(actions)
+            self.expanded = True
+
+        action = node.select(self.random, self.exploration)
+        self.path.append((node, action))
+
+        return action
+
+    def reward(self):
+        """Score the end of a playout for the player: one for a win, nothing
+        for a loss, and a half if there was no winner."""
+
+        winner = self.sim.winner
+        if winner is None:
+            return 0.5
+
+        return float(winner == TEAMS[self.role])
+
+    def iterate(self, kind, args):
+        """Play out one world from the player's decision and update the
+        statistics of the information sets it passed through."""
+
+        sim = self.sim
+        sim.restore(self.determine(kind))
+        self.path, self.expanded = [], False
+
+        over = sim.play_out(RESUME[kind], sim, *args)
+        stop = sim.turns + self.horizon
+        while not over and sim.turns < stop:
+            over = sim.turn()
+        reward = self.reward()
+
+        for node, action in self.path:
+            node.update(action, reward)
+
+    def run(self, kind, args, iterations=None, time_limit=None):
+        """Search until either budget runs out, with at least one iteration.
+        Returns the tree."""
+
+        players = [
+            (
+                Simulant(str(seat), self)
+                if seat == self.seat
+                else Random(str(seat))
+            )
+            for seat in range(len(self.snapshot.roles))
+        ]
+        self.sim = DogmaGame(
+            players, self.random.getrandbits(64), rules=self.rules
+        )
+        for player in players:
+            player.random = spawn(self.random)
+
+        deadline = None
+        if time_limit is not None:
+            deadline = time.perf_counter() + time_limit
+
+        count = 0
+        while not count or (
+            (iterations is None or count < iterations)
+            and (deadline is None or time.perf_counter() < deadline)
+        ):
+            self.iterate(kind, args)
+            count += 1
+
+        self.sim = None
+
+        return self.tree
+
+
+def run_search(search, kind, args, iterations, time_limit):
+    """Run a search in a worker process and send back its tree."""
+
+    return search.run(kind, args, iterations, time_limit)
+
+
+class ISMCTS(Random):
+    """A player who looks ahead with information-set Monte Carlo tree search.
+
+    Each decision is searched for `iterations` playouts or `time_limit`
+    seconds, whichever runs out first; either may be `None`, but not both.
+    The tree is kept for the rest of the game, so later decisions start from
+    what earlier searches learnt. With `processes` above one, that many
+    searches run side by side in separate processes and their trees are
+    added together. The processes are started at the first search and kept
+    until `close` is called. Outside of a game, the player acts at
+    random."""
+
+    def __init__(
+        self,
+        name,
+        iterations=200,
+        time_limit=None,
+        exploration=0.7,
+        horizon=50,
+        processes=1,
+    ):
+
+        if iterations is None and time_limit is None:
+            raise ValueError("An iteration or time budget is needed.")
+
+        super().__init__(name)
+        self.iterations = iterations
+        self.time_limit = time_limit
+        self.exploration = exploration
+        self.horizon = horizon
+        self.processes = processes
+
+        self.tree = {}
+        self.tree_game = None
+        self.passed = None
+        self._seen = None
+        self._seen_at = None
+        self._pool = None
+
+    def pool(self):
+        """Get the pool of processes to search in, starting it if need be. A
+        worker of another pool cannot start processes of its own, so a
+        player searching in several processes cannot play in one."""
+
+        if self._pool is None:
+            if current_process().daemon:
+                raise ValueError(
+                    "A player cannot search in several processes from "
+                    "within a worker process. Set `processes` to one to "
+                    "play in a pool."
+                )
+            self._pool = Pool(self.processes)
+
+        return self._pool
+
+    def close(self):
+        """Shut down the pool of processes, if there is one."""
+
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+    def top_cards(self):
+        """Get the cards seen on top of the deck, if they are still there. The
+        deck is assumed untouched for as long as the number of cards in the
+        deck and the discard pile stay the same as when they were seen."""
+
+        deck = self.game.deck
+        if self.seen is not self._seen:
+            self._seen, self._seen_at = self.seen, (
+                len(deck),
+                len(deck.discards),
+            )
+
+        if self.seen and self._seen_at == (len(deck), len(deck.discards)):
+            return tuple(self.seen)
+
+        return ()
+
+    def search(self, kind, args, extra, actions, known=()):
+        """Search the actions open at a decision and pick the best."""
+
+        if len(actions) == 1:
+            return actions[0]
+
+        game = self.game
+        if game is not self.tree_game:
+            self.tree, self.tree_game = {}, game
+
+        search = Search(
+            game.snapshot(),
+            game.seat_of(self),
+            self.role,
+            game.seat_of(self.partner),
+            list(known),
+            self.top_cards(),
+            self.tree,
+            self.random,
+            self.exploration,
+            self.horizon,
+            game.rules,
+        )
+
+        if self.processes == 1:
+            search.run(kind, args, self.iterations, self.time_limit)
+        else:
+            iterations = self.iterations
+            if iterations is not None:
+                iterations = -(-iterations // self.processes)
+
+            jobs = []
+            for _ in range(self.processes):
+                worker = copy.copy(search)
+                worker.tree, worker.random = {}, spawn(self.random)
+                jobs.append((worker, kind, args, iterations, self.time_limit))
+
+            for tree in self.pool().starmap(run_search, jobs):
+                for key, node in tree.items():
+                    if key in self.tree:
+                        self.tree[key].merge(node)
+                    else:
+                        self.tree[key] = node
+
+        return self.tree[information_set(game, kind, extra)].best()
+
+    def nominate(self, players):
+        """Nominate the editor who fares best in the search."""
+
+        if self.game is None:
+            return super().nominate(players)
+
+        seats = tuple(self.game.seat_of(player) for player in players)
+
+        return self.game.player_at(self.search("nominate", (), (), seats))
+
+    def vote(self, nominee):
+        """Cast the vote that fares best in the search."""
+
+        if self.game is None:
+            return super().vote(nominee)
+
+        seat = self.game.seat_of(nominee)
+
+        return self.search("vote", (seat,), seat, ("yes", "no"))
+
+    def choose_cards_to_submit(self, choices, overrule_available=False):
+        """Reject the card, or suggest the overrule, that fares best in the
+        search."""
+
+        if self.game is None:
+            return super().choose_cards_to_submit(choices, overrule_available)
+
+        kind, extra, actions = card_actions(
+            self.game, self, choices, overrule_available
+        )
+        args = (list(choices),)
+        if kind == "editor":
+            args += (overrule_available,)
+
+        reject, overrule = self.search(kind, args, extra, actions, choices)
+        choices.remove(reject)
+        if kind == "dean":
+            self.passed = list(choices)
+
+        return choices, reject, overrule
+
+    def agree_to_overrule(self):
+        """Agree to the overrule if that fares best in the search."""
+
+        if self.game is None or self.passed is None:
+            return super().agree_to_overrule()
+
+        return self.search(
+            "overrule", (self.passed,), (), (True, False), self.passed
+        )
+
+    def denounce(self, players):
+        """Denounce the player whose removal fares best in the search."""
+
+        if self.game is None:
+            return super().denounce(players)
+
+        seats = tuple(self.game.seat_of(player) for player in players)
+
+        return self.game.player_at(self.search("denounce", (), (), seats))
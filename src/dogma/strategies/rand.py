@@ -1,7 +1,5 @@
 """ A class for playing randomly. """
 
-import random
-
 from dogma import Player
 
 
@@ -11,12 +9,12 @@ class Random(Player):
     def nominate(self, players):
         """Nominate an editor at random from the given players."""
 
-        return random.choice(players)
+        return self.random.choice(players)
 
     def vote(self, nominee):
         """Cast a vote at random."""
 
-        return random.choice(("yes", "no"))
+        return self.random.choice(("yes", "no"))
 
     def choose_cards_to_submit(self, choices, overrule_available=False):
         """Choose a card to reject at random."""
@@ -25,7 +23,7 @@ class Random(Player):
         if overrule_available:
             overrule = self.agree_to_overrule()
 
-        reject = random.choice(choices)
+        reject = self.random.choice(choices)
         choices.remove(reject)
 
         return choices, reject, overrule
@@ -33,10 +31,10 @@ class Random(Player):
     def agree_to_overrule(self):
         """Choose whether to agree to overrule at random."""
 
-        return random.choice((True, False))
+        return self.random.choice((True, False))
 
     def denounce(self, players):
         """Choose a random player to remove from the game from those
         presented."""
 
-        return random.choice(players)
+        return self.random.choice(players)
@@ -0,0 +1,181 @@
+"""A sweep of games over a grid of rules, for balance studies.
+
+Each cell of the grid is a set of `Rules` and a number of players, and the
+same seeds are played in every cell so that the cells differ only by their
+rules. Cells are handed out whole to a pool of workers, and the counts of
+each cell's outcomes are written to a checkpoint as soon as it is done::
+
+    run_sweep(
+        "sweep.ndjson",
+        {"journals_h": [10, 11, 12], "win_g": [4, 5]},
+        player_counts=(5, 6),
+        processes=8,
+    )
+
+The checkpoint has one line of JSON for each finished cell, synced to disk
+before the next is written. A sweep that is interrupted can be run again
+with the same arguments, and it skips every cell already in the
+checkpoint. A sweep can also be split between machines with `shard`, each
+writing to its own checkpoint."""
+
+import itertools
+import json
+import multiprocessing
+import os
+from collections import Counter, namedtuple
+
+from .game import OUTCOMES, STANDARD, Rules
+from .results import repair_lines
+from .strategies import all_strategies
+from .tournament import play_game
+
+
+class Cell(namedtuple("Cell", ("rules", "players"))):
+    """A cell of a sweep: the rules of its games and how many play them."""
+
+    __slots__ = ()
+
+    def to_json(self):
+        """Get the cell as a dictionary that can be written as JSON."""
+
+        return dict(self.rules._asdict(), players=self.players)
+
+    @classmethod
+    def from_json(cls, data):
+        """Make a cell from a dictionary written by `to_json`."""
+
+        data = dict(data)
+        players = data.pop("players")
+        rules = Rules(
+            **{
+                name: tuple(value) if isinstance(value, list) else value
+                for name, value in data.items()
+            }
+        )
+
+        return cls(rules, players)
+
+
+def make_grid(axes, player_counts=(5,), base=STANDARD):
+    """Get every cell of a sweep, in order. The `axes` map fields of `Rules`
+    to the values to try, and every combination of them is made from the
+    `base` rules for each player count."""
+
+    unknown = set(axes) - set(Rules._fields)
+    if unknown:
+        raise ValueError(f"There are no rules called {sorted(unknown)}.")
+
+    names = list(axes)
+    for values in itertools.product(*axes.values()):
+        rules = base._replace(**dict(zip(names, values)))
+        for number_of_players in player_counts:
+            yield Cell(rules, number_of_players)
+
+
+def shard_of(cells, shard):
+    """Get the cells in one shard of a sweep, given as `(index, count)`. The
+    cells are dealt out in turn, so every shard has a similar mix."""
+
+    if shard is None:
+        return list(cells)
+
+    index, count = shard
+    if not 0 <= index < count:
+        raise ValueError(f"There is no shard {index} of {count}.")
+
+    return list(itertools.islice(cells, index, None, count))
+
+
+def play_cell(job):
+    """Play every seed in a cell and count the outcomes by their index in
+    `OUTCOMES`. The job is a tuple of `(cell, strategies, seeds,
+    max_turns)`."""
+
+    cell, strategies, seeds, max_turns = job
+    counts = [0] * len(OUTCOMES)
+    for seed in seeds:
+        outcome = play_game(
+            strategies, cell.players, seed, max_turns, rules=cell.rules
+        )
+        counts[OUTCOMES.index(outcome)] += 1
+
+    return cell, counts
+
+
+def read_checkpoint(path):
+    """Read the counts of every cell finished so far, skipping any line that
+    was only partly written."""
+
+    done = {}
+    if not os.path.exists(path):
+        return done
+
+    with open(path) as file:
+        for line in file:
+            if line.endswith("\n"):
+                entry = json.loads(line)
+                done[Cell.from_json(entry["cell"])] = entry["outcomes"]
+
+    return done
+
+
+def write_checkpoint(path, cell, counts):
+    """Add a finished cell to the checkpoint and sync it to disk."""
+
+    line = json.dumps({"cell": cell.to_json(), "outcomes": counts})
+    with open(path, "a") as file:
+        file.write(line + "\n")
+        file.flush()
+        os.fsync(file.fileno())
+
+
+def collect(path, done, finished):
+    """Checkpoint each cell as it finishes, and add it to those done."""
+
+    for cell, counts in finished:
+        write_checkpoint(path, cell, counts)
+        done[cell] = counts
+
+
+def run_sweep(
+    path,
+    axes,
+    player_counts=(5,),
+    strategies=None,
+    seeds=range(1000),
+    max_turns=1000,
+    processes=1,
+    shard=None,
+    base=STANDARD,
+):
+    """Play `seeds` in every cell of the grid made by `make_grid`, or of one
+    shard of it, checkpointing each cell to `path` as it finishes and
+    skipping those already there.
+
+    Returns a dictionary mapping each cell to a `Counter` of the `(winner,
+    message)` pairs from its games, as `run_tournament` does for each player
+    count."""
+
+    strategies = strategies or all_strategies
+    cells = shard_of(make_grid(axes, player_counts, base), shard)
+    done = read_checkpoint(path)
+    if os.path.exists(path):
+        repair_lines(path)
+    jobs = [
+        (cell, strategies, seeds, max_turns)
+        for cell in cells
+        if cell not in done
+    ]
+
+    if processes == 1:
+        collect(path, done, map(play_cell, jobs))
+    else:
+        with multiprocessing.Pool(processes) as pool:
+            collect(path, done, pool.imap_unordered(play_cell, jobs))
+
+    return {
+        cell: Counter(
+            {OUTCOMES[index]: n for index, n in enumerate(done[cell]) if n}
+        )
+        for cell in cells
+    }
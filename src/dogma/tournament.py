@@ -0,0 +1,302 @@
+"""Tools for playing large numbers of games across several processes."""
+
+import functools
+import itertools
+import math
+import multiprocessing
+import random
+from collections import Counter
+
+from .game import STANDARD, DogmaGame
+from .strategies import all_strategies
+
+
+def choose_lineup(strategies, number_of_players, seed):
+    """Choose a strategy for each seat at the table. The choice depends only on
+    the seed, and is independent of the randomness within the game itself."""
+
+    state = random.Random(f"lineup-{seed}")
+
+    return [state.choice(strategies) for _ in range(number_of_players)]
+
+
+def play_game(
+    strategies,
+    number_of_players,
+    seed,
+    max_turns=None,
+    profiler=None,
+    tracker=None,
+    rules=STANDARD,
+):
+    """Play a single game with a lineup drawn from `strategies`, by `rules`.
+    A game that exhausts its journal deck is abandoned, as in
+    `DogmaGame.play`. The game is timed by `profiler`, and the players'
+    decisions by `tracker`, if there are any."""
+
+    lineup = choose_lineup(strategies, number_of_players, seed)
+
+    return play_lineup(lineup, seed, max_turns, profiler, tracker, rules)
+
+
+def play_lineup(
+    lineup,
+    seed,
+    max_turns=None,
+    profiler=None,
+    tracker=None,
+    rules=STANDARD,
+):
+    """Play a single game with a strategy given for each seat, as in
+    `play_game`."""
+
+    game = play_table(lineup, seed, max_turns, None, profiler, tracker, rules)
+
+    return game.winner, game.message
+
+
+def play_table(
+    lineup,
+    seed,
+    max_turns=None,
+    log=None,
+    profiler=None,
+    tracker=None,
+    rules=STANDARD,
+):
+    """Seat a player of each strategy in `lineup` at a game, logged to `log`
+    if it is given, and play it as in `play_lineup`. Returns the game once it
+    is over."""
+
+    players = [Strategy(str(seat)) for seat, Strategy in enumerate(lineup)]
+    if tracker is not None:
+        for player in players:
+            tracker.attach(player)
+    game = DogmaGame(players, seed, log, profiler, rules)
+    game.play(max_turns)
+
+    return game
+
+
+def play_chunk(chunk):
+    """Play every seed in a chunk of games and count their results. The chunk
+    is a tuple of `(strategies, number_of_players, seeds, max_turns)`."""
+
+    strategies, number_of_players, seeds, max_turns = chunk
+
+    return number_of_players, Counter(
+        play_game(strategies, number_of_players, seed, max_turns)
+        for seed in seeds
+    )
+
+
+def make_chunks(strategies, player_counts, seeds, max_turns, chunksize):
+    """Split the games to be played into chunks of consecutive seeds."""
+
+    for number_of_players in player_counts:
+        for start in range(0, len(seeds), chunksize):
+            stop = start + chunksize
+            yield strategies, number_of_players, seeds[start:stop], max_turns
+
+
+def tally(results, outcomes):
+    """Add the counts from each chunk to the results for its player count."""
+
+    for number_of_players, counts in outcomes:
+        results[number_of_players].update(counts)
+
+
+def run_tournament(
+    strategies=None,
+    player_counts=(5, 6),
+    seeds=range(1000),
+    max_turns=1000,
+    processes=None,
+    chunksize=None,
+):
+    """Play a game for every combination of player count and seed, spreading
+    the games across a pool of processes. Each worker is handed a whole chunk
+    of seeds at once and returns only the counts of its results, so there are
+    two pickle round trips per chunk rather than per game.
+
+    Returns a dictionary mapping each player count to a `Counter` of the
+    `(winner, message)` pairs from its games. Games that pass `max_turns`
+    without a winner are recorded with a winner of `None`.
+    """
+
+    if strategies is None:
+        strategies = all_strategies
+
+    processes = processes or multiprocessing.cpu_count()
+    if chunksize is None:
+        chunksize = max(1, len(seeds) // (4 * processes))
+
+    chunks = make_chunks(strategies, player_counts, seeds, max_turns, chunksize)
+    results = {
+        number_of_players: Counter() for number_of_players in player_counts
+    }
+
+    if processes == 1:
+        tally(results, map(play_chunk, chunks))
+    else:
+        with multiprocessing.Pool(processes) as pool:
+            tally(results, pool.imap_unordered(play_chunk, chunks))
+
+    return results
+
+
+def wilson(wins, games, z=1.96):
+    """Get the Wilson score interval for a rate of `wins` in `games`, with
+    `z` standard errors either side, kept within nought and one. With no
+    games, it is the whole of that."""
+
+    if not games:
+        return 0.0, 1.0
+
+    rate = wins / games
+    shift = z * z / games
+    centre = rate + shift / 2
+    spread = z * math.sqrt(rate * (1 - rate) / games + shift / (4 * games))
+
+    low = (centre - spread) / (1 + shift)
+    high = (centre + spread) / (1 + shift)
+
+    return max(low, 0.0), min(high, 1.0)
+
+
+def all_lineups(strategies, number_of_players):
+    """Get every mix of strategies at a table, ignoring the order of the
+    seats, since the roles are dealt at random."""
+
+    return list(
+        itertools.combinations_with_replacement(strategies, number_of_players)
+    )
+
+
+class Matchup:
+    """The games played so far by one lineup in a sequential tournament.
+    Its rate is the share of the games with a winner that the conformists
+    won."""
+
+    def __init__(self, lineup):
+
+        self.lineup = tuple(lineup)
+        self.results = Counter()
+        self.games = 0
+
+    @property
+    def wins(self):
+        """The number of games won by the conformists."""
+
+        return sum(
+            n for (winner, _), n in self.results.items() if winner == "C"
+        )
+
+    @property
+    def decided(self):
+        """The number of games that someone won."""
+
+        return sum(
+            n for (winner, _), n in self.results.items() if winner is not None
+        )
+
+    @property
+    def rate(self):
+        """The share of decided games won by the conformists, if any were
+        decided."""
+
+        decided = self.decided
+        return self.wins / decided if decided else None
+
+    def interval(self, z=1.96):
+        """Get the Wilson score interval for the rate."""
+
+        return wilson(self.wins, self.decided, z)
+
+    def settled(self, width, threshold=None, z=1.96):
+        """Check whether the interval is no wider than `width`, or lies
+        wholly to one side of `threshold`."""
+
+        low, high = self.interval(z)
+        if high - low <= width:
+            return True
+
+        return threshold is not None and not low <= threshold <= high
+
+
+def play_batch(job):
+    """Play every seed in a batch for one lineup and count the results. The
+    job is a tuple of `(index, lineup, seeds, max_turns)`, and the index is
+    handed back with the counts."""
+
+    index, lineup, seeds, max_turns = job
+
+    return index, Counter(
+        play_lineup(lineup, seed, max_turns) for seed in seeds
+    )
+
+
+def next_round(matchups, seeds, batch_size, max_turns, stopping):
+    """Get a batch of the next seeds for each lineup that is not settled by
+    the `stopping` arguments of `Matchup.settled`."""
+
+    jobs = []
+    for index, matchup in enumerate(matchups):
+        start = matchup.games
+        stop = min(start + batch_size, len(seeds))
+        if start < stop and not matchup.settled(*stopping):
+            jobs.append((index, matchup.lineup, seeds[start:stop], max_turns))
+
+    return jobs
+
+
+def play_rounds(matchups, rounds, play):
+    """Play each round of batches from `rounds` with `play`, which maps
+    `play_batch` over them, until a round comes back empty."""
+
+    for jobs in iter(rounds, []):
+        for index, counts in play(play_batch, jobs):
+            matchups[index].results.update(counts)
+            matchups[index].games += sum(counts.values())
+
+
+def run_sequential(
+    lineups,
+    seeds=range(10_000),
+    batch_size=50,
+    width=0.1,
+    threshold=None,
+    z=1.96,
+    max_turns=1000,
+    processes=1,
+):
+    """Play each lineup in batches of `batch_size` seeds only until it is
+    settled, rather than for a fixed number of games. Every round gives one
+    more batch to each lineup that is not yet settled, so close matchups,
+    whose intervals narrow slowest, get the most games.
+
+    A lineup is settled once the Wilson interval of its rate is no wider
+    than `width`, or, if a `threshold` is given, once the interval lies
+    wholly to one side of it, or when `seeds` run out. Every lineup plays
+    the same seeds in the same order, so each difference between two of
+    them comes from their strategies rather than their luck.
+
+    Returns a list of a `Matchup` for each lineup, in order."""
+
+    matchups = [Matchup(lineup) for lineup in lineups]
+    rounds = functools.partial(
+        next_round,
+        matchups,
+        seeds,
+        batch_size,
+        max_turns,
+        (width, threshold, z),
+    )
+
+    if processes == 1:
+        play_rounds(matchups, rounds, map)
+    else:
+        with multiprocessing.Pool(processes) as pool:
+            play_rounds(matchups, rounds, pool.imap_unordered)
+
+    return matchups
@@ -0,0 +1,183 @@
+"""A sampler of the hidden worlds that fit what one player knows of a game.
+
+A player knows their own role, their partner if they are a maverick, any
+cards in their hand, any cards they have seen on top of the deck and any
+they put on the discard pile themselves, as well as everything that has
+been published. Everything else is hidden: who Galileo and the maverick are,
+and the order of the deck and the discard pile.
+
+A `WorldSampler` works out once which role assignments are possible and which
+cards are left to place, so that each world is dealt with one draw from a
+table of roles and one shuffle, and is never thrown away::
+
+    sampler = WorldSampler.from_game(game, player)
+    for snapshot in sampler.samples(10_000, random.Random(0)):
+        ...
+"""
+
+import itertools
+import random
+
+from .game import STANDARD
+
+
+class WorldSampler:
+    """Deals out worlds from a snapshot of a game, as seen by the player in
+    `seat`. The worlds are snapshots with the roles, the deck and the
+    discard pile filled in.
+
+    The cards in `known` are in the player's hand, and so are left out of
+    the deck. The cards in `top`, which the player has seen on top of the
+    deck, stay there, and those in `handled` stay in the discard pile. Either
+    is ignored if it does not fit the cards left to place. A `belief` from
+    `dogma.inference` weights the deals of a conformist player; otherwise,
+    every deal that fits is equally likely. The cards left to place are
+    counted from the deck of the game's `rules`."""
+
+    def __init__(
+        self,
+        snapshot,
+        seat,
+        role,
+        partner=None,
+        known=(),
+        top=(),
+        handled=(),
+        belief=None,
+        rules=STANDARD,
+    ):
+
+        self.snapshot = snapshot
+        self.seat = seat
+        self.role = role
+        self.partner = partner
+        self.known = list(known)
+
+        self.roles = self.possible_roles()
+        self.weights = None
+        if belief is not None and role == "C":
+            self.weighted_roles(belief)
+
+        helio, geo = snapshot.publications
+        helio = rules.journals_h - helio - self.known.count("H")
+        geo = rules.journals_g - geo - self.known.count("G")
+
+        top = list(top)
+        if top.count("H") > helio or top.count("G") > geo:
+            top = []
+        helio -= top.count("H")
+        geo -= top.count("G")
+
+        handled = list(handled)
+        if (
+            handled.count("H") > helio
+            or handled.count("G") > geo
+            or len(handled) > len(snapshot.discard_pile)
+        ):
+            handled = []
+        helio -= handled.count("H")
+        geo -= handled.count("G")
+
+        self.top = top
+        self.handled = handled
+        self.pool = ["H"] * helio + ["G"] * geo
+        self.size = len(snapshot.journal_cards) - len(top)
+        self.stop = self.size + len(snapshot.discard_pile) - len(handled)
+
+    @classmethod
+    def from_game(cls, game, player, known=(), top=(), handled=(), belief=None):
+        """Make a sampler for a player from the current state of their
+        game."""
+
+        return cls(
+            game.snapshot(),
+            game.seat_of(player),
+            player.role,
+            game.seat_of(player.partner),
+            known,
+            top,
+            handled,
+            belief,
+            game.rules,
+        )
+
+    def possible_roles(self):
+        """List every assignment of roles that fits the player's own
+        knowledge. Galileo cannot have been denounced, or the game would be
+        over."""
+
+        number_of_players = len(self.snapshot.roles)
+        if self.role != "C":
+            roles = ["C"] * number_of_players
+            roles[self.seat] = self.role
+            roles[self.partner] = "G" if self.role == "M" else "M"
+            return [tuple(roles)]
+
+        alive = self.snapshot.alive
+        possible = []
+        for galileo, maverick in itertools.permutations(
+            range(number_of_players), 2
+        ):
+            if self.seat in (galileo, maverick) or not alive >> galileo & 1:
+                continue
+
+            roles = ["C"] * number_of_players
+            roles[galileo], roles[maverick] = "G", "M"
+            possible.append(tuple(roles))
+
+        return possible
+
+    def weighted_roles(self, belief):
+        """Weight each assignment of roles by a belief, leaving out those it
+        rules out."""
+
+        weights = dict(zip(belief.hypotheses, belief.weights))
+        weighted = [
+            (roles, weights[roles.index("G"), roles.index("M")])
+            for roles in self.roles
+        ]
+        weighted = [(roles, weight) for roles, weight in weighted if weight]
+
+        self.roles = [roles for roles, _ in weighted]
+        self.weights = list(
+            itertools.accumulate(weight for _, weight in weighted)
+        )
+
+    def deal_roles(self, state):
+        """Pick an assignment of roles."""
+
+        if self.weights is None:
+            return state.choice(self.roles)
+
+        return state.choices(self.roles, cum_weights=self.weights)[0]
+
+    def deal_cards(self, state):
+        """Deal out the cards that the player cannot account for between the
+        deck and the discard pile. Returns the deck, from the top down, and
+        the discard pile."""
+
+        pool = self.pool[:]
+        state.shuffle(pool)
+
+        size, stop = self.size, self.stop
+
+        return self.top + pool[:size], self.handled + pool[size:stop]
+
+    def sample(self, state):
+        """Get a snapshot of one world that fits what the player knows."""
+
+        cards, discards = self.deal_cards(state)
+
+        return self.snapshot._replace(
+            roles=self.deal_roles(state),
+            journal_cards=cards,
+            discard_pile=discards,
+            random=None,
+        )
+
+    def samples(self, count, state=None):
+        """Generate `count` worlds."""
+
+        state = state or random.Random()
+        for _ in range(count):
+            yield self.sample(state)
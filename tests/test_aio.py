@@ -0,0 +1,166 @@
+"""Tests for the asynchronous game loop."""
+
+import asyncio
+
+from hypothesis import given, settings
+from hypothesis.strategies import booleans, integers, lists
+
+from dogma import DogmaGame
+from dogma.aio import decide, play, play_games, run
+from dogma.deck import EmptyDeckError
+from dogma.events import EventLog
+from dogma.game import OUTCOMES
+from dogma.strategies import Random
+from dogma.tournament import play_game
+
+from .util import Agreeable, seeds
+
+
+class Remote(Random):
+    """A random player whose every decision has to be waited on."""
+
+    async def nominate(self, players):
+
+        await asyncio.sleep(0)
+        return super().nominate(players)
+
+    async def vote(self, nominee):
+
+        await asyncio.sleep(0)
+        return super().vote(nominee)
+
+    async def choose_cards_to_submit(self, choices, overrule_available=False):
+
+        await asyncio.sleep(0)
+        overrule = False
+        if overrule_available:
+            overrule = Random.agree_to_overrule(self)
+
+        reject = self.random.choice(choices)
+        choices.remove(reject)
+
+        return choices, reject, overrule
+
+    async def agree_to_overrule(self):
+
+        await asyncio.sleep(0)
+        return super().agree_to_overrule()
+
+    async def denounce(self, players):
+
+        await asyncio.sleep(0)
+        return super().denounce(players)
+
+
+def test_decide():
+    """Test that decisions are waited on only if they need to be."""
+
+    player, remote = Random("0"), Remote("1")
+
+    assert asyncio.run(decide(player.agree_to_overrule)) in (True, False)
+    assert asyncio.run(decide(remote.agree_to_overrule)) in (True, False)
+
+
+@settings(deadline=None)
+@given(
+    seed=seeds,
+    remote=lists(booleans(), min_size=5, max_size=6),
+    max_turns=integers(min_value=1, max_value=100),
+)
+def test_play(seed, remote, max_turns):
+    """Test that a game played asynchronously goes, and is logged, just as it
+    would be otherwise."""
+
+    logs = EventLog(), EventLog()
+    players = [
+        Remote(str(i)) if is_remote else Random(str(i))
+        for i, is_remote in enumerate(remote)
+    ]
+    game = DogmaGame(players, seed, logs[0])
+    other = DogmaGame(
+        [Random(str(i)) for i in range(len(remote))], seed, logs[1]
+    )
+
+    assert asyncio.run(play(game, max_turns)) == other.play(max_turns)
+
+    assert bytes(logs[0]) == bytes(logs[1])
+
+
+class Waiter(Random):
+    """A player who will not vote until everyone else has started to."""
+
+    def __init__(self, name, arrivals, everyone):
+
+        super().__init__(name)
+        self.arrivals = arrivals
+        self.everyone = everyone
+
+    async def vote(self, nominee):
+
+        self.arrivals.append(self)
+        while len(self.arrivals) < self.everyone:
+            await asyncio.sleep(0)
+
+        return "yes"
+
+
+def test_votes_are_concurrent():
+    """Test that every vote in a round is waited on at the same time."""
+
+    arrivals = []
+    players = [Waiter(str(i), arrivals, 5) for i in range(5)]
+    game = DogmaGame(players, 0)
+
+    votes = game.cast_vote_steps(players[0])
+    result = asyncio.run(asyncio.wait_for(run(votes), 1))
+
+    assert result is True
+    assert len(arrivals) == 5
+
+
+@settings(deadline=None, max_examples=10)
+@given(seeds_=lists(seeds, min_size=1, max_size=50))
+def test_play_games(seeds_):
+    """Test that many games can share one event loop."""
+
+    games = [
+        DogmaGame([Remote(str(i)) for i in range(5)], seed) for seed in seeds_
+    ]
+
+    results = asyncio.run(play_games(games, 100))
+
+    assert results == [play_game([Random], 5, seed, 100) for seed in seeds_]
+
+
+def test_play_games_exhausted(monkeypatch):
+    """Test that a game that runs out of journal cards is abandoned."""
+
+    game = DogmaGame([Agreeable(str(i)) for i in range(5)], 0)
+
+    def exhaust(*args, **kwargs):
+        raise EmptyDeckError
+
+    monkeypatch.setattr(game, "draw_journals", exhaust)
+
+    assert asyncio.run(play_games([game])) == [OUTCOMES[-1]]
+
+
+@given(agreed=booleans())
+def test_settle_overrule(agreed):
+    """Test that a refused overrule means the editor publishes after all."""
+
+    game = DogmaGame([Remote(str(i)) for i in range(5)], 0)
+    game.assign_roles()
+    game.start_turn()
+    game.editor = game.seating.next_player(game.dean)
+
+    async def answer():
+
+        return agreed
+
+    game.dean.agree_to_overrule = answer
+    published = asyncio.run(run(game.settle_overrule_steps(["H"], "G")))
+
+    assert published is not agreed
+    assert game.pressure_to_print == agreed
+    assert sum(game.publications.values()) == (not agreed)
@@ -0,0 +1,210 @@
+"""Tests for the columnar archive of game histories."""
+
+import json
+import os
+
+import numpy as np
+import pytest
+from hypothesis import given, settings
+from hypothesis.strategies import integers, sampled_from
+
+from dogma.archive import (
+    COLUMNS,
+    EVENT_COLUMNS,
+    GAME_COLUMNS,
+    Archive,
+    ArchiveSink,
+    column_path,
+    stream_archive,
+)
+from dogma.game import OUTCOMES
+from dogma.replay import replay
+from dogma.results import record_game, record_games
+from dogma.strategies import all_strategies
+
+number_of_players = integers(min_value=5, max_value=6)
+
+
+@settings(deadline=None, max_examples=10)
+@given(number_of_players=number_of_players, batch_size=integers(1, 8))
+def test_stream_archive(tmp_path_factory, number_of_players, batch_size):
+    """Test that every game can be read back from the archive as it was
+    played, and rebuilt from its log."""
+
+    path = str(tmp_path_factory.mktemp("archive"))
+    seeds = range(20, 0, -1)
+    written = stream_archive(
+        path, None, number_of_players, seeds, 100, batch_size=batch_size
+    )
+
+    assert written == len(seeds)
+    with Archive(path) as archive:
+        assert len(archive) == len(seeds)
+        for game, seed in enumerate(seeds):
+            record = record_game(
+                all_strategies, number_of_players, seed, 100, history=True
+            )
+            stored = archive[game]
+
+            assert archive.find(seed) == game
+            assert bytes(stored.pop("log")) == record["events"]
+            assert OUTCOMES[stored.pop("outcome")] == (
+                record["winner"],
+                record["message"],
+            )
+            for name, value in stored.items():
+                assert record[name] == value
+
+            rebuilt = replay(archive.log(game))
+            assert (rebuilt.winner, rebuilt.message) == (
+                record["winner"],
+                record["message"],
+            )
+
+
+def test_resume(tmp_path):
+    """Test that an archive carries on after the last seed written, and that
+    a batch cut off part of the way through is thrown away."""
+
+    path = str(tmp_path / "archive")
+    assert stream_archive(path, seeds=range(10), max_turns=50) == 10
+
+    for name in EVENT_COLUMNS:
+        with open(column_path(path, name), "ab") as file:
+            file.write(b"\x07" * 5)
+    with open(column_path(path, "seed"), "ab") as file:
+        file.write(b"\x01\x02\x03")
+
+    assert stream_archive(path, seeds=range(15), max_turns=50) == 5
+
+    expected = list(record_games(None, 5, range(15), 50, history=True))
+    with Archive(path) as archive:
+        assert len(archive) == 15
+        assert [archive[game]["seed"] for game in range(15)] == list(range(15))
+        events = b"".join(record["events"] for record in expected)
+        assert len(archive.column("code")) == len(events) // 4
+
+
+def test_torn_offset(tmp_path):
+    """Test that an archive whose last offset was only partly written can be
+    read and carried on from the last batch before it."""
+
+    path = str(tmp_path / "archive")
+    assert stream_archive(path, seeds=range(10), max_turns=50) == 10
+    with open(column_path(path, "offset"), "ab") as file:
+        file.write(b"\x01\x02\x03")
+
+    with Archive(path) as archive:
+        assert len(archive) == 10
+        assert archive[9]["seed"] == 9
+
+    assert stream_archive(path, seeds=range(15), max_turns=50) == 5
+    with Archive(path) as archive:
+        assert len(archive) == 15
+        assert [archive[game]["seed"] for game in range(15)] == list(range(15))
+
+
+def test_unindexed(tmp_path):
+    """Test that games can be found by their seed before the index has been
+    rebuilt."""
+
+    path = str(tmp_path / "archive")
+    sink = ArchiveSink(path, batch_size=2)
+    for record in record_games(None, 5, (5, 3, 8), 50, history=True):
+        sink.write(record)
+    sink.flush()
+
+    with Archive(path) as archive:
+        assert archive.columns["index_seed"] is None
+        assert [archive.find(seed) for seed in (5, 3, 8)] == [0, 1, 2]
+        with pytest.raises(KeyError):
+            archive.find(4)
+
+    sink.close()
+    with Archive(path) as archive:
+        assert list(archive.column("index_seed")) == [3, 5, 8]
+        assert list(archive.column("index_game")) == [1, 0, 2]
+        with pytest.raises(KeyError):
+            archive.find(4)
+        with pytest.raises(KeyError):
+            archive.find(9)
+
+
+@settings(deadline=None, max_examples=10)
+@given(
+    winner=sampled_from(("C", "M", None, False)),
+    outcome=sampled_from((None,) + tuple(range(1, len(OUTCOMES)))),
+)
+def test_select(tmp_path_factory, winner, outcome):
+    """Test that games can be picked out by their winner and outcome."""
+
+    path = str(tmp_path_factory.mktemp("archive"))
+    stream_archive(path, seeds=range(40), max_turns=20)
+
+    with Archive(path) as archive:
+        selected = list(archive.select(winner, outcome))
+        expected = [
+            game
+            for game in range(len(archive))
+            if (winner is False or archive[game]["winner"] == winner)
+            and (
+                outcome is None
+                or OUTCOMES.index(
+                    (archive[game]["winner"], archive[game]["message"])
+                )
+                == outcome
+            )
+        ]
+
+        assert selected == expected
+
+
+def test_columns(tmp_path):
+    """Test that the columns can be wrapped by NumPy without a copy."""
+
+    path = str(tmp_path / "archive")
+    stream_archive(path, seeds=range(10), max_turns=50)
+
+    with Archive(path) as archive:
+        for name in COLUMNS:
+            column = archive.column(name)
+            values = np.frombuffer(column, dtype=column.format)
+            assert len(values) == len(column)
+            if name in GAME_COLUMNS:
+                assert len(values) == len(archive)
+            del values
+            column.release()
+
+        codes = archive.column("code")
+        assert np.frombuffer(codes, np.uint8).base is not None
+        codes.release()
+
+        with pytest.raises(IndexError):
+            archive[len(archive)]
+
+
+def test_empty_archive(tmp_path):
+    """Test that an archive with no games in it can be opened."""
+
+    path = str(tmp_path / "archive")
+    ArchiveSink(path).close()
+
+    with Archive(path) as archive:
+        assert len(archive) == 0
+        assert list(archive.select("C")) == []
+        assert ArchiveSink(path).last_seed() is None
+
+
+def test_foreign_archive(tmp_path):
+    """Test that an archive in another format is refused."""
+
+    path = str(tmp_path / "archive")
+    ArchiveSink(path).close()
+    with open(os.path.join(path, "archive.json"), "r+") as file:
+        header = json.load(file)
+        header["format"] += 1
+        file.seek(0)
+        json.dump(header, file)
+
+    with pytest.raises(ValueError):
+        Archive(path)
@@ -0,0 +1,253 @@
+"""Tests for the vectorised batch engine."""
+
+from collections import Counter
+
+import numpy as np
+from hypothesis import given, settings
+from hypothesis.strategies import integers
+
+from dogma import DogmaGame
+from dogma.batch import BatchGame, make_tables, simulate
+from dogma.game import ADJOURNED, OUTCOMES, STANDARD
+from dogma.strategies import Random
+
+from .util import seeds, small_rules
+
+number_of_players = integers(min_value=5, max_value=6)
+number_of_games = integers(min_value=1, max_value=50)
+
+
+@given(number_of_players=integers(min_value=1, max_value=7))
+def test_make_tables(number_of_players):
+    """Test that the lookup tables agree with the sets they describe."""
+
+    counts, ranked, following = make_tables(number_of_players)
+    ranked = ranked.reshape(-1, number_of_players)
+    following = following.reshape(-1, number_of_players)
+
+    for mask in range(2**number_of_players):
+        members = [s for s in range(number_of_players) if mask >> s & 1]
+        assert counts[mask] == len(members)
+        assert list(ranked[mask, : len(members)]) == members
+
+        for seat in range(number_of_players):
+            if members:
+                later = [s for s in members if s > seat] or members
+                assert following[mask, seat] == later[0]
+            else:
+                assert following[mask, seat] == seat
+
+
+@given(
+    number_of_players=number_of_players,
+    number_of_games=number_of_games,
+    seed=seeds,
+)
+def test_init(number_of_players, number_of_games, seed):
+    """Test that a batch of games can be made."""
+
+    batch = BatchGame(number_of_players, number_of_games, seed)
+
+    assert len(batch) == number_of_games
+    assert batch.ongoing == number_of_games
+    assert (batch.deck_h == 11).all() and (batch.deck_g == 6).all()
+    assert (batch.alive == 2**number_of_players - 1).all()
+    assert ((batch.galileo >= 0) & (batch.galileo < number_of_players)).all()
+    assert batch.results.sum() == 0
+
+
+def test_init_by_rules():
+    """Test that a batch of games is dealt the deck of its rules."""
+
+    batch = BatchGame(5, 3, 0, small_rules)
+
+    assert batch.rules is small_rules
+    assert (batch.deck_h == 6).all() and (batch.deck_g == 5).all()
+
+
+@given(number_of_players=number_of_players, seed=seeds)
+def test_set_next_dean(number_of_players, seed):
+    """Test that the next dean is the next player who has not been
+    denounced."""
+
+    batch = BatchGame(number_of_players, 2, seed)
+    batch.dean = np.array([0, number_of_players - 1], dtype=np.int8)
+    batch.alive[0] &= ~0b10
+
+    batch.set_next_dean()
+
+    assert list(batch.dean) == [2, 0]
+    assert list(batch._dean) == [0b100, 0b1]
+
+
+@given(number_of_players=number_of_players, seed=seeds)
+def test_get_players_for_nomination(number_of_players, seed):
+    """Test that the dean, the ex-editor and (with six players) the ex-dean
+    cannot be nominated, and nor can anyone who has been denounced."""
+
+    batch = BatchGame(number_of_players, 1, seed)
+    batch._dean[:] = 0b1
+    batch.ex_dean[:] = 0b10
+    batch.ex_editor[:] = 0b100
+    batch.alive[:] &= ~0b1000
+
+    eligible = batch._get_players_for_nomination()[0]
+    expected = (2**number_of_players - 1) & ~0b1101
+    if number_of_players == 6:
+        expected &= ~0b10
+
+    assert eligible == expected
+
+
+@given(number_of_players=number_of_players, seed=seeds)
+def test_choose(number_of_players, seed):
+    """Test that a seat is always chosen from the set given."""
+
+    batch = BatchGame(number_of_players, 2**number_of_players - 1, seed)
+    masks = np.arange(1, 2**number_of_players)
+    chosen = batch._choose(masks)
+
+    assert ((masks >> chosen.astype(np.int64)) & 1).all()
+
+
+@given(number_of_games=number_of_games, seed=seeds)
+def test_draw_journals(number_of_games, seed):
+    """Test that drawing cards takes them from the deck one at a time."""
+
+    batch = BatchGame(5, number_of_games, seed)
+    mask = np.arange(number_of_games) % 2 == 0
+    cards = batch.draw_journals(mask)
+
+    drawn = sum(cards)
+    assert len(cards) == 3
+    assert (batch.deck_h == 11 - drawn).all()
+    assert (batch.deck_g == 6 - mask * (3 - drawn)).all()
+    assert not drawn[~mask].any()
+
+
+@given(number_of_games=number_of_games, seed=seeds)
+def test_reshuffle(number_of_games, seed):
+    """Test that the discard pile is shuffled back in only when there are too
+    few cards left to draw."""
+
+    batch = BatchGame(5, number_of_games, seed)
+    batch.deck_h[:], batch.deck_g[:] = 1, 1
+    batch.discard_h[:], batch.discard_g[:] = 0, 1
+    batch.deck_h[0] = 3
+
+    exhausted = batch._reshuffle(np.ones(number_of_games, dtype=bool), 3)
+
+    assert not exhausted.any()
+    assert batch.deck_h[0] == 3 and batch.discard_g[0] == 1
+    assert (batch.deck_g[1:] == 2).all() and not batch.discard_g[1:].any()
+
+
+@given(seed=seeds)
+def test_emergency_publication_exhausted(seed):
+    """Test that a game with too few cards for an emergency publication is
+    reported as exhausted, and one that has to reshuffle still publishes."""
+
+    batch = BatchGame(5, 2, seed)
+    batch.deck_h[:], batch.deck_g[:] = 0, 0
+    batch.discard_h[:], batch.discard_g[:] = [0, 1], 0
+    batch.pressure_to_print[:] = 3
+
+    exhausted = batch.emergency_publication(np.ones(2, dtype=bool))
+
+    assert list(exhausted) == [True, False]
+    assert list(batch.publications_h) == [0, 1]
+    assert list(batch.pressure_to_print) == [3, 0]
+
+
+@given(
+    number_of_players=number_of_players,
+    number_of_games=number_of_games,
+    seed=seeds,
+)
+def test_turn(number_of_players, number_of_games, seed):
+    """Test that a batch can play a turn of every game."""
+
+    batch = BatchGame(number_of_players, number_of_games, seed)
+    batch.turn()
+
+    assert batch.turns == 1
+    assert batch.ongoing == number_of_games
+    published = batch.publications_h + batch.publications_g
+    assert (published <= 1).all()
+    assert (batch.pressure_to_print == 1 - published).all()
+    assert (
+        batch.deck_h + batch.deck_g + batch.discard_h + batch.discard_g
+        == 17 - published
+    ).all()
+
+
+@given(
+    number_of_players=number_of_players,
+    number_of_games=number_of_games,
+    seed=seeds,
+)
+def test_play(number_of_players, number_of_games, seed):
+    """Test that a batch plays every one of its games to the end."""
+
+    results = BatchGame(number_of_players, number_of_games, seed).play()
+
+    assert sum(results.values()) == number_of_games
+    assert set(results) <= set(OUTCOMES[1:])
+    assert results == BatchGame(number_of_players, number_of_games, seed).play()
+
+
+@given(number_of_games=number_of_games, max_turns=integers(0, 3), seed=seeds)
+def test_play_turn_limit(number_of_games, max_turns, seed):
+    """Test that games still going after the turn limit are abandoned."""
+
+    batch = BatchGame(5, number_of_games, seed)
+    results = batch.play(max_turns)
+
+    assert batch.turns == max_turns or batch.ongoing == 0
+    assert sum(results.values()) == number_of_games
+    if max_turns < 3:
+        assert results[OUTCOMES[ADJOURNED]] == number_of_games
+
+
+@settings(deadline=None, max_examples=10)
+@given(number_of_games=integers(1, 100), size=integers(1, 40), seed=seeds)
+def test_simulate(number_of_games, size, seed):
+    """Test that simulated games are split into batches reproducibly."""
+
+    results = simulate(5, number_of_games, seed, size=size)
+
+    assert sum(results.values()) == number_of_games
+    assert results == simulate(5, number_of_games, seed, size=size)
+
+
+def test_simulate_in_parallel():
+    """Test that spreading batches across processes changes nothing."""
+
+    serial = simulate(6, 1000, 0, size=100)
+    parallel = simulate(6, 1000, 0, size=100, processes=2)
+
+    assert parallel == serial
+    assert sum(parallel.values()) == 1000
+
+
+def test_matches_reference_distribution():
+    """Test that the outcomes of the batch engine follow the same distribution
+    as those of `DogmaGame.play`, to within four standard errors, by the
+    standard rules and by others."""
+
+    for number_of_players, rules in (
+        (5, STANDARD),
+        (6, STANDARD),
+        (5, small_rules),
+    ):
+        reference = Counter()
+        for seed in range(4000):
+            players = [Random(str(i)) for i in range(number_of_players)]
+            reference[DogmaGame(players, seed, rules=rules).play()] += 1
+
+        batch = simulate(number_of_players, 200000, seed=0, rules=rules)
+        for outcome in OUTCOMES[1:]:
+            p = batch[outcome] / 200000
+            q = reference[outcome] / 4000
+            error = (q * (1 - q) / 4000 + p * (1 - p) / 200000) ** 0.5
+            assert abs(p - q) <= 4 * error + 1e-3
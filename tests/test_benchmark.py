@@ -0,0 +1,134 @@
+"""Tests for the benchmark suite."""
+
+import json
+
+from hypothesis import given, settings
+from hypothesis.strategies import floats, integers
+
+from dogma.benchmark import (
+    MICRO_BENCHMARKS,
+    PLAYER_COUNTS,
+    compare,
+    games_per_second,
+    main,
+    peak_memory,
+    prepared_game,
+    report,
+    run_benchmarks,
+    time_call,
+)
+
+from .util import seeds
+
+
+@given(number_of_players=integers(min_value=5, max_value=6), seed=seeds)
+def test_prepared_game(number_of_players, seed):
+    """Test that a prepared game has a print team and nothing else done."""
+
+    game = prepared_game(number_of_players, seed)
+
+    assert game.turns == 0
+    assert game.dean in game.players
+    assert game.editor in game.players
+    assert game.editor is not game.dean
+    assert game.galileo.partner is game.maverick
+    assert len(game.deck) == 17
+
+
+@settings(deadline=None, max_examples=10)
+@given(seed=seeds)
+def test_time_call(seed):
+    """Test that each micro-benchmark leaves the prepared game alone."""
+
+    game = prepared_game(seed=seed)
+    snapshot = game.snapshot()
+
+    for function in MICRO_BENCHMARKS.values():
+        assert time_call(function, game, number=3, repeat=2) > 0
+
+    assert game.snapshot() == snapshot
+
+
+def test_games_per_second_and_peak_memory():
+    """Test that whole games are timed and measured."""
+
+    assert games_per_second(5, games=2, repeat=1) > 0
+    assert peak_memory(6, games=2) > 0
+
+
+def results(**values):
+    """Make a set of results with the given values."""
+
+    units = {"turn": "s", "games_per_second_5": "games/s", "peak_memory_5": "B"}
+
+    return {
+        "results": {
+            name: {"value": value, "unit": units[name]}
+            for name, value in values.items()
+        }
+    }
+
+
+@given(change=floats(min_value=0.5, max_value=2))
+def test_compare(change):
+    """Test that a result is only a regression when it is worse than the
+    baseline by more than the threshold, in whichever direction is worse."""
+
+    baseline = results(turn=1, games_per_second_5=100, peak_memory_5=1000)
+    current = results(
+        turn=change, games_per_second_5=100 / change, peak_memory_5=1000
+    )
+    regressions = compare(current, baseline, threshold=0.2)
+
+    if change > 1.2 + 1e-9:
+        assert set(regressions) == {"turn", "games_per_second_5"}
+    if change < 1.2 - 1e-9:
+        assert regressions == {}
+
+
+def test_compare_missing():
+    """Test that benchmarks missing from the baseline are left out."""
+
+    baseline = results(turn=1)
+    current = results(turn=1, peak_memory_5=10**6)
+
+    assert compare(current, baseline) == {}
+    assert "%" not in report(current, baseline).splitlines()[1]
+
+
+def test_run_benchmarks():
+    """Test that every benchmark is run and has a unit."""
+
+    output = run_benchmarks(number=2, repeat=1, games=2)
+    names = list(MICRO_BENCHMARKS)
+    for number_of_players in PLAYER_COUNTS:
+        names += [
+            f"games_per_second_{number_of_players}",
+            f"peak_memory_{number_of_players}",
+        ]
+
+    assert list(output["results"]) == names
+    assert all(result["value"] > 0 for result in output["results"].values())
+    assert len(report(output).splitlines()) == len(names)
+
+
+def test_main(tmp_path, capsys):
+    """Test that the results are saved, and that a slowdown against the
+    baseline is reported with a failing status."""
+
+    path = tmp_path / "results.json"
+    arguments = ["--number", "2", "--repeat", "1", "--games", "2"]
+
+    assert main(arguments + ["--output", str(path)]) == 0
+    saved = json.loads(path.read_text())
+
+    assert (
+        main(arguments + ["--baseline", str(path), "--threshold", "100"]) == 0
+    )
+
+    for result in saved["results"].values():
+        result["value"] *= 1000 if result["unit"] == "games/s" else 0.001
+    path.write_text(json.dumps(saved))
+
+    assert main(arguments + ["--baseline", str(path)]) == 1
+    assert "worse than the baseline" in capsys.readouterr().out
@@ -0,0 +1,202 @@
+"""Tests for the on-disk cache of outcomes."""
+
+import os
+
+from hypothesis import given, settings
+from hypothesis.strategies import integers
+
+from dogma.cache import (
+    ResultCache,
+    cache_key,
+    engine_version,
+    play_chunk,
+    strategy_version,
+)
+from dogma.game import OUTCOMES, Rules
+from dogma.strategies import Random
+from dogma.tournament import play_lineup
+
+from .util import Agreeable
+
+
+class Versioned(Random):
+    """A player with a version of their own."""
+
+    version = 2
+
+
+LINEUP = (Random,) * 4 + (Agreeable,)
+
+
+def counting(monkeypatch):
+    """Count the seeds played by the cache."""
+
+    played = []
+
+    def play(lineup, seed, *args, **kwargs):
+        played.append(seed)
+        return play_lineup(lineup, seed, *args, **kwargs)
+
+    monkeypatch.setattr("dogma.cache.play_lineup", play)
+
+    return played
+
+
+def test_strategy_version():
+    """Test that a strategy is versioned by its attribute or its source."""
+
+    Copy = type("Copy", (Random,), {"vote": Agreeable.vote})
+
+    assert strategy_version(Versioned) == "2"
+    assert strategy_version(Agreeable) == strategy_version(Agreeable)
+    assert strategy_version(Agreeable) != strategy_version(Random)
+    assert strategy_version(Copy) != strategy_version(Agreeable)
+    assert len(strategy_version(Copy)) == 64
+
+
+def test_engine_version():
+    """Test that the engine is versioned by the source of its modules."""
+
+    assert engine_version() == engine_version()
+    assert len(engine_version()) == 64
+
+
+def test_cache_key(monkeypatch):
+    """Test that a key changes with everything a game depends on."""
+
+    key = cache_key(LINEUP, Rules(), 100)
+
+    assert key == cache_key(list(LINEUP), Rules(), 100)
+    assert key != cache_key(LINEUP[::-1], Rules(), 100)
+    assert key != cache_key(LINEUP[1:], Rules(), 100)
+    assert key != cache_key(LINEUP, Rules(journals_h=10), 100)
+    assert key != cache_key(LINEUP, Rules(), 200)
+    assert key != cache_key((Versioned,) * 5, Rules(), 100)
+
+    monkeypatch.setattr("dogma.cache.engine_version", lambda: "changed")
+    assert key != cache_key(LINEUP, Rules(), 100)
+
+
+@settings(deadline=None, max_examples=10)
+@given(
+    start=integers(min_value=0, max_value=100),
+    size=integers(min_value=1, max_value=60),
+    chunksize=integers(min_value=1, max_value=40),
+)
+def test_play(tmp_path_factory, start, size, chunksize):
+    """Test that the cache gets the outcome of each seed, in order, and
+    plays nothing the second time."""
+
+    cache = ResultCache(
+        str(tmp_path_factory.mktemp("cache")), chunksize=chunksize
+    )
+    seeds = range(start, start + size)[::-1]
+    outcomes = cache.play(LINEUP, seeds, 100)
+
+    assert outcomes == [play_lineup(LINEUP, seed, 100) for seed in seeds]
+    assert cache.play(LINEUP, seeds, 100) == outcomes
+    assert len(cache.entries()) == len({seed // chunksize for seed in seeds})
+
+
+def test_cached_batch(tmp_path, monkeypatch):
+    """Test that a cached batch is not played again, and that a batch that
+    is partly cached plays only the seeds that are missing."""
+
+    cache = ResultCache(str(tmp_path), chunksize=16)
+    played = counting(monkeypatch)
+
+    cache.play(LINEUP, range(40), 100)
+    assert played == list(range(40))
+
+    played.clear()
+    cache.play(LINEUP, range(40), 100)
+    assert played == []
+
+    cache.play(LINEUP, range(20, 70), 100)
+    assert played == list(range(40, 70))
+
+    played.clear()
+    cache.play(LINEUP, range(20), 200)
+    cache.play(LINEUP, range(20), 100, Rules(win_g=4))
+    assert played == list(range(20)) * 2
+
+
+def test_shared(tmp_path, monkeypatch):
+    """Test that caches in the same directory add to each other's chunks."""
+
+    first = ResultCache(str(tmp_path), chunksize=10)
+    second = ResultCache(str(tmp_path), chunksize=10)
+    key = cache_key(LINEUP, max_turns=100)
+
+    play_chunk((first, key, 0, [0, 1, 2], LINEUP, Rules(), 100))
+    play_chunk((second, key, 0, [3, 4], LINEUP, Rules(), 100))
+
+    assert sorted(first.get(key, 0)) == [0, 1, 2, 3, 4]
+    assert first.get(key, 1) == {}
+
+    played = counting(monkeypatch)
+    first.play(LINEUP, range(7), 100)
+    assert played == [5, 6]
+
+
+def test_evict(tmp_path):
+    """Test that the chunks used longest ago are removed once the cache
+    outgrows its limit."""
+
+    cache = ResultCache(str(tmp_path), chunksize=10)
+    key = cache_key(LINEUP)
+    for chunk in range(4):
+        cache.put(
+            key, chunk, {seed: 3 for seed in range(10 * chunk, 10 * chunk + 10)}
+        )
+    for chunk, when in zip(range(4), (4, 1, 3, 2)):
+        os.utime(cache.chunk_path(key, chunk), (when, when))
+
+    size = os.path.getsize(cache.chunk_path(key, 0))
+    cache.max_bytes = int(2.5 * size)
+    cache.put(key, 0, {0: 4})
+
+    assert sorted(os.path.basename(p) for p, _, _ in cache.entries()) == [
+        os.path.basename(cache.chunk_path(key, chunk)) for chunk in (0, 2)
+    ]
+    assert cache.get(key, 0)[0] == 4
+    assert cache.size == sum(size for _, _, size in cache.entries())
+    assert cache.size <= cache.max_bytes
+
+    cache.put(key, 5, {})
+    assert cache.get(key, 5) == {}
+
+
+def test_vanishing_files(tmp_path, monkeypatch):
+    """Test that a chunk removed by another process while the cache is being
+    looked over is passed by."""
+
+    cache = ResultCache(str(tmp_path), max_bytes=0, chunksize=10)
+    key = cache_key(LINEUP)
+    cache.put(key, 0, {0: 3})
+    gone = os.path.join(str(tmp_path), "gone.json")
+    entries = cache.entries()
+
+    monkeypatch.setattr(
+        "dogma.cache.os.walk",
+        lambda path: [(str(tmp_path), [], ["gone.json", "note.txt"])],
+    )
+    assert cache.entries() == []
+
+    monkeypatch.setattr(
+        ResultCache, "entries", lambda self: entries + [(gone, 0, 1)]
+    )
+    cache.evict()
+    assert cache.get(key, 0) == {}
+
+
+def test_play_in_processes(tmp_path):
+    """Test that workers fill the cache with the same outcomes."""
+
+    cache = ResultCache(str(tmp_path), chunksize=8)
+    outcomes = cache.play(LINEUP, range(30), 100, processes=2)
+
+    assert outcomes == [play_lineup(LINEUP, seed, 100) for seed in range(30)]
+    assert len(cache.entries()) == 4
+    assert cache.size == sum(size for _, _, size in cache.entries())
+    assert all(outcome in OUTCOMES for outcome in outcomes)
@@ -0,0 +1,184 @@
+"""Tests for the harness comparing lineups on the same deals."""
+
+import math
+
+import pytest
+from hypothesis import given, settings
+from hypothesis.strategies import integers, lists, sampled_from
+
+from dogma import DogmaGame
+from dogma.comparison import (
+    PAIRINGS,
+    SCORES,
+    Comparison,
+    compare,
+    pairing_games,
+    play_deal,
+    score_deal,
+    score_deals,
+)
+from dogma.deck import EmptyDeckError
+from dogma.strategies import Random
+
+from .util import Agreeable, seeds
+
+LINEUP = (Random,) * 4 + (Agreeable,)
+
+
+@given(deal=seeds, antithetic=sampled_from((False, True)))
+def test_play_deal(deal, antithetic):
+    """Test that a deal is played with the players' luck seeded apart, and
+    with the deck turned over if it is antithetic."""
+
+    players = [Strategy(str(seat)) for seat, Strategy in enumerate(LINEUP)]
+    game = DogmaGame(players, deal, player_seed=f"players-{deal}")
+    if antithetic:
+        game.journal_cards = list(reversed(game.journal_cards))
+    game.play(100)
+
+    assert play_deal(LINEUP, deal, antithetic, 100) == game.winner
+
+
+def test_play_deal_exhausted(monkeypatch):
+    """Test that a deal that runs out of journals has no winner."""
+
+    def exhaust(game, num=3):
+        raise EmptyDeckError
+
+    monkeypatch.setattr(DogmaGame, "draw_journals", exhaust)
+
+    assert play_deal(LINEUP, 0) is None
+
+
+def test_pairing_games():
+    """Test the games played on each deal in every pairing."""
+
+    assert pairing_games(LINEUP, "common") == [(LINEUP, False)]
+    assert pairing_games(LINEUP, "antithetic") == [
+        (LINEUP, False),
+        (LINEUP, True),
+    ]
+
+    rotated = pairing_games(LINEUP, "rotated")
+    assert len(rotated) == len(LINEUP)
+    assert not any(antithetic for _, antithetic in rotated)
+    assert [seats.index(Agreeable) for seats, _ in rotated] == [4, 3, 2, 1, 0]
+
+
+@given(deal=seeds, pairing=sampled_from(PAIRINGS))
+def test_score_deal(deal, pairing):
+    """Test that a lineup scores the mean of its games on a deal."""
+
+    games = pairing_games(LINEUP, pairing)
+    scores = [
+        SCORES[play_deal(seats, deal, antithetic, 100)]
+        for seats, antithetic in games
+    ]
+
+    assert score_deal(LINEUP, deal, pairing, 100) == pytest.approx(
+        sum(scores) / len(scores)
+    )
+
+
+def test_score_deals():
+    """Test that a chunk scores both lineups on each of its deals."""
+
+    first = (Random,) * 5
+    pairs = score_deals((first, LINEUP, range(5), "common", 100))
+
+    assert pairs == [
+        (
+            score_deal(first, deal, max_turns=100),
+            score_deal(LINEUP, deal, max_turns=100),
+        )
+        for deal in range(5)
+    ]
+
+
+@given(
+    first=lists(sampled_from((0, 0.5, 1)), min_size=2, max_size=20),
+    shift=sampled_from((0, 0.5)),
+)
+def test_comparison(first, shift):
+    """Test the statistics of a comparison against their definitions."""
+
+    second = [score - shift for score in first]
+    comparison = Comparison(first, second)
+    n = len(first)
+
+    assert len(comparison) == n
+    assert comparison.differences() == [shift] * n
+    assert comparison.difference() == shift
+    assert comparison.paired_error() == 0
+    assert comparison.z() == (math.inf if shift else 0)
+
+    variance = sum((x - sum(first) / n) ** 2 for x in first) / (n - 1)
+    assert comparison.unpaired_error() == pytest.approx(
+        math.sqrt(2 * variance / n)
+    )
+
+
+def test_comparison_values():
+    """Test the statistics of a comparison worked out by hand."""
+
+    comparison = Comparison([1, 0, 1, 1], [0, 0, 1, 0])
+
+    assert comparison.difference() == 0.5
+    assert comparison.paired_error() == pytest.approx(math.sqrt(1 / 12))
+    assert comparison.unpaired_error() == pytest.approx(math.sqrt(1 / 8))
+    assert comparison.z() == pytest.approx(0.5 / math.sqrt(1 / 12))
+    assert comparison.efficiency() == pytest.approx(1.5)
+
+
+def test_comparison_of_one_deal():
+    """Test that a single deal has no standard error."""
+
+    comparison = Comparison([1], [0])
+
+    assert comparison.difference() == 1
+    assert math.isnan(comparison.paired_error())
+    assert math.isnan(comparison.unpaired_error())
+
+
+@settings(deadline=None, max_examples=5)
+@given(
+    pairing=sampled_from(PAIRINGS),
+    chunksize=integers(min_value=1, max_value=10),
+)
+def test_compare(pairing, chunksize):
+    """Test that a lineup compared with itself differs on no deal, and that
+    the scores come in the order of the deals."""
+
+    same = compare(LINEUP, list(LINEUP), range(12), pairing, 100, 1, chunksize)
+    assert same.differences() == [0] * 12
+    assert same.z() == 0
+
+    first = (Random,) * 5
+    comparison = compare(first, LINEUP, range(12), pairing, 100, 1, chunksize)
+    assert comparison.first == [
+        score_deal(first, deal, pairing, 100) for deal in range(12)
+    ]
+    assert comparison.second == same.first
+
+
+def test_compare_in_parallel():
+    """Test that a comparison gives the same scores across several
+    processes as it does in one."""
+
+    first = (Random,) * 5
+    serial = compare(first, LINEUP, range(30), "antithetic", 100)
+    parallel = compare(
+        first, LINEUP, range(30), "antithetic", 100, processes=2, chunksize=4
+    )
+
+    assert (parallel.first, parallel.second) == (serial.first, serial.second)
+
+
+def test_compare_errors():
+    """Test that lineups of different sizes, or an unknown pairing, are
+    refused."""
+
+    with pytest.raises(ValueError):
+        compare(LINEUP, LINEUP[:4])
+    with pytest.raises(ValueError):
+        compare(LINEUP, LINEUP, pairing="shuffled")
@@ -0,0 +1,117 @@
+"""Tests for the Deck class."""
+
+import random
+from collections import Counter
+
+import pytest
+from hypothesis import given
+from hypothesis.strategies import integers
+
+from dogma.deck import Deck, EmptyDeckError
+
+from .util import decks, seeds
+
+
+@given(cards=decks())
+def test_init(cards):
+    """Test that a deck counts its cards."""
+
+    deck = Deck(cards)
+
+    assert len(deck) == 17
+    assert deck.remaining() == cards
+    assert deck.counts == {"H": 11, "G": 6}
+    assert deck.discards == []
+    assert deck.discarded == {"H": 0, "G": 0}
+    assert isinstance(deck.random, random.Random)
+
+
+@given(cards=decks(), num=integers(min_value=0, max_value=17))
+def test_draw(cards, num):
+    """Test that drawing takes cards from the top of the deck."""
+
+    deck = Deck(cards)
+    hand = deck.draw(num)
+
+    assert hand == cards[:num]
+    assert deck.remaining() == cards[num:]
+    assert deck.counts == Counter({"H": 0, "G": 0, **Counter(cards[num:])})
+
+
+@given(cards=decks())
+def test_peek(cards):
+    """Test that peeking leaves the deck as it was."""
+
+    deck = Deck(cards)
+
+    assert deck.peek() == cards[:3]
+    assert deck.remaining() == cards
+
+
+@given(cards=decks(), seed=seeds)
+def test_discard_and_reshuffle(cards, seed):
+    """Test that discarded cards are shuffled back in when the deck runs
+    low."""
+
+    deck = Deck(cards, state=random.Random(seed))
+    deck.draw(15)
+    for card in cards[:15]:
+        deck.discard(card)
+    assert deck.discarded == dict(Counter(cards[:15]))
+
+    hand = deck.draw()
+
+    assert len(hand) == 3
+    assert len(deck) == 14
+    assert deck.discards == []
+    assert deck.discarded == {"H": 0, "G": 0}
+    assert deck.counts == {
+        card: count - Counter(hand)[card] for card, count in zip("HG", (11, 6))
+    }
+
+
+@given(cards=decks(), seed=seeds)
+def test_reshuffle_matches_list(cards, seed):
+    """Test that a reshuffle orders the cards just as shuffling the rest of the
+    deck followed by the discard pile would."""
+
+    deck = Deck(cards[:5], cards[5:], random.Random(seed))
+    deck.draw(2)
+    deck.reshuffle()
+
+    expected = cards[2:]
+    random.Random(seed).shuffle(expected)
+
+    assert deck.remaining() == expected
+
+
+@given(cards=decks())
+def test_empty_deck(cards):
+    """Test that drawing more cards than there are raises an error."""
+
+    deck = Deck(cards[:2], cards[2:3])
+
+    with pytest.raises(EmptyDeckError):
+        deck.draw(4)
+
+
+@given(cards=decks(), seed=seeds)
+def test_copy(cards, seed):
+    """Test that a copy of a deck shares its cards, and can be drawn from and
+    reshuffled without changing the original."""
+
+    deck = Deck(cards[:4], cards[4:])
+    deck.draw(2)
+    state = random.Random(seed)
+    other = deck.copy(state)
+
+    assert other.cards is deck.cards
+    assert other.random is state
+
+    other.discard(other.draw(2)[0])
+    other.draw()
+
+    assert deck.remaining() == cards[2:4]
+    assert deck.discards == cards[4:]
+    assert deck.counts == dict(Counter({"H": 0, "G": 0, **Counter(cards[2:4])}))
+    assert deck.copy().random is deck.random
@@ -0,0 +1,233 @@
+"""Tests for the vectorised environment."""
+
+import numpy as np
+import pytest
+from hypothesis import given, settings
+from hypothesis.strategies import integers
+
+from dogma import DogmaGame
+from dogma.deck import EmptyDeckError
+from dogma.env import (
+    AGREE,
+    DEAN,
+    DENOUNCE,
+    EDITOR,
+    MAX_PRESSURE,
+    NOMINATE,
+    ROLES,
+    VOTE,
+    VectorEnv,
+)
+from dogma.game import EXHAUSTED, OUTCOMES
+from dogma.strategies import Random
+
+from .util import seeds
+
+
+class Mirror:
+    """An agent who makes the decisions each player in an environment would
+    make as a `Random` player, so that the games go as they would if they
+    were played out by `DogmaGame.play`."""
+
+    def __init__(self, env):
+
+        self.env = env
+        self.pairs = {}
+
+    def act(self, index):
+        """Get the action for the decision waiting in a game."""
+
+        player, decision, options = self.env.requests[index]
+        seat_of = self.env.games[index].seat_of
+        if decision in (NOMINATE, DENOUNCE):
+            method = (
+                player.nominate if decision == NOMINATE else player.denounce
+            )
+            return seat_of(method(options))
+        if decision == VOTE:
+            return int(player.vote(options) == "yes")
+        if decision == AGREE:
+            agreed = player.agree_to_overrule()
+            if agreed:
+                del self.pairs[index]
+            return int(agreed)
+        if decision == DEAN:
+            _, reject, _ = player.choose_cards_to_submit(list(options))
+            return options.index(reject)
+
+        hand, overrule_available = options
+        pair = self.pairs.pop(index, hand)
+        kept, reject, overrule = player.choose_cards_to_submit(
+            list(pair), overrule_available
+        )
+        if overrule_available and overrule:
+            self.pairs[index] = kept + [reject]
+            return 2
+
+        return hand.index(reject)
+
+    def actions(self):
+        """Get the action for every game."""
+
+        return [self.act(index) for index in range(len(self.env.games))]
+
+
+@settings(deadline=None)
+@given(
+    seed=seeds,
+    number_of_games=integers(min_value=1, max_value=4),
+    number_of_players=integers(min_value=5, max_value=7),
+    max_turns=integers(min_value=1, max_value=100),
+)
+def test_step(seed, number_of_games, number_of_players, max_turns):
+    """Test that each game goes as it would on its own, and that its rewards
+    and outcome come out when it ends."""
+
+    env = VectorEnv(number_of_games, number_of_players, seed, max_turns)
+    observation = env.reset()
+    agent = Mirror(env)
+
+    outcomes = [None] * number_of_games
+    while None in outcomes:
+        games = list(env.games)
+        returned, rewards, dones = env.step(agent.actions())
+        assert returned is observation
+        for index in np.flatnonzero(dones):
+            game = games[index]
+            if outcomes[index] is None:
+                outcomes[index] = OUTCOMES[env.outcomes[index]]
+            if game.winner is not None:
+                won = [
+                    (player.role == "C") == (game.winner == "C")
+                    for player in game.seating.players
+                ]
+                assert list(rewards[index]) == [1 if w else -1 for w in won]
+            else:
+                assert not rewards[index].any()
+
+    for index, outcome in enumerate(outcomes):
+        players = [Random(str(seat)) for seat in range(number_of_players)]
+        game = DogmaGame(players, seed + index)
+        assert outcome == game.play(max_turns)
+
+
+@settings(deadline=None)
+@given(seed=seeds, number_of_players=integers(min_value=5, max_value=7))
+def test_observation(seed, number_of_players):
+    """Test that the observation shows what the acting seat can see."""
+
+    env = VectorEnv(2, number_of_players, seed, history=3)
+    observation = env.reset()
+    buffers = {name: array.ctypes.data for name, array in observation.items()}
+    agent = Mirror(env)
+
+    for _ in range(200):
+        for index, game in enumerate(env.games):
+            player, decision, options = env.requests[index]
+            seat = game.seat_of(player)
+            mask = observation["mask"][index]
+
+            assert observation["decision"][index] == decision
+            assert observation["seat"][index] == seat
+            assert observation["heliocentric"][index] == game.publications["H"]
+            assert observation["geocentric"][index] == game.publications["G"]
+            assert observation["pressure"][index] == min(
+                game.pressure_to_print, MAX_PRESSURE
+            )
+            assert observation["turn"][index] == game.turns
+            assert observation["dean"][index] == game.seat_of(game.dean)
+            assert list(observation["alive"][index]) == [
+                not game.seating.is_denounced(p) for p in game.seating.players
+            ]
+
+            roles = observation["roles"][index]
+            assert roles[seat] == ROLES[player.role]
+            assert (roles >= 0).sum() == (1 if player.role == "C" else 2)
+
+            if decision in (NOMINATE, DENOUNCE):
+                assert list(np.flatnonzero(mask)) == sorted(
+                    game.seat_of(option) for option in options
+                )
+            elif decision == VOTE:
+                assert observation["nominee"][index] == game.seat_of(options)
+                assert list(mask) == [True, True] + [False] * (len(mask) - 2)
+            elif decision in (DEAN, EDITOR):
+                hand = options if decision == DEAN else options[0]
+                assert observation["editor"][index] == game.seat_of(game.editor)
+                assert (observation["hand"][index] != 0).sum() == len(hand)
+                assert mask[2] == (decision == DEAN or options[1])
+
+            if decision == VOTE:
+                votes = observation["votes"][index, game.turns % 3]
+                voters = game.seating.eligible()
+                assert (votes != 0).sum() == voters.index(player)
+
+        env.step(agent.actions())
+
+    assert buffers == {
+        name: array.ctypes.data for name, array in observation.items()
+    }
+
+
+@given(pressure=integers(min_value=MAX_PRESSURE, max_value=10**4))
+def test_high_pressure(pressure):
+    """Test that a pressure to print too high for its field, which overrules
+    can build up, is shown as the most it can be."""
+
+    env = VectorEnv(1)
+    observation = env.reset()
+    env.games[0].pressure_to_print = pressure
+    env.observe(0, env.requests[0])
+
+    assert observation["pressure"][0] == MAX_PRESSURE
+
+
+def test_zero_copy():
+    """Test that the observation arrays are views of the environment's own
+    buffers."""
+
+    env = VectorEnv(3)
+    observation = env.reset()
+
+    for name, array in observation.items():
+        if name == "turn":
+            assert np.shares_memory(array, np.frombuffer(env.turns, np.int8))
+        elif name == "votes":
+            assert np.shares_memory(array, np.frombuffer(env.votes, np.int8))
+        else:
+            assert np.shares_memory(array, np.frombuffer(env.buffer, np.int8))
+
+
+@given(seed=seeds)
+def test_illegal_action(seed):
+    """Test that an action outside the mask is refused."""
+
+    env = VectorEnv(1, seed=seed)
+    observation = env.reset()
+    dean = observation["dean"][0]
+
+    with pytest.raises(ValueError):
+        env.step([dean])
+    with pytest.raises(ValueError):
+        env.step([env.number_of_actions])
+
+
+def test_exhausted(monkeypatch):
+    """Test that a game that runs out of journals is abandoned and
+    replaced."""
+
+    env = VectorEnv(1, seed=0)
+    env.reset()
+    game = env.games[0]
+
+    def exhaust(*args, **kwargs):
+        raise EmptyDeckError
+
+    monkeypatch.setattr(game, "draw_journals", exhaust)
+    agent = Mirror(env)
+    while env.games[0] is game:
+        _, rewards, dones = env.step(agent.actions())
+
+    assert dones[0]
+    assert env.outcomes[0] == EXHAUSTED
+    assert not rewards.any()
@@ -0,0 +1,74 @@
+"""Tests for the event log."""
+
+import math
+
+from hypothesis import given
+from hypothesis.strategies import integers, lists, sampled_from, tuples
+
+from dogma.events import DECK, EVENT, RUN, TURN, EventLog, pack, unpack
+
+cards = lists(sampled_from("HG"), max_size=19)
+events = lists(tuples(*(integers(min_value=0, max_value=255),) * 4))
+
+
+@given(cards=cards)
+def test_pack(cards):
+    """Test that a run of cards fits into three bytes and back."""
+
+    packed = pack(cards)
+
+    assert all(0 <= byte < 256 for byte in packed)
+    assert unpack(*packed) == cards
+
+
+@given(events=events)
+def test_record(events):
+    """Test that events are kept as four bytes each."""
+
+    log = EventLog()
+    for event in events:
+        log.record(*event)
+
+    assert len(log) == len(events)
+    assert len(bytes(log)) == EVENT.size * len(events)
+    assert list(log) == events
+    assert list(EventLog(bytes(log))) == events
+
+
+@given(cards=cards)
+def test_record_cards(cards):
+    """Test that a run of cards can be recorded as an event."""
+
+    log = EventLog()
+    log.record(TURN, 3)
+    log.record_cards(DECK, cards)
+
+    (_, seat, *_), (code, *packed) = log
+    assert seat == 3
+    assert code == DECK
+    assert unpack(*packed) == cards
+
+
+@given(cards=lists(sampled_from("HG"), max_size=100))
+def test_record_long_run(cards):
+    """Test that a run of cards too long for one event is split across as
+    many as it takes."""
+
+    log = EventLog()
+    log.record_cards(DECK, cards)
+
+    events = list(log)
+    assert len(events) == max(1, math.ceil(len(cards) / RUN))
+    assert all(code == DECK for code, *_ in events)
+    assert sum((unpack(*packed) for _, *packed in events), []) == cards
+
+
+@given(events=events, index=integers(min_value=0, max_value=10))
+def test_since(events, index):
+    """Test that the events from a given point on can be read back."""
+
+    log = EventLog()
+    for event in events:
+        log.record(*event)
+
+    assert list(log.since(index)) == events[index:]
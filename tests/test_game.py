@@ -1,13 +1,18 @@
-""" Tests for the DogmaGame class. """
+"""Tests for the DogmaGame class."""
 
+import random
 from collections import Counter
 
 from hypothesis import assume, given
-from hypothesis.strategies import booleans, integers
+from hypothesis.strategies import booleans, integers, lists
 
 from dogma import DogmaGame
+from dogma.deck import EmptyDeckError
+from dogma.events import EventLog
+from dogma.game import EXHAUSTED, OUTCOMES, STANDARD, Rules, spawn
+from dogma.strategies import Random
 
-from .util import games, players, seeds
+from .util import games, playergroups, players, seeds
 
 
 @given(players_=players(), seed=seeds)
@@ -38,6 +43,103 @@ def test_init(players_, seed):
     assert game.ex_editor is None
 
 
+@given(
+    players_=playergroups(),
+    seed=seeds,
+    helio=integers(min_value=0, max_value=20),
+    geo=integers(min_value=0, max_value=20),
+)
+def test_init_with_rules(players_, seed, helio, geo):
+    """Test that a game deals its deck by its rules, and that the standard
+    rules deal the same deck as ever."""
+
+    rules = Rules(journals_h=helio, journals_g=geo)
+    game = DogmaGame(players_, seed, rules=rules)
+
+    assert game.rules == rules
+    assert Counter(game.journal_cards) == Counter({"H": helio, "G": geo})
+    assert DogmaGame(players_, seed, rules=STANDARD).journal_cards == (
+        DogmaGame(players_, seed).journal_cards
+    )
+
+
+@given(
+    group=playergroups(),
+    seed=seeds,
+    player_seeds=lists(seeds, min_size=2, max_size=2),
+)
+def test_player_seed(group, seed, player_seeds):
+    """Test that the players' luck can be seeded apart from the deal, which
+    stays the same."""
+
+    deals = []
+    for player_seed in player_seeds:
+        game = DogmaGame(group, seed, player_seed=player_seed)
+        game.assign_roles()
+        game.start_turn()
+        luck = [player.random.random() for player in group]
+        roles = [player.role for player in group]
+        deals.append((game.journal_cards, roles, game.dean, luck))
+
+    (cards, roles, dean, luck), (*deal, other) = deals
+    assert [cards, roles, dean] == deal
+    assert (luck == other) is (player_seeds[0] == player_seeds[1])
+
+
+@given(seed=seeds)
+def test_spawn(seed):
+    """Test that a child random state is reproducible from its parent, and
+    independent of it thereafter."""
+
+    parent = random.Random(seed)
+    child = spawn(parent)
+    again = spawn(random.Random(seed))
+
+    assert child.getstate() == again.getstate()
+    assert child.getstate() != parent.getstate()
+
+
+@given(group=playergroups(), seed=seeds)
+def test_seat_players(group, seed):
+    """Test that each player is given their own reproducible random state."""
+
+    game = DogmaGame(group, seed)
+    game.seat_players()
+    states = [player.random.getstate() for player in group]
+
+    assert len(set(states)) == len(group)
+    assert game.random.getstate() not in states
+    assert all(player.game is game for player in group)
+
+    DogmaGame(group, seed).seat_players()
+    assert [player.random.getstate() for player in group] == states
+
+
+@given(first=playergroups(), second=playergroups(), seed=seeds)
+def test_interleaved_games(first, second, seed):
+    """Test that games with their own seeds give the same results whether they
+    are played one after the other or with their turns interleaved."""
+
+    def new_games():
+        return [
+            DogmaGame([type(p)(p.name) for p in group], seed + i)
+            for i, group in enumerate((first, second))
+        ]
+
+    expected = [game.play() for game in new_games()]
+
+    games_ = new_games()
+    for game in games_:
+        game.assign_roles()
+        game.inform_mavericks()
+
+    ongoing = list(games_)
+    while ongoing:
+        ongoing = [game for game in ongoing if not game.turn()]
+
+    assert [(game.winner, game.message) for game in games_] == expected
+
+
 @given(game=games())
 def test_shuffle_roles(game):
     """Test that a game instance can shuffle its role cards."""
@@ -159,6 +261,83 @@ def test_cast_vote(game):
         assert game.pressure_to_print == 1
 
 
+@given(game=games(), votes=lists(booleans(), min_size=6, max_size=6))
+def test_cast_vote_with_votes(game, votes):
+    """Test that votes collected beforehand are counted as given."""
+
+    votes = ["yes" if vote else "no" for vote in votes[: len(game.players)]]
+    ayes = votes.count("yes")
+    result = game.cast_vote(game.players[0], votes)
+
+    assert result is (ayes > len(votes) - ayes)
+    assert game.pressure_to_print == (not result)
+
+
+class BatchedRandom(Random):
+    """A random player who votes in batches."""
+
+    @classmethod
+    def vote_batch(cls, players, nominees):
+
+        return [
+            player.vote(nominee) for player, nominee in zip(players, nominees)
+        ]
+
+
+@given(seed=seeds, batched=lists(booleans(), min_size=5, max_size=6))
+def test_batched_votes(seed, batched):
+    """Test that a game goes the same way, and is logged the same way, when
+    some of its players vote in batches."""
+
+    logs = EventLog(), EventLog()
+    plain = DogmaGame(
+        [Random(str(i)) for i in range(len(batched))], seed, logs[0]
+    )
+    mixed = DogmaGame(
+        [
+            BatchedRandom(str(i)) if is_batched else Random(str(i))
+            for i, is_batched in enumerate(batched)
+        ],
+        seed,
+        logs[1],
+    )
+
+    assert mixed.play(100) == plain.play(100)
+
+    assert mixed.batched is any(batched)
+    assert bytes(logs[0]) == bytes(logs[1])
+
+
+@given(seed=seeds, batched=lists(booleans(), min_size=5, max_size=6))
+def test_turn_steps(seed, batched):
+    """Test that a game goes the same way, and is logged the same way, when
+    its turns are played out from their steps."""
+
+    logs = EventLog(), EventLog()
+    plain, stepped = (
+        DogmaGame(
+            [
+                BatchedRandom(str(i)) if is_batched else Random(str(i))
+                for i, is_batched in enumerate(batched)
+            ],
+            seed,
+            log,
+        )
+        for log in logs
+    )
+    for game in (plain, stepped):
+        game.assign_roles()
+        game.inform_mavericks()
+
+    over = False
+    while not over and plain.turns < 100:
+        over = plain.turn()
+        assert stepped.run(stepped.turn_steps()) is over
+        assert stepped.snapshot() == plain.snapshot()
+
+    assert bytes(logs[0]) == bytes(logs[1])
+
+
 @given(game=games())
 def test_draw_journals(game):
     """Test that a game instance can draw a hand from the top of the deck, and
@@ -222,6 +401,31 @@ def test_form_publication_with_overrule(game):
         assert game.ex_editor is None
 
 
+@given(game=games())
+def test_edit_publication(game):
+    """Test that the editor of a game instance publishes one of the dean's
+    cards when there is no overrule to suggest."""
+
+    game.dean, game.editor = game.players[:2]
+    assert game.edit_publication(["H", "G"], False)
+    assert len(game.discard_pile) == 1
+    assert sum(game.publications.values()) == 1
+    assert game.ex_editor is game.editor
+
+
+@given(game=games(), agreed=booleans())
+def test_settle_overrule(game, agreed):
+    """Test that an overrule the dean agrees to publishes nothing, and that
+    the editor has to publish one of their cards otherwise."""
+
+    game.dean, game.editor = game.players[:2]
+    game.dean.agree_to_overrule = lambda: agreed
+
+    assert game.settle_overrule(["H"], "G") is not agreed
+    assert sum(game.publications.values()) == (not agreed)
+    assert game.pressure_to_print == agreed
+
+
 @given(game=games())
 def test_emergency_publication(game):
     """Test that a game instance can publish an emergency journal and reset
@@ -351,6 +555,58 @@ def test_journal_count_win(game, heliocentrics, geocentrics):
         assert game.message is None
 
 
+@given(game=games(), heliocentrics=integers(min_value=0, max_value=8))
+def test_emergency_actions_by_rules(game, heliocentrics):
+    """Test that the emergency powers are given when the rules say so."""
+
+    game.rules = Rules(peek=(1, 2), denounce=(7,), overrule=(2, 3))
+    game.assign_roles()
+    game.dean = game.players[0]
+    game.publications["H"] = heliocentrics
+    game.perform_emergency_actions()
+
+    assert bool(game.dean.seen) is (heliocentrics in (1, 2))
+    assert any(p.denounced for p in game.players) is (heliocentrics == 7)
+    assert game.overrule_available is (heliocentrics in (2, 3))
+
+
+@given(
+    game=games(),
+    heliocentrics=integers(min_value=0, max_value=8),
+    geocentrics=integers(min_value=0, max_value=8),
+)
+def test_wins_by_rules(game, heliocentrics, geocentrics):
+    """Test that the journals needed to win are taken from the rules."""
+
+    game.rules = Rules(win_h=7, win_g=3, rhetoric=5)
+    game.assign_roles()
+    game.editor = game.galileo
+    game.publications = {"H": heliocentrics, "G": geocentrics}
+
+    assert game.galileo_editor_win() is (heliocentrics >= 5)
+
+    game.winner = game.message = None
+    altered, quelled = heliocentrics >= 7, geocentrics >= 3
+    assert game.journal_count_win() is (altered or quelled)
+    if altered:
+        assert game.winner == "M"
+    elif quelled:
+        assert game.winner == "C"
+
+
+@given(game=games())
+def test_pressure_by_rules(game):
+    """Test that an emergency publication is forced at the pressure the rules
+    set."""
+
+    game.rules = Rules(pressure=1)
+    game.pressure_to_print = 1
+    game.finish_turn(False)
+
+    assert sum(game.publications.values()) == 1
+    assert game.pressure_to_print == 0
+
+
 @given(game=games(), denounced=booleans())
 def test_galileo_denounced_win(game, denounced):
     """Test that a game instance concludes with a conformist win if Galileo is
@@ -396,10 +652,8 @@ def test_turn(game):
 def test_play(game):
     """Test that a game instance can complete an entire game."""
 
-    try:
-        winner, message = game.play()
-    except RecursionError:
-        assume(False)
+    winner, message = game.play()
+    assume(message != OUTCOMES[EXHAUSTED][1])
 
     assert winner in ("C", "M")
     assert isinstance(message, str)
@@ -422,3 +676,105 @@ def test_play(game):
         assert winner == "C"
         assert game.publications["G"] == 5
         assert game.publications["H"] < 6
+
+
+@given(game=games())
+def test_play_exhausted(game):
+    """Test that a game ends with no winner if the deck runs out of
+    journals."""
+
+    def exhaust(num=3):
+        raise EmptyDeckError
+
+    game.draw_journals = exhaust
+
+    assert game.play() == OUTCOMES[EXHAUSTED]
+
+
+@given(game=games(), max_turns=integers(min_value=0, max_value=5))
+def test_play_turn_limit(game, max_turns):
+    """Test that a game is abandoned if it runs out of turns."""
+
+    winner, message = game.play(max_turns)
+    assume(message != OUTCOMES[EXHAUSTED][1])
+
+    assert game.turns <= max_turns
+    if winner is None:
+        assert game.turns == max_turns
+        assert "without a verdict" in message
+
+
+def play_turns(game, turns):
+    """Play up to a number of turns of a game, stopping if it finishes."""
+
+    for _ in range(turns):
+        if game.turn():
+            break
+
+
+@given(game=games(), turns=integers(min_value=0, max_value=10))
+def test_snapshot_and_restore(game, turns):
+    """Test that a game can be put back into the state of a snapshot."""
+
+    game.assign_roles()
+    game.inform_mavericks()
+    play_turns(game, turns)
+    snapshot = game.snapshot()
+
+    assert snapshot.turns == game.turns
+    assert list(snapshot.journal_cards) == game.journal_cards
+    assert snapshot.roles == tuple(player.role for player in game.players)
+
+    play_turns(game, 5)
+    game.restore(snapshot)
+
+    assert game.snapshot() == snapshot
+    assert game.galileo.role == "G"
+    assert game.maverick.role == "M"
+
+
+@given(game=games(), seed=seeds, turns=integers(min_value=0, max_value=10))
+def test_restore_into_another_game(game, seed, turns):
+    """Test that a snapshot can be restored into a game with other players."""
+
+    game.assign_roles()
+    play_turns(game, turns)
+    snapshot = game.snapshot()
+
+    other = DogmaGame([Random(p.name) for p in game.players], seed)
+    other.restore(snapshot)
+
+    assert other.snapshot() == snapshot
+    assert [p.denounced for p in other.players] == [
+        p.denounced for p in game.players
+    ]
+
+
+@given(game=games(), turns=integers(min_value=0, max_value=10))
+def test_clone(game, turns):
+    """Test that a clone starts in the same state as its game, and that
+    playing it on leaves the game alone."""
+
+    game.assign_roles()
+    game.inform_mavericks()
+    play_turns(game, turns)
+    snapshot = game.snapshot()
+
+    clone = game.clone()
+    assert clone.snapshot() == snapshot
+    assert clone.players is game.players
+
+    play_turns(clone, 10)
+    assert game.snapshot() == snapshot
+
+
+@given(game=games(), seed=seeds)
+def test_clone_with_state(game, seed):
+    """Test that a clone can be given its own random state."""
+
+    state = random.Random(seed)
+    clone = game.clone(state)
+
+    assert clone.random is state
+    assert clone.deck.random is state
+    assert clone.journal_cards == game.journal_cards
@@ -0,0 +1,275 @@
+"""Tests for the role inference engine."""
+
+import pytest
+from hypothesis import given, settings
+from hypothesis.strategies import booleans, integers, sampled_from
+
+from dogma import DogmaGame
+from dogma.events import (
+    DENOUNCE,
+    NOMINATE,
+    OVERRULE,
+    PUBLISH,
+    TURN,
+    VOTE,
+    EventLog,
+)
+from dogma.game import STANDARD, Rules
+from dogma.inference import Model, RoleBelief, publication_odds
+
+from .util import playergroups, seeds
+
+sizes = integers(min_value=5, max_value=10)
+
+
+def test_publication_odds():
+    """Test that the odds of a heliocentric journal rise with the number of
+    mavericks on the print team."""
+
+    (conformists, conformist_dean), (maverick_dean, mavericks) = (
+        publication_odds()
+    )
+
+    assert conformists == pytest.approx(165 / 680)
+    assert conformist_dean == maverick_dean == pytest.approx(495 / 680)
+    assert mavericks == pytest.approx(660 / 680)
+
+
+@given(number_of_players=sizes)
+def test_init(number_of_players):
+    """Test that an onlooker starts with every deal equally likely."""
+
+    belief = RoleBelief(number_of_players)
+
+    assert len(belief.hypotheses) == number_of_players * (number_of_players - 1)
+    assert belief.galileo() == pytest.approx(
+        [1 / number_of_players] * number_of_players
+    )
+    assert belief.galileo() == pytest.approx(belief.maverick())
+    assert sum(belief.suspicion()) == pytest.approx(2)
+
+
+@given(number_of_players=sizes, seat=integers(min_value=0, max_value=4))
+def test_init_from_a_seat(number_of_players, seat):
+    """Test that a conformist rules themselves out from the start."""
+
+    belief = RoleBelief(number_of_players, seat)
+    suspicion = belief.suspicion()
+
+    assert suspicion[seat] == 0
+    assert sum(suspicion) == pytest.approx(2)
+    assert suspicion[seat - 1] == pytest.approx(2 / (number_of_players - 1))
+
+
+def test_contradiction():
+    """Test that evidence ruling out every deal is refused."""
+
+    belief = RoleBelief(5)
+    for seat in range(1, 5):
+        belief.not_galileo(seat)
+
+    assert belief.galileo() == pytest.approx([1, 0, 0, 0, 0])
+    with pytest.raises(ValueError):
+        belief.not_galileo(0)
+
+
+@given(number_of_players=sizes, seat=integers(min_value=1, max_value=4))
+def test_nominated(number_of_players, seat):
+    """Test that being picked out by a dean time after time casts suspicion
+    on both of them, and that seats may be given as a bitmask or a list."""
+
+    belief = RoleBelief(number_of_players)
+    other = RoleBelief(number_of_players)
+    options = [s for s in range(number_of_players) if s]
+    for _ in range(5):
+        belief.nominated(0, seat, options)
+        other.nominated(0, seat, sum(1 << s for s in options))
+
+    suspicion = belief.suspicion()
+
+    assert belief.weights == pytest.approx(other.weights)
+    assert suspicion[seat] == max(suspicion)
+    assert suspicion[0] > suspicion[seat - 1 or 4]
+
+
+@given(number_of_players=sizes, seat=integers(min_value=1, max_value=4))
+def test_denounced(number_of_players, seat):
+    """Test that a player denounced by the dean looks less like the dean's
+    partner."""
+
+    belief = RoleBelief(number_of_players)
+    belief.denounced(0, seat)
+
+    assert belief.maverick()[seat] < 1 / number_of_players
+
+
+@given(number_of_players=sizes)
+def test_voted(number_of_players):
+    """Test that a print team who are the only ones to vote for themselves,
+    time after time, look like the mavericks."""
+
+    belief = RoleBelief(number_of_players)
+    voters = (1 << number_of_players) - 1
+    for _ in range(5):
+        belief.voted(0, 1, 0b11, voters)
+
+    suspicion = belief.suspicion()
+
+    assert suspicion[0] == suspicion[1] == max(suspicion)
+    assert sum(suspicion) == pytest.approx(2)
+
+
+@given(card=sampled_from("HG"))
+def test_published(card):
+    """Test that publishing heliocentric journals draws suspicion on to the
+    print team, and geocentric ones draw it away."""
+
+    belief = RoleBelief(5)
+    belief.published(0, 1, card)
+    suspicion = belief.suspicion()
+
+    if card == "H":
+        assert suspicion[0] > suspicion[2]
+    else:
+        assert suspicion[0] < suspicion[2]
+    assert suspicion[0] == pytest.approx(suspicion[1])
+
+
+@given(agreed=booleans())
+def test_overruled(agreed):
+    """Test that refusing an overrule looks like the work of a maverick."""
+
+    belief = RoleBelief(5)
+    belief.overruled(0, 1, agreed)
+    suspicion = belief.suspicion()
+
+    if agreed:
+        assert suspicion[0] < suspicion[2]
+    else:
+        assert suspicion[0] > suspicion[2]
+
+
+def test_noise():
+    """Test that without noise, a model can rule out a deal outright."""
+
+    model = Model(vote=((0, 0, 0), (1, 1, 1)), noise=0)
+    belief = RoleBelief(5, model=model)
+    belief.voted(0, 1, 0b00011, 0b11111)
+
+    assert belief.suspicion() == pytest.approx([1, 1, 0, 0, 0])
+
+
+def play_logged(players, seed, rules=STANDARD):
+    """Play a game, keeping its log."""
+
+    log = EventLog()
+    game = DogmaGame(players, seed, log, rules=rules)
+    game.play(max_turns=1000)
+
+    return game, log
+
+
+@settings(deadline=None)
+@given(players=playergroups(), seed=seeds)
+def test_observe_a_game(players, seed):
+    """Test that following a game never rules out the true deal, and that
+    catching up on a log goes the same as observing each event."""
+
+    game, log = play_logged(players, seed)
+    galileo, maverick = game.seat_of(game.galileo), game.seat_of(game.maverick)
+    seat = next(s for s in range(len(players)) if s not in (galileo, maverick))
+
+    belief = RoleBelief(len(players), seat).catch_up(log)
+    other = RoleBelief(len(players), seat)
+    for event in log:
+        other.observe(*event)
+
+    truth = belief.hypotheses.index((galileo, maverick))
+
+    assert belief.weights[truth] > 0
+    assert sum(belief.weights) == pytest.approx(1)
+    assert belief.weights == pytest.approx(other.weights)
+    assert belief.position == len(log)
+    assert belief.catch_up(log).weights == pytest.approx(other.weights)
+
+
+@settings(deadline=None)
+@given(
+    players=playergroups(),
+    seed=seeds,
+    rhetoric=integers(min_value=1, max_value=6),
+    journals_h=integers(min_value=9, max_value=13),
+)
+def test_observe_a_game_by_other_rules(players, seed, rhetoric, journals_h):
+    """Test that following a game played by other rules never rules out the
+    true deal, so long as the belief knows the rules."""
+
+    rules = Rules(journals_h=journals_h, rhetoric=rhetoric)
+    game, log = play_logged(players, seed, rules)
+    galileo, maverick = game.seat_of(game.galileo), game.seat_of(game.maverick)
+
+    belief = RoleBelief(len(players), rules=rules).catch_up(log)
+    truth = belief.hypotheses.index((galileo, maverick))
+
+    assert belief.model.publish == publication_odds(journals_h, 6)
+    assert belief.weights[truth] > 0
+
+
+@settings(deadline=None)
+@given(players=playergroups(), seed=seeds)
+def test_catch_up_during_a_game(players, seed):
+    """Test that a player can catch up on their game before each decision."""
+
+    game = DogmaGame(players, seed, EventLog())
+    player = players[0]
+    player.belief = RoleBelief(len(players))
+    nominate = player.nominate
+    beliefs = []
+
+    def sleuth(options):
+        beliefs.append(player.belief.catch_up(game.log).suspicion())
+        return nominate(options)
+
+    player.nominate = sleuth
+    game.play(max_turns=50)
+
+    assert all(sum(belief) == pytest.approx(2) for belief in beliefs)
+    assert player.belief.position <= len(game.log)
+
+
+def test_observe():
+    """Test that the belief follows the public state of a game through its
+    events, and takes a player who did not end the game for not Galileo."""
+
+    belief = RoleBelief(6)
+    everyone = 0b111111
+    for dean, nominee in ((0, 1), (1, 2), (2, 3)):
+        belief.observe(TURN, dean)
+        belief.observe(NOMINATE, nominee)
+        belief.observe(VOTE, everyone, everyone)
+        belief.observe(PUBLISH, 1)
+
+    assert (belief.ex_dean, belief.ex_editor) == (2, 3)
+    assert belief.nomination_options() == 0b110011
+
+    belief.observe(TURN, 3)
+    belief.observe(NOMINATE, 4)
+    belief.observe(VOTE, 0, everyone)
+    assert belief.unless_the_game_ends is None
+
+    belief.observe(TURN, 4)
+    belief.observe(NOMINATE, 5)
+    belief.observe(VOTE, everyone, everyone)
+    assert belief.unless_the_game_ends == 5
+
+    belief.observe(OVERRULE, 0)
+    assert belief.galileo()[5] == 0
+
+    belief.observe(PUBLISH, 1, 1)
+    belief.observe(DENOUNCE, 0)
+    belief.observe(TURN, 5)
+
+    assert belief.alive == 0b111110
+    assert belief.galileo()[0] == 0
+    assert belief.helio == 4
+    assert sum(belief.suspicion()) == pytest.approx(2)
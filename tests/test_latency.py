@@ -0,0 +1,201 @@
+"""Tests for tracking and limiting the time taken over decisions."""
+
+import json
+import time
+
+from hypothesis import given, settings
+from hypothesis.strategies import booleans, integers
+
+import dogma.latency
+from dogma.latency import (
+    DECISIONS,
+    DEFAULTS,
+    LatencyTracker,
+    track_chunk,
+    track_games,
+)
+from dogma.strategies import Random, all_strategies
+from dogma.tournament import play_game
+
+from .util import playergroups, seeds
+
+
+class Dawdler(Random):
+    """A player who takes too long over everything, and meddles with their
+    cards before they run out of time."""
+
+    def dawdle(self):
+
+        time.sleep(1)
+
+    def nominate(self, players):
+
+        self.dawdle()
+        return super().nominate(players)
+
+    def vote(self, nominee):
+
+        self.dawdle()
+        return super().vote(nominee)
+
+    def choose_cards_to_submit(self, choices, overrule_available=False):
+
+        choices.clear()
+        self.dawdle()
+
+    def agree_to_overrule(self):
+
+        self.dawdle()
+        return True
+
+    def denounce(self, players):
+
+        self.dawdle()
+        return super().denounce(players)
+
+
+@given(players=playergroups(), overrule_available=booleans())
+def test_defaults(players, overrule_available):
+    """Test that every default is a legal action."""
+
+    choices = ["H", "G", "H"]
+    kept, reject, overrule = DEFAULTS["choose_cards_to_submit"](
+        choices, overrule_available
+    )
+
+    assert DEFAULTS["nominate"](players) in players
+    assert DEFAULTS["vote"](players[0]) in ("yes", "no")
+    assert kept == ["H", "G"] and reject == "H" and overrule is False
+    assert DEFAULTS["agree_to_overrule"]() is False
+    assert DEFAULTS["denounce"](players) in players
+
+
+@given(
+    number_of_players=integers(min_value=5, max_value=6),
+    seed=seeds,
+)
+def test_tracked_game(number_of_players, seed):
+    """Test that tracking decisions changes nothing about how a game goes,
+    and that every decision is timed."""
+
+    tracker = LatencyTracker(time_limit=60)
+    result = play_game(
+        all_strategies, number_of_players, seed, 100, None, tracker
+    )
+
+    assert result == play_game(all_strategies, number_of_players, seed, 100)
+    assert {key[1] for key in tracker.histograms} == set(DECISIONS)
+    assert tracker.histograms["Random", "vote"].count >= number_of_players
+    assert not tracker.timeouts
+
+
+def test_nested_decision():
+    """Test that a decision made inside another is only timed as part of the
+    outer one."""
+
+    player = Random("0")
+    tracker = LatencyTracker()
+    tracker.attach(player)
+    player.choose_cards_to_submit(["H", "G"], True)
+
+    assert tracker.histograms["Random", "choose_cards_to_submit"].count == 1
+    assert tracker.histograms["Random", "agree_to_overrule"].count == 0
+
+    tracker.detach(player)
+    player.agree_to_overrule()
+
+    assert tracker.histograms["Random", "agree_to_overrule"].count == 0
+
+
+def check_timeouts(interrupt, monkeypatch):
+    """Check that a slow player falls back on the defaults."""
+
+    monkeypatch.setattr(dogma.latency, "can_interrupt", lambda: interrupt)
+    monkeypatch.setattr(Dawdler, "dawdle", lambda self: time.sleep(0.02))
+    player = Dawdler("0")
+    tracker = LatencyTracker(time_limit=0.001)
+    tracker.attach(player)
+    players = [Random("1"), Random("2")]
+    choices = ["G", "H", "H"]
+
+    assert player.nominate(players) is players[0]
+    assert player.vote(players[0]) == "no"
+    assert player.choose_cards_to_submit(choices, True) == (
+        ["G", "H"],
+        "H",
+        False,
+    )
+    assert choices == ["G", "H"]
+    assert player.agree_to_overrule() is False
+    assert player.denounce(players) is players[0]
+    assert sum(tracker.timeouts.values()) == len(DECISIONS)
+
+
+def test_timeouts_interrupted(monkeypatch):
+    """Test that a slow decision is cut short and replaced by a default."""
+
+    start = time.perf_counter()
+    check_timeouts(True, monkeypatch)
+
+    assert time.perf_counter() - start < 0.1
+
+
+def test_timeouts_not_interrupted(monkeypatch):
+    """Test that a slow decision that cannot be interrupted has its answer
+    replaced by a default."""
+
+    check_timeouts(False, monkeypatch)
+
+
+def test_timeouts_in_a_game():
+    """Test that a game of slow players still finishes with the defaults."""
+
+    tracker = LatencyTracker(time_limit=0.001)
+    result = play_game([Dawdler], 5, 0, 20, tracker=tracker)
+
+    assert result[1] is not None
+    assert tracker.timeouts["Dawdler", "vote"] > 0
+
+
+@settings(deadline=None, max_examples=5)
+@given(seed=seeds)
+def test_track_games(seed):
+    """Test that tracking a batch of games in one or more processes gives
+    the same counts, and can be exported as JSON."""
+
+    seeds_ = range(seed, seed + 8)
+    serial = track_games(None, (5, 6), seeds_, 100, chunksize=3)
+    parallel = track_games(None, (5, 6), seeds_, 100, None, 2, 3)
+    exported = serial.export()
+
+    assert {
+        key: histogram.count for key, histogram in serial.histograms.items()
+    } == {
+        key: histogram.count for key, histogram in parallel.histograms.items()
+    }
+    assert json.loads(json.dumps(exported)) == exported
+    assert set(exported["Random"]) == set(DECISIONS)
+    assert exported["Random"]["vote"]["timeouts"] == 0
+
+
+@given(seed=seeds)
+def test_track_chunk(seed):
+    """Test that every decision in a chunk is tracked."""
+
+    tracker = track_chunk((all_strategies, 5, [seed], 100))
+
+    assert tracker.histograms["Random", "nominate"].count <= 100
+
+
+def test_quick_decision_not_interrupted(monkeypatch):
+    """Test that a decision within the time limit keeps its answer when it
+    cannot be interrupted."""
+
+    monkeypatch.setattr(dogma.latency, "can_interrupt", lambda: False)
+    player = Random("0")
+    tracker = LatencyTracker(time_limit=60)
+    tracker.attach(player)
+    players = [Random("1"), Random("2")]
+
+    assert player.denounce(players) in players
+    assert not tracker.timeouts
@@ -0,0 +1,84 @@
+"""Tests for the load test of the game server."""
+
+import asyncio
+import random
+
+import pytest
+from hypothesis import given
+from hypothesis.strategies import booleans, sampled_from
+
+from dogma.latency import DECISIONS
+from dogma.loadtest import load_test, main, random_answer, report
+from dogma.server import Server
+
+from .util import seeds
+
+
+@given(seed=seeds, decision=sampled_from(DECISIONS), available=booleans())
+def test_random_answer(seed, decision, available):
+    """Test that every random answer is legal."""
+
+    message = {
+        "decision": decision,
+        "options": [1, 3, 4],
+        "cards": ["H", "G"],
+        "overrule_available": available,
+    }
+    answer = random_answer(random.Random(seed), message)
+
+    if decision in ("nominate", "denounce"):
+        assert answer in message["options"]
+    elif decision == "vote":
+        assert answer in ("yes", "no")
+    elif decision == "agree_to_overrule":
+        assert answer in (True, False)
+    else:
+        assert answer["reject"] in message["cards"]
+        assert available or not answer["overrule"]
+
+
+def test_load_test():
+    """Test that a load test plays every game and reports on it."""
+
+    results = asyncio.run(load_test(clients=10, players=5, games=2))
+
+    assert results["games"] == 4
+    assert results["decisions"] > 0
+    assert results["games_per_second"] > 0
+    assert set(results["latency"]) == set(DECISIONS)
+    assert "games/s" in report(results)
+    assert results["latency"]["vote"]["count"] > 0
+
+
+def test_load_test_running_server():
+    """Test that a load test can be run against a server that is already
+    running, counting only its own games."""
+
+    async def run():
+
+        server = await Server().start()
+        first = await load_test(5, 5, 1, server.address)
+        second = await load_test(6, 6, 1, server.address)
+        await server.close()
+
+        return first, second
+
+    first, second = asyncio.run(run())
+
+    assert first["games"] == second["games"] == 1
+
+
+def test_load_test_uneven():
+    """Test that a load test must fill every table."""
+
+    with pytest.raises(ValueError):
+        asyncio.run(load_test(clients=7, players=5))
+
+
+def test_main(capsys):
+    """Test that a load test can be run from the command line."""
+
+    results = main(["--clients", "5", "--json"])
+
+    assert results["games"] == 1
+    assert '"games_per_second"' in capsys.readouterr().out
@@ -0,0 +1,86 @@
+"""Tests for playing games in step with one another."""
+
+from hypothesis import given, settings
+from hypothesis.strategies import integers, lists
+
+from dogma import DogmaGame
+from dogma.deck import EmptyDeckError
+from dogma.game import OUTCOMES
+from dogma.lockstep import play_games_in_lockstep, play_in_lockstep
+from dogma.strategies import Random, all_strategies
+from dogma.tournament import play_game
+
+from .util import seeds
+
+
+class Counted(Random):
+    """A random player who counts the batches they are asked to answer."""
+
+    batches = []
+
+    @classmethod
+    def nominate_batch(cls, players, options):
+
+        cls.batches.append(("nominate", len(players)))
+        return super().nominate_batch(players, options)
+
+    @classmethod
+    def vote_batch(cls, players, nominees):
+
+        cls.batches.append(("vote", len(players)))
+        return super().vote_batch(players, nominees)
+
+
+@settings(deadline=None)
+@given(
+    number_of_players=integers(min_value=5, max_value=6),
+    seeds_=lists(seeds, min_size=1, max_size=8),
+    max_turns=integers(min_value=1, max_value=100),
+)
+def test_play_games_in_lockstep(number_of_players, seeds_, max_turns):
+    """Test that games played in lockstep end just as they would on their
+    own."""
+
+    results = play_games_in_lockstep(
+        all_strategies, number_of_players, seeds_, max_turns
+    )
+
+    assert results == [
+        play_game(all_strategies, number_of_players, seed, max_turns)
+        for seed in seeds_
+    ]
+
+
+@given(seeds_=lists(seeds, min_size=1, max_size=8, unique=True))
+def test_one_call_per_decision_point(seeds_):
+    """Test that each strategy is asked once for all the nominations, and
+    once for all the votes, on each turn."""
+
+    Counted.batches = []
+    results = play_games_in_lockstep([Counted], 5, seeds_, 10)
+
+    assert results == [play_game([Random], 5, seed, 10) for seed in seeds_]
+    assert Counted.batches[:2] == [
+        ("nominate", len(seeds_)),
+        ("vote", 5 * len(seeds_)),
+    ]
+    assert len(Counted.batches) <= 20
+    assert [kind for kind, _ in Counted.batches[::2]] == ["nominate"] * (
+        len(Counted.batches) // 2
+    )
+
+
+def test_exhausted_deck(monkeypatch):
+    """Test that a game that runs out of journal cards is abandoned while the
+    others carry on."""
+
+    games = [DogmaGame([Random(str(i)) for i in range(5)], s) for s in (0, 1)]
+
+    def exhaust(*args, **kwargs):
+        raise EmptyDeckError
+
+    monkeypatch.setattr(games[0], "draw_journals", exhaust)
+    results = play_in_lockstep(games, 100)
+
+    assert results[0] == OUTCOMES[-1]
+    assert results[1] == play_game([Random], 5, 1, 100)
@@ -1,9 +1,13 @@
 """Tests for the player classes."""
 
+import random
+
+import pytest
 from hypothesis import given
-from hypothesis.strategies import text
+from hypothesis.strategies import booleans, lists, text
 
 from dogma import Player
+from dogma.player import answers_in_batches, ask_in_batches
 
 
 @given(name=text())
@@ -16,7 +20,20 @@ def test_base_init(name):
     assert player.role is None
     assert player.partner is None
     assert player.seen is None
+    assert player.game is None
+    assert player.seating is None
     assert player.denounced is False
+    assert "random" not in vars(player)
+    assert isinstance(player.random, random.Random)
+    assert player.random is player.random
+
+
+def test_missing_attribute():
+    """Test that a player without an attribute other than their random state
+    says so."""
+
+    with pytest.raises(AttributeError):
+        Player("0").strategy
 
 
 @given(name=text())
@@ -27,3 +44,68 @@ def test_base_repr(name):
     representation = str(player)
 
     assert representation == f"Player({name}, None, False)"
+
+
+class Tabled(Player):
+    """A player who looks their answers up in a table for a whole batch at
+    once, and counts the batches."""
+
+    batches = []
+
+    @classmethod
+    def nominate_batch(cls, players, options):
+
+        cls.batches.append(("nominate", len(players)))
+        return [players_[-1] for players_ in options]
+
+    @classmethod
+    def vote_batch(cls, players, nominees):
+
+        cls.batches.append(("vote", len(players)))
+        return ["yes"] * len(players)
+
+
+class Answerer(Player):
+    """A player who answers one decision at a time."""
+
+    def nominate(self, players):
+
+        return players[0]
+
+    def vote(self, nominee):
+
+        return "no"
+
+
+def test_answers_in_batches():
+    """Test that only strategies with their own batch decisions are said to
+    answer in batches."""
+
+    assert answers_in_batches(Tabled, "vote")
+    assert answers_in_batches(Tabled, "nominate")
+    assert not answers_in_batches(Answerer, "vote")
+    assert not answers_in_batches(Player, "nominate")
+
+
+@given(tabled=lists(booleans(), min_size=1, max_size=12))
+def test_ask_in_batches(tabled):
+    """Test that each strategy is asked once for the whole batch, and that
+    the answers come back in order."""
+
+    Tabled.batches = []
+    players = [
+        Tabled(str(i)) if is_tabled else Answerer(str(i))
+        for i, is_tabled in enumerate(tabled)
+    ]
+    votes = ask_in_batches("vote", players, players)
+    nominations = ask_in_batches("nominate", players, [players] * len(players))
+
+    assert votes == ["yes" if is_tabled else "no" for is_tabled in tabled]
+    assert nominations == [
+        players[-1] if is_tabled else players[0] for is_tabled in tabled
+    ]
+    if any(tabled):
+        assert Tabled.batches == [
+            ("vote", sum(tabled)),
+            ("nominate", sum(tabled)),
+        ]
@@ -0,0 +1,160 @@
+"""Tests for profiling the phases of a game."""
+
+import json
+
+from hypothesis import given, settings
+from hypothesis.strategies import integers, lists
+
+from dogma import DogmaGame
+from dogma.profiling import (
+    PHASES,
+    Histogram,
+    Profiler,
+    profile_chunk,
+    profile_games,
+)
+from dogma.strategies import all_strategies
+from dogma.tournament import play_game
+
+from .util import playergroups, seeds
+
+durations = lists(integers(min_value=1, max_value=10**9), max_size=20)
+
+
+@given(durations=durations)
+def test_histogram(durations):
+    """Test that a histogram counts each duration in the right bucket."""
+
+    histogram = Histogram()
+    for duration in durations:
+        histogram.add(duration)
+
+    exported = histogram.as_dict()
+    assert exported["count"] == len(durations)
+    assert exported["total"] == sum(durations)
+    assert sum(exported["buckets"].values()) == len(durations)
+    for bound, count in exported["buckets"].items():
+        assert count == sum(
+            int(bound) // 2 <= duration < int(bound) for duration in durations
+        )
+
+    if durations:
+        assert exported["min"] == min(durations)
+        assert exported["max"] == max(durations)
+        assert exported["mean"] == sum(durations) / len(durations)
+        assert histogram.quantile(1) > max(durations)
+        assert (
+            histogram.quantile(0) > min(durations) >= histogram.quantile(0) / 2
+        )
+    else:
+        assert exported["min"] is None
+        assert exported["mean"] is None
+        assert exported["p50"] is None
+
+
+@given(first=durations, second=durations)
+def test_histogram_merge(first, second):
+    """Test that merging histograms is the same as adding everything to
+    one."""
+
+    left, right, whole = Histogram(), Histogram(), Histogram()
+    for duration in first:
+        left.add(duration)
+        whole.add(duration)
+    for duration in second:
+        right.add(duration)
+        whole.add(duration)
+
+    left.merge(right)
+
+    assert left.as_dict() == whole.as_dict()
+
+
+@given(players=playergroups(), seed=seeds)
+def test_profiled_game(players, seed):
+    """Test that profiling a game times every turn and changes nothing about
+    how the game goes."""
+
+    profiler = Profiler()
+    game = DogmaGame(players, seed, profiler=profiler)
+    result = game.play(100)
+    counts = profiler.counts()
+
+    others = [type(player)(player.name) for player in players]
+    assert DogmaGame(others, seed).play(100) == result
+    assert game.profiler is profiler
+    assert profiler.games == 1
+    assert set(counts) == set(PHASES)
+    assert counts["turn"] == counts["dean"] == game.turns
+    assert counts["cast_vote"] == counts["form_print_team"] == game.turns
+    assert counts["form_publication"] <= game.turns
+    assert counts["win_checks"] >= counts["turn"] - 1
+
+
+@given(players=playergroups(), seed=seeds)
+def test_profiled_steps(players, seed):
+    """Test that the turns of a profiled game are timed when they are played
+    out from their steps."""
+
+    profiler = Profiler()
+    game = DogmaGame(players, seed, profiler=profiler)
+    game.assign_roles()
+    game.inform_mavericks()
+    over = False
+    while not over and game.turns < 100:
+        over = game.run(game.turn_steps())
+    counts = profiler.counts()
+
+    assert counts["turn"] == counts["dean"] == game.turns
+    assert counts["cast_vote"] == counts["form_print_team"] == game.turns
+    assert counts["form_publication"] <= game.turns
+    assert profiler.histograms["turn"].total > 0
+
+
+@given(players=playergroups(), seed=seeds)
+def test_clone_is_not_profiled(players, seed):
+    """Test that a clone of a profiled game is not profiled."""
+
+    profiler = Profiler()
+    game = DogmaGame(players, seed, profiler=profiler)
+    game.assign_roles()
+    game.inform_mavericks()
+    clone = game.clone()
+    clone.turn()
+
+    assert clone.profiler is None
+    assert all(count == 0 for count in profiler.counts().values())
+    assert "turn" in vars(game)
+    assert "turn_steps" in vars(game)
+    assert "turn" not in vars(clone)
+    assert "turn_steps" not in vars(clone)
+
+
+@settings(deadline=None, max_examples=5)
+@given(seed=seeds)
+def test_profile_games(seed):
+    """Test that profiling a batch of games in one or more processes gives
+    the same counts, and can be exported as JSON."""
+
+    seeds_ = range(seed, seed + 8)
+    serial = profile_games(None, (5, 6), seeds_, 100, chunksize=3)
+    parallel = profile_games(None, (5, 6), seeds_, 100, 2, chunksize=3)
+
+    assert serial.games == parallel.games == 16
+    assert serial.counts() == parallel.counts()
+    assert json.loads(json.dumps(serial.export()))["games"] == 16
+
+
+@given(seed=seeds)
+def test_profile_chunk(seed):
+    """Test that a chunk is played with the same results whether or not it is
+    profiled."""
+
+    profiler = profile_chunk((all_strategies, 5, [seed], 100))
+    turns = profiler.counts()["turn"]
+
+    assert profiler.games == 1
+    assert turns <= 100
+    assert play_game(all_strategies, 5, seed, 100, Profiler()) == play_game(
+        all_strategies, 5, seed, 100
+    )
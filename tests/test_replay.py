@@ -0,0 +1,108 @@
+"""Tests for the replay engine."""
+
+from hypothesis import given, settings
+from hypothesis.strategies import booleans, sampled_from
+
+from dogma import DogmaGame, Player
+from dogma.events import DECK, END, EventLog
+from dogma.game import OUTCOMES, STANDARD, Rules
+from dogma.replay import replay
+from dogma.strategies import Random
+
+from .util import seeds
+
+
+class Overruler(Random):
+    """A player who always wants to overrule."""
+
+    def choose_cards_to_submit(self, choices, overrule_available=False):
+
+        choices, reject, _ = super().choose_cards_to_submit(choices)
+
+        return choices, reject, overrule_available
+
+    def agree_to_overrule(self):
+
+        return True
+
+
+def played(seed, six, Strategy=Random, rules=STANDARD):
+    """Play a game with a log, taking a snapshot after every turn."""
+
+    players = [Strategy(str(seat)) for seat in range(5 + six)]
+    log = EventLog()
+    game = DogmaGame(players, seed, log, rules=rules)
+    game.assign_roles()
+    game.inform_mavericks()
+
+    snapshots = [game.snapshot()._replace(random=None)]
+    over = False
+    while not over:
+        over = game.turn()
+        snapshots.append(game.snapshot()._replace(random=None))
+
+    return game, log, snapshots
+
+
+@settings(deadline=None)
+@given(seed=seeds, six=booleans(), Strategy=sampled_from((Random, Overruler)))
+def test_replay(seed, six, Strategy):
+    """Test that a game can be rebuilt as it was after any turn, without
+    consulting any strategy."""
+
+    game, log, snapshots = played(seed, six, Strategy)
+
+    for turns, snapshot in enumerate(snapshots):
+        rebuilt = replay(log, turns)
+        assert rebuilt.snapshot()._replace(random=None) == snapshot
+        assert all(type(player) is Player for player in rebuilt.players)
+
+    rebuilt = replay(log)
+    assert (rebuilt.winner, rebuilt.message) == (game.winner, game.message)
+    assert rebuilt.galileo.partner is rebuilt.maverick
+    assert [p.seen for p in rebuilt.players] == [p.seen for p in game.players]
+
+
+@settings(deadline=None)
+@given(seed=seeds, six=booleans())
+def test_replay_large_deck(seed, six):
+    """Test that a game with a deck too large for one event is rebuilt with
+    the whole deck, after every reshuffle."""
+
+    rules = Rules(journals_h=20, journals_g=12, win_h=12, win_g=10)
+    game, log, snapshots = played(seed, six, rules=rules)
+
+    assert [code for code, *_ in log][1:3] == [DECK, DECK]
+    for turns, snapshot in enumerate(snapshots):
+        rebuilt = replay(log, turns)
+        assert rebuilt.snapshot()._replace(random=None) == snapshot
+
+
+@given(seed=seeds)
+def test_replay_adjourned(seed):
+    """Test that a game cut short is logged and replayed as such."""
+
+    log = EventLog()
+    game = DogmaGame([Random(str(seat)) for seat in range(5)], seed, log)
+    assert game.play(max_turns=1) == OUTCOMES[5]
+
+    code, outcome, _, _ = list(log)[-1]
+    assert (code, outcome) == (END, 5)
+    assert replay(log).message == game.message
+    assert replay(log).turns == 1
+
+
+@given(seed=seeds)
+def test_clone_does_not_log(seed):
+    """Test that a clone of a logged game leaves the log alone."""
+
+    log = EventLog()
+    game = DogmaGame([Random(str(seat)) for seat in range(5)], seed, log)
+    game.assign_roles()
+    size = len(log)
+
+    clone = game.clone()
+    for _ in range(10):
+        clone.turn()
+
+    assert len(log) == size
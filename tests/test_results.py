@@ -0,0 +1,226 @@
+"""Tests for streaming game results to disk."""
+
+import json
+
+import pytest
+from hypothesis import given, settings
+from hypothesis.strategies import integers, sampled_from
+
+from dogma import DogmaGame
+from dogma.deck import EmptyDeckError
+from dogma.events import END, EventLog
+from dogma.game import OUTCOMES
+from dogma.results import (
+    FIELDS,
+    CSVSink,
+    NDJSONSink,
+    ParquetSink,
+    last_line,
+    open_sink,
+    record_game,
+    record_games,
+    remaining,
+    repair_lines,
+    stream_results,
+)
+from dogma.strategies import all_strategies
+from dogma.tournament import play_game
+
+from .util import seeds
+
+number_of_players = integers(min_value=5, max_value=6)
+
+
+@given(number_of_players=number_of_players, seed=seeds)
+def test_record_game(number_of_players, seed):
+    """Test that a record of a game matches the result of playing it."""
+
+    record = record_game(all_strategies, number_of_players, seed, 100)
+
+    assert tuple(record) == FIELDS
+    assert record["seed"] == seed
+    assert record["players"] == number_of_players
+    assert len(record["strategies"].split(",")) == number_of_players
+    assert sorted(record["roles"]) == sorted(
+        "C" * (number_of_players - 2) + "GM"
+    )
+    assert (record["winner"], record["message"]) == play_game(
+        all_strategies, number_of_players, seed, 100
+    )
+    assert record["turns"] <= 100
+
+
+@given(number_of_players=number_of_players, seed=seeds)
+def test_record_game_history(number_of_players, seed):
+    """Test that a record can carry the event log of its game."""
+
+    record = record_game(all_strategies, number_of_players, seed, 100, True)
+    log = EventLog(record.pop("events"))
+    *_, (code, outcome, _, _) = log
+
+    assert record == record_game(all_strategies, number_of_players, seed, 100)
+    assert code == END
+    assert OUTCOMES[outcome] == (record["winner"], record["message"])
+
+
+def test_record_game_exhausted_deck(monkeypatch):
+    """Test that a game which runs out of journal cards is recorded as
+    such."""
+
+    def exhaust(game, num=3):
+        raise EmptyDeckError
+
+    monkeypatch.setattr(DogmaGame, "draw_journals", exhaust)
+    record = record_game(all_strategies, 5, 0)
+
+    assert (record["winner"], record["message"]) == OUTCOMES[-1]
+
+
+@settings(deadline=None, max_examples=5)
+@given(number_of_players=number_of_players)
+def test_record_games(number_of_players):
+    """Test that games are recorded in seed order, however many processes
+    play them."""
+
+    seeds_ = range(30)
+    serial = list(record_games(None, number_of_players, seeds_))
+    parallel = list(
+        record_games(None, number_of_players, seeds_, processes=2, chunksize=2)
+    )
+
+    assert [record["seed"] for record in serial] == list(seeds_)
+    assert parallel == serial
+
+
+@given(last=sampled_from((None, 0, 3, 9)))
+def test_remaining(last):
+    """Test that only the seeds after the last one committed are left."""
+
+    start = 0 if last is None else last + 1
+
+    assert list(remaining(range(10), last)) == list(range(start, 10))
+
+
+def test_remaining_unknown():
+    """Test that a last seed that is not among the seeds is refused."""
+
+    with pytest.raises(ValueError, match="not one of the seeds"):
+        remaining(range(10), 10)
+
+
+def test_last_line(tmp_path):
+    """Test that the last complete line of a file is found, leaving out
+    anything partly written after it, and that the file is not changed."""
+
+    path = tmp_path / "lines"
+    path.write_bytes(b"")
+    assert last_line(path) is None
+
+    path.write_bytes(b"partial")
+    assert last_line(path) is None
+    assert path.read_bytes() == b"partial"
+
+    long = b"x" * 5000
+    path.write_bytes(b"first\n" + long + b"\npartial")
+    assert last_line(path) == long
+    assert path.read_bytes() == b"first\n" + long + b"\npartial"
+
+    path.write_bytes(b"only\n")
+    assert last_line(path) == b"only"
+
+
+def test_repair_lines(tmp_path):
+    """Test that a file is cut back to its last complete line."""
+
+    path = tmp_path / "lines"
+    path.write_bytes(b"partial")
+    repair_lines(path)
+    assert path.read_bytes() == b""
+
+    long = b"x" * 5000
+    path.write_bytes(b"first\n" + long + b"\npartial")
+    repair_lines(path)
+    assert path.read_bytes() == b"first\n" + long + b"\n"
+
+    repair_lines(path)
+    assert path.read_bytes() == b"first\n" + long + b"\n"
+
+
+@pytest.mark.parametrize("name", ("results.ndjson", "results.csv"))
+def test_stream_results(tmp_path, name):
+    """Test that results are written in batches, and that a run picks up
+    after the last seed committed."""
+
+    path = tmp_path / name
+    assert open_sink(str(path)).last_seed() is None
+
+    assert stream_results(str(path), seeds=range(25), batch_size=10) == 25
+    assert open_sink(str(path)).last_seed() == 24
+
+    with open(path, "a") as file:
+        file.write('{"seed": 25, "pla')
+    torn = path.read_bytes()
+
+    assert open_sink(str(path)).last_seed() == 24
+    assert path.read_bytes() == torn
+
+    assert stream_results(str(path), seeds=range(40), batch_size=10) == 15
+    assert open_sink(str(path)).last_seed() == 39
+
+    lines = path.read_text().splitlines()
+    if name.endswith(".csv"):
+        assert lines.pop(0) == ",".join(FIELDS)
+        seeds_ = [int(line.split(",")[0]) for line in lines]
+    else:
+        seeds_ = [json.loads(line)["seed"] for line in lines]
+
+    assert seeds_ == list(range(40))
+
+    with pytest.raises(ValueError):
+        stream_results(str(path), seeds=range(100, 110))
+
+
+def test_csv_header_only(tmp_path):
+    """Test that a CSV file with only its header has no last seed."""
+
+    path = tmp_path / "results.csv"
+    path.write_text(CSVSink.header)
+
+    assert CSVSink(str(path)).last_seed() is None
+
+
+def test_sink_batches(tmp_path):
+    """Test that nothing is written until a batch is full or the sink is
+    closed."""
+
+    path = tmp_path / "results.ndjson"
+    record = record_game(all_strategies, 5, 0)
+
+    with NDJSONSink(str(path), batch_size=2) as sink:
+        sink.write(record)
+        assert not path.exists()
+        sink.write(record)
+        assert len(path.read_text().splitlines()) == 2
+        sink.write(record)
+
+    assert len(path.read_text().splitlines()) == 3
+
+
+def test_parquet(tmp_path):
+    """Test that results can be written to a directory of Parquet files."""
+
+    parquet = pytest.importorskip("pyarrow.parquet")
+
+    path = tmp_path / "results"
+    assert isinstance(open_sink(str(path)), ParquetSink)
+    assert open_sink(str(path)).last_seed() is None
+
+    assert stream_results(str(path), seeds=range(25), batch_size=10) == 25
+    assert sorted(p.name for p in path.iterdir()) == [
+        f"part-{i:06d}.parquet" for i in range(3)
+    ]
+    assert stream_results(str(path), seeds=range(30), batch_size=10) == 5
+
+    table = parquet.read_table(str(path))
+    assert table.column_names == list(FIELDS)
+    assert table["seed"].to_pylist() == list(range(30))
@@ -0,0 +1,112 @@
+"""Tests for the Seating class."""
+
+from hypothesis import given
+from hypothesis.strategies import integers, lists
+
+from dogma.seating import Seating
+
+from .util import playergroups
+
+
+@given(players=playergroups())
+def test_init(players):
+    """Test that a seating plan seats everyone alive, in order."""
+
+    seating = Seating(players)
+
+    assert len(seating) == len(players)
+    assert seating.alive == 2 ** len(players) - 1
+    assert seating.eligible() == tuple(players)
+    assert seating.bits[None] == 0
+    for seat, player in enumerate(players):
+        assert seating.seats[player] == seat
+        assert player.seating is seating
+
+
+@given(players=playergroups())
+def test_init_denounced(players):
+    """Test that anyone already denounced is left out of the plan."""
+
+    players[1].denounced = True
+    seating = Seating(players)
+
+    assert seating.alive == 2 ** len(players) - 3
+    assert players[1] not in seating.eligible()
+    assert seating.next_player(players[0]) is players[2]
+
+
+@given(
+    players=playergroups(),
+    order=lists(integers(min_value=0, max_value=5), max_size=4),
+)
+def test_denounce(players, order):
+    """Test that denouncing players keeps the next player and the eligible
+    groups matching a search of the table."""
+
+    seating = Seating(players)
+    for seat in order:
+        players[seat % len(players)].denounced = True
+
+    alive = [player for player in players if not player.denounced]
+    assert seating.eligible() == tuple(alive)
+    for seat, player in enumerate(players):
+        following = next(
+            players[(seat + step) % len(players)]
+            for step in range(1, len(players) + 1)
+            if not players[(seat + step) % len(players)].denounced
+        )
+        assert seating.next_player(player) is following
+
+
+@given(players=playergroups())
+def test_reinstate(players):
+    """Test that a denounced player can be brought back."""
+
+    seating = Seating(players)
+    players[1].denounced = True
+    players[1].denounced = False
+
+    assert seating.eligible() == tuple(players)
+    assert seating.next_player(players[0]) is players[1]
+
+
+@given(players=playergroups())
+def test_eligible(players):
+    """Test that excluded players are left out, and that each group is only
+    built once."""
+
+    seating = Seating(players)
+    group = seating.eligible(players[0], None, players[2])
+
+    assert group == tuple(players[1:2] + players[3:])
+    assert seating.eligible(None, players[2], players[0]) is group
+
+
+@given(players=playergroups())
+def test_everyone_denounced(players):
+    """Test that with nobody left alive, each seat points at the next."""
+
+    seating = Seating(players)
+    for player in players:
+        player.denounced = True
+    seating.link()
+
+    assert seating.eligible() == ()
+    assert seating.next_player(players[-1]) is players[0]
+
+
+@given(players=playergroups())
+def test_copy(players):
+    """Test that denouncing someone in a copy of a seating leaves the original
+    and the players alone."""
+
+    seating = Seating(players)
+    other = seating.copy()
+    other.denounce(players[1])
+
+    assert other.is_denounced(players[1])
+    assert not seating.is_denounced(players[1])
+    assert players[1].denounced is False
+    assert players[1].seating is seating
+    assert other.next_player(players[0]) is players[2]
+    assert seating.next_player(players[0]) is players[1]
@@ -0,0 +1,407 @@
+"""Tests for the game server."""
+
+import asyncio
+import json
+
+import pytest
+from hypothesis import given
+from hypothesis.strategies import integers
+
+import dogma.server
+from dogma import DogmaGame
+from dogma.deck import EmptyDeckError
+from dogma.loadtest import fetch_stats, open_connection, scripted_client, send
+from dogma.server import Connection, Server, main, serve, view
+from dogma.strategies import Random
+
+from .util import seeds
+
+
+@given(number_of_players=integers(min_value=5, max_value=6), seed=seeds)
+def test_view(number_of_players, seed):
+    """Test that a player sees their own role and partner, and nobody
+    else's."""
+
+    players = [Random(str(i)) for i in range(number_of_players)]
+    game = DogmaGame(players, seed)
+    game.assign_roles()
+    game.inform_mavericks()
+    game.start_turn()
+    players[-1].denounced = True
+
+    for seat, player in enumerate(players):
+        seen = view(game, player)
+        assert json.loads(json.dumps(seen)) == seen
+        assert seen["seat"] == seat
+        assert seen["role"] == player.role
+        assert seen["dean"] == game.seat_of(game.dean)
+        assert seen["deck"] == 17
+        assert seen["denounced"] == [number_of_players - 1]
+        if player.role == "C":
+            assert seen["partner"] is None
+        else:
+            assert players[seen["partner"]].role in "GM"
+
+
+async def receive(reader):
+    """Read the next message from the server."""
+
+    return json.loads(await reader.readline())
+
+
+async def play_table(address, players=5, games=1):
+    """Fill a table with scripted clients and play their games."""
+
+    return await asyncio.gather(
+        *(
+            scripted_client(address, str(i), players, games, i)
+            for i in range(players)
+        )
+    )
+
+
+def run_server(test, **options):
+    """Run a test against a server started on a TCP port for it."""
+
+    async def run():
+
+        server = await Server(**options).start()
+        try:
+            return await test(server)
+        finally:
+            await server.close()
+
+    return asyncio.run(run())
+
+
+def test_play_games():
+    """Test that tables of scripted clients play their games through."""
+
+    async def test(server):
+
+        decisions = await play_table(server.address, 5, 2)
+        await play_table(server.address, 6, 1)
+        stats = await fetch_stats(server.address)
+
+        assert all(decisions)
+        assert stats["games"] == 3
+        assert stats["waiting"] == stats["playing"] == 0
+        assert stats["decisions"]["vote"]["count"] >= 15
+        assert sum(server.results.values()) == 3
+
+    run_server(test)
+
+
+def test_unix_socket(tmp_path):
+    """Test that the server can listen on a Unix socket."""
+
+    async def run():
+
+        path = str(tmp_path / "dogma.sock")
+        server = await Server().start(path=path)
+        assert server.address == path
+
+        await play_table(path)
+        stats = await fetch_stats(path)
+        await server.close()
+
+        assert stats["games"] == 1
+
+    asyncio.run(run())
+
+
+def test_seating_and_roles():
+    """Test that each client is told their seat, their role, and who their
+    partner is if they are a maverick."""
+
+    async def client(address, name):
+
+        reader, writer = await open_connection(address)
+        await send(writer, {"type": "join", "name": name, "players": 5})
+        seated = await receive(reader)
+        role = await receive(reader)
+        writer.close()
+
+        return seated, role
+
+    async def test(server):
+
+        replies = await asyncio.gather(
+            *(client(server.address, str(i)) for i in range(5))
+        )
+        roles = [role["role"] for _, role in replies]
+
+        assert sorted(roles) == ["C", "C", "C", "G", "M"]
+        for seat, (seated, role) in enumerate(replies):
+            assert seated["type"] == "seated"
+            assert seated["players"][seated["seat"]] == str(seat)
+            if role["role"] == "C":
+                assert role["partner"] is None
+            else:
+                partner = roles[role["partner"]]
+                assert {role["role"], partner} == {"G", "M"}
+
+    run_server(test, max_turns=10)
+
+
+async def stubborn_client(address, name, answer):
+    """Join a table and give the same answer to every decision."""
+
+    reader, writer = await open_connection(address)
+    await send(writer, {"type": "join", "name": name, "players": 5})
+    while True:
+        message = await receive(reader)
+        if message["type"] == "end":
+            break
+        if message["type"] == "decide" and answer is not None:
+            reply = {"type": "answer", "id": message["id"], "answer": answer}
+            await send(writer, reply)
+
+    writer.close()
+
+    return message
+
+
+def test_illegal_answers():
+    """Test that illegal answers are replaced by the defaults."""
+
+    async def test(server):
+
+        ends = await asyncio.gather(
+            *(
+                stubborn_client(server.address, str(i), "nonsense")
+                for i in range(5)
+            )
+        )
+
+        assert all(end["message"] for end in ends)
+        assert not server.timeouts
+
+    run_server(test, max_turns=30)
+
+
+def test_time_limit():
+    """Test that a client who never answers is timed out."""
+
+    async def test(server):
+
+        ends = await asyncio.gather(
+            *(stubborn_client(server.address, str(i), None) for i in range(5))
+        )
+
+        assert all(end["message"] for end in ends)
+        assert server.timeouts["vote"] > 0
+
+    run_server(test, max_turns=5, time_limit=0.001)
+
+
+def test_legal_answers():
+    """Test that legal answers to overrules and cards are taken."""
+
+    async def test(server):
+
+        ends = await asyncio.gather(
+            *(
+                stubborn_client(server.address, str(i), answer)
+                for i, answer in enumerate(
+                    [True, {"reject": "G", "overrule": True}] * 2 + ["yes"]
+                )
+            )
+        )
+
+        assert all(end["message"] for end in ends)
+
+    run_server(test, max_turns=30)
+
+
+def test_bad_messages():
+    """Test that the server says so when it cannot make sense of a
+    message."""
+
+    async def test(server):
+
+        reader, writer = await open_connection(server.address)
+        errors = []
+        for line in (b"not json\n", b"[]\n", b'{"type": "dance"}\n'):
+            writer.write(line)
+            errors.append(await receive(reader))
+        for size in (2, 7, 5.0, "5"):
+            await send(writer, {"type": "join", "players": size})
+            errors.append(await receive(reader))
+        await send(writer, {"type": "answer", "id": 7, "answer": "yes"})
+        writer.close()
+
+        assert [error["type"] for error in errors] == ["error"] * 7
+        assert (await fetch_stats(server.address))["waiting"] == 0
+
+    run_server(test)
+
+
+def test_join_twice():
+    """Test that a client who is already seated cannot join another table
+    until their game is over."""
+
+    async def test(server):
+
+        reader, writer = await open_connection(server.address)
+        for size in (5, 5, 6):
+            await send(
+                writer, {"type": "join", "name": "keen", "players": size}
+            )
+        errors = [await receive(reader) for _ in range(2)]
+        stats = await fetch_stats(server.address)
+        writer.close()
+
+        assert errors == [{"type": "error", "message": "already seated"}] * 2
+        assert stats["waiting"] == 1
+
+    run_server(test)
+
+
+def test_leaving():
+    """Test that a client who leaves the lobby gives up their seat, and that
+    one who leaves a game has their decisions made for them."""
+
+    async def test(server):
+
+        reader, writer = await open_connection(server.address)
+        await send(writer, {"type": "join", "name": "early", "players": 5})
+        await asyncio.sleep(0.01)
+        assert (await fetch_stats(server.address))["waiting"] == 1
+        writer.close()
+        await asyncio.sleep(0.01)
+        assert (await fetch_stats(server.address))["waiting"] == 0
+
+        reader, writer = await open_connection(server.address)
+        await send(writer, {"type": "join", "name": "quitter", "players": 5})
+        clients = asyncio.gather(
+            *(stubborn_client(server.address, str(i), "yes") for i in range(4))
+        )
+        await receive(reader)
+        writer.close()
+        ends = await clients
+
+        assert all(end["type"] == "end" for end in ends)
+
+    run_server(test, max_turns=20)
+
+
+def test_connection_gives_up_on_close():
+    """Test that closing a connection answers every request still waiting."""
+
+    class Writer:
+        def write(self, data):
+            pass
+
+        async def drain(self):
+            pass
+
+    async def run():
+
+        connection = Connection(None, Writer())
+        request = asyncio.ensure_future(connection.request({}))
+        await asyncio.sleep(0)
+        connection.close()
+        await connection.send({})
+
+        return await request
+
+    assert asyncio.run(run()) is None
+
+
+def test_serve_and_main(monkeypatch):
+    """Test that a server can be run until it is cancelled, and from the
+    command line."""
+
+    async def run():
+
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(serve(port=0), 0.05)
+
+    asyncio.run(run())
+
+    called = {}
+
+    async def fake_serve(*args, **options):
+        called.update(options, args=args)
+
+    monkeypatch.setattr(dogma.server, "serve", fake_serve)
+    main(["--port", "0", "--time-limit", "0.5"])
+
+    assert called["args"] == ("127.0.0.1", 0, None)
+    assert called["time_limit"] == 0.5
+
+
+class Scripted:
+    """A stand-in for a connection that gives the same answer to every
+    request."""
+
+    closed = False
+
+    def __init__(self, answer):
+
+        self.answer = answer
+        self.sent = []
+
+    async def request(self, message):
+
+        return self.answer
+
+    async def send(self, message):
+
+        self.sent.append(message)
+
+
+@given(seed=seeds)
+def test_remote_player_defaults(seed):
+    """Test that a remote player falls back on the defaults for every
+    decision when their answers make no sense."""
+
+    server = Server()
+    players = [
+        dogma.server.RemotePlayer(str(i), Scripted(0.5), server)
+        for i in range(5)
+    ]
+    game = DogmaGame(players, seed)
+    game.assign_roles()
+    player = players[0]
+
+    async def run():
+
+        return (
+            await player.nominate(players[1:]),
+            await player.vote(players[1]),
+            await player.choose_cards_to_submit(["H", "G"], True),
+            await player.agree_to_overrule(),
+            await player.denounce(players[2:]),
+        )
+
+    assert asyncio.run(run()) == (
+        players[1],
+        "no",
+        (["H"], "G", False),
+        False,
+        players[2],
+    )
+    assert server.histograms["denounce"].count == 1
+
+
+def test_exhausted_table(monkeypatch):
+    """Test that a game at a table that runs out of journal cards is
+    abandoned."""
+
+    def exhaust(game, num=3):
+        raise EmptyDeckError
+
+    monkeypatch.setattr(DogmaGame, "draw_journals", exhaust)
+    server = Server()
+    table = dogma.server.Table(0, 5, 0)
+    for i in range(5):
+        table.players.append(
+            dogma.server.RemotePlayer(str(i), Scripted(None), server)
+        )
+
+    winner, message = asyncio.run(table.play())
+
+    assert message == "The society has run out of journals to print."
+    assert table.players[0].connection.sent[-1]["type"] == "end"
@@ -0,0 +1,168 @@
+"""Tests for the exact outcome solver."""
+
+from fractions import Fraction
+
+from hypothesis import given, settings
+from hypothesis.strategies import booleans, integers, sampled_from
+
+from dogma.batch import simulate
+from dogma.game import EXHAUSTED, OUTCOMES, QUELLED, RHETORIC
+from dogma.solver import CODES, Solver, binomial, solve
+
+from .util import small_rules
+
+number_of_players = sampled_from((5, 6))
+
+
+def late_state(number_of_players, pressure=0, overrule_available=False):
+    """Make a state near the end of a game, with few states left to solve."""
+
+    alive = 2**number_of_players - 1
+    return (3, 3, 2, 2, 5, 4, pressure, overrule_available, alive, 1, -1, 2)
+
+
+@given(n=integers(min_value=0, max_value=10), k=integers(0, 10))
+def test_binomial(n, k):
+    """Test that the binomial coefficient counts subsets correctly."""
+
+    if k > n:
+        return
+
+    assert binomial(n, k) == binomial(n, n - k)
+    assert sum(binomial(n, i) for i in range(n + 1)) == 2**n
+
+
+@given(number_of_players=number_of_players)
+def test_init(number_of_players):
+    """Test that a solver knows the chance of a vote succeeding and who sits
+    where."""
+
+    solver = Solver(number_of_players, exact=True)
+
+    assert solver.success[5] == Fraction(1, 2)
+    assert solver.success[4] == Fraction(5, 16)
+    assert solver.seats[0b101] == [0, 2]
+    assert solver.following[0b101][0] == 2
+    assert solver.following[0b101][2] == 0
+    assert solver.following[0][1] == 1
+
+
+@given(
+    h=integers(min_value=0, max_value=11),
+    g=integers(min_value=0, max_value=6),
+    num=integers(min_value=1, max_value=3),
+)
+def test_draws(h, g, num):
+    """Test that every sequence of cards is drawn with the right probability,
+    and leaves the right cards behind."""
+
+    if h + g < num:
+        return
+
+    solver = Solver(5, exact=True)
+    sequences = solver.draws(h, g, num)
+
+    assert sum(probability for _, probability, _, _ in sequences) == 1
+    for cards, _, h_, g_ in sequences:
+        assert len(cards) == num
+        assert h - h_ == sum(cards)
+        assert g - g_ == num - sum(cards)
+
+
+@settings(deadline=None, max_examples=20)
+@given(
+    number_of_players=number_of_players,
+    pressure=integers(min_value=0, max_value=3),
+    overrule_available=booleans(),
+)
+def test_value(number_of_players, pressure, overrule_available):
+    """Test that the outcome probabilities of any state sum to one, and agree
+    whether they are computed exactly or not."""
+
+    state = late_state(number_of_players, pressure, overrule_available)
+    exact = Solver(number_of_players, exact=True).value(state)
+    approximate = Solver(number_of_players).value(state)
+
+    assert sum(exact) == 1
+    for p, q in zip(exact, approximate):
+        assert abs(p - q) < 1e-9
+
+
+@given(number_of_players=number_of_players)
+def test_solve_ring(number_of_players):
+    """Test that states with the pressure to print stuck are consistent with
+    one another: each is a failed vote away from the next."""
+
+    solver = Solver(number_of_players, exact=True)
+    state = late_state(number_of_players, pressure=3)
+    solver.value(state)
+
+    deans = solver.seats[state[8]]
+    for dean in deans:
+        member = state[:9] + (dean,) + state[10:]
+        following = solver.following[state[8]][dean]
+        after = state[:9] + (following,) + state[10:]
+
+        _, rest = solver.turn(member, cycle=True)
+        fail = 1 - solver.success[len(deans)]
+        expected = [r + fail * v for r, v in zip(rest, solver.cache[after])]
+        assert list(solver.cache[member]) == expected
+
+
+@given(number_of_players=number_of_players)
+def test_rhetoric(number_of_players):
+    """Test that nominating Galileo with three maverick publications is an
+    immediate win, whatever the cards."""
+
+    solver = Solver(number_of_players)
+    state = (0, 0, 0, 0, 3, 0, 0, False, 2**number_of_players - 1, 1, -1, -1)
+
+    assert solver.succeed(state, 0) == solver.outcome(RHETORIC)
+
+
+@given(number_of_players=number_of_players)
+def test_check_journal_count(number_of_players):
+    """Test that a team filling its journal slots ends the game."""
+
+    solver = Solver(number_of_players)
+    state = late_state(number_of_players)
+    quelled = state[:5] + (5,) + state[6:]
+
+    assert solver.check_journal_count(quelled) == solver.outcome(QUELLED)
+
+
+@given(number_of_players=number_of_players)
+def test_perform_emergency_actions_exhausted(number_of_players):
+    """Test that a game with too few cards left to peek at is abandoned."""
+
+    solver = Solver(number_of_players)
+    state = (1, 0, 1, 0, 3, 0, 0, False, 2**number_of_players - 1, 1, -1, 2)
+
+    assert solver.perform_emergency_actions(state) == solver.outcome(EXHAUSTED)
+
+
+def test_solve_matches_batch():
+    """Test that the batch engine agrees with the exact solution for a table
+    of five."""
+
+    probabilities = solve(5)
+    assert abs(sum(probabilities.values()) - 1) < 1e-9
+    assert set(probabilities) == {OUTCOMES[code] for code in CODES}
+
+    results = simulate(5, 200000, seed=1)
+    for outcome, p in probabilities.items():
+        error = (p * (1 - p) / 200000) ** 0.5
+        assert abs(results[outcome] / 200000 - p) <= 4 * error
+
+
+def test_solve_by_rules_matches_batch():
+    """Test that the batch engine agrees with the exact solution by other
+    rules than the standard ones."""
+
+    probabilities = solve(5, rules=small_rules)
+    assert abs(sum(probabilities.values()) - 1) < 1e-9
+
+    results = simulate(5, 200000, seed=1, rules=small_rules)
+    for outcome, p in probabilities.items():
+        error = (p * (1 - p) / 200000) ** 0.5
+        assert abs(results[outcome] / 200000 - p) <= 4 * error
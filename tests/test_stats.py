@@ -0,0 +1,258 @@
+"""Tests for the streaming summaries of games."""
+
+import math
+import statistics
+from collections import Counter
+
+import pytest
+from hypothesis import given, settings
+from hypothesis.strategies import integers, lists
+
+from dogma.results import record_game
+from dogma.stats import (
+    Moments,
+    Reservoir,
+    Summary,
+    make_jobs,
+    result,
+    summarise,
+    summarise_chunk,
+)
+from dogma.strategies import Random
+
+numbers = lists(integers(min_value=-1000, max_value=1000), max_size=50)
+
+
+def moments_of(values):
+    """Take in a list of numbers one at a time."""
+
+    moments = Moments()
+    for value in values:
+        moments.add(value)
+
+    return moments
+
+
+def assert_same_moments(moments, values):
+    """Check moments against those worked out from every number at once."""
+
+    assert moments.count == len(values)
+    if values:
+        assert moments.mean == pytest.approx(statistics.mean(values))
+        assert moments.minimum == min(values)
+        assert moments.maximum == max(values)
+    if len(values) > 1:
+        assert moments.variance == pytest.approx(
+            statistics.variance(values), abs=1e-6
+        )
+        assert moments.std == pytest.approx(math.sqrt(moments.variance))
+    else:
+        assert math.isnan(moments.variance)
+
+
+@given(values=numbers)
+def test_moments(values):
+    """Test that the running moments match those of the whole list."""
+
+    assert_same_moments(moments_of(values), values)
+
+
+@given(first=numbers, second=numbers, third=numbers)
+def test_merge_moments(first, second, third):
+    """Test that merging moments is the same as taking in every number, in
+    any grouping."""
+
+    left = moments_of(first).merge(moments_of(second)).merge(moments_of(third))
+    right = moments_of(first).merge(moments_of(second).merge(moments_of(third)))
+
+    for moments in (left, right):
+        assert_same_moments(moments, first + second + third)
+
+
+@given(
+    size=integers(min_value=1, max_value=10),
+    count=integers(min_value=0, max_value=30),
+    seed=integers(min_value=0, max_value=1000),
+)
+def test_reservoir(size, count, seed):
+    """Test that a reservoir keeps up to its size of the items it sees."""
+
+    reservoir = Reservoir(size, seed)
+    for item in range(count):
+        reservoir.add(item)
+
+    assert reservoir.seen == count
+    assert len(reservoir.items) == min(size, count)
+    assert len(set(reservoir.items)) == len(reservoir.items)
+    assert set(reservoir.items) <= set(range(count))
+
+
+@given(
+    sizes=lists(integers(min_value=1, max_value=6), min_size=2, max_size=2),
+    counts=lists(integers(min_value=0, max_value=20), min_size=2, max_size=2),
+    seed=integers(min_value=0, max_value=1000),
+)
+def test_merge_reservoirs(sizes, counts, seed):
+    """Test that a merged reservoir samples from both streams, up to the
+    smaller size."""
+
+    first, second = Reservoir(sizes[0], seed), Reservoir(sizes[1], seed + 1)
+    for item in range(counts[0]):
+        first.add(("first", item))
+    for item in range(counts[1]):
+        second.add(("second", item))
+    items = set(first.items) | set(second.items)
+
+    merged = first.merge(second)
+
+    assert merged.seen == sum(counts)
+    assert merged.size == min(sizes)
+    assert len(merged.items) == min(min(sizes), sum(counts))
+    assert set(merged.items) <= items
+
+
+def test_merged_reservoir_is_uniform():
+    """Test that every item is about as likely to be in a merged sample,
+    whichever stream it came from."""
+
+    picked = Counter()
+    trials = 4000
+    for trial in range(trials):
+        first, second = Reservoir(4, trial), Reservoir(4, -trial - 1)
+        for item in range(10):
+            first.add(item)
+        for item in range(10, 40):
+            second.add(item)
+        picked.update(first.merge(second).items)
+
+    for item in range(40):
+        assert picked[item] / trials == pytest.approx(0.1, abs=0.03)
+
+
+def test_result():
+    """Test that each role wins, loses or draws with its team."""
+
+    assert [result(role, "M") for role in "CMG"] == ["loss", "win", "win"]
+    assert [result(role, "C") for role in "CMG"] == ["win", "loss", "loss"]
+    assert [result(role, None) for role in "CMG"] == ["draw"] * 3
+
+
+def records(seeds, number_of_players=5, max_turns=100):
+    """Get the records of the games with some seeds."""
+
+    return [
+        record_game([Random], number_of_players, seed, max_turns)
+        for seed in seeds
+    ]
+
+
+def test_summary():
+    """Test that a summary counts the records it is fed."""
+
+    games = records(range(30))
+    summary = Summary(10, 0)
+    for record in games:
+        summary.add(record)
+
+    assert summary.games == 30
+    assert summary.teams == Counter(record["winner"] for record in games)
+    assert summary.messages == Counter(record["message"] for record in games)
+    assert sum(summary.outcomes.values()) == 30
+    assert sum(summary.seats.values()) == sum(summary.strategies.values())
+    assert sum(summary.strategies.values()) == 150
+    assert_same_moments(summary.turns, [record["turns"] for record in games])
+    assert summary.turns_by_players[5].count == 30
+    assert len(summary.sample.items) == 10
+
+    conformist = summary.teams["C"] / (summary.teams["C"] + summary.teams["M"])
+    assert summary.win_rates("players") == {5: pytest.approx(conformist)}
+
+    wins = sum(
+        result(role, record["winner"]) == "win"
+        for record in games
+        for role in record["roles"]
+    )
+    decided = 5 * sum(record["winner"] is not None for record in games)
+    assert summary.win_rates("strategies") == {
+        "Random": pytest.approx(wins / decided)
+    }
+    assert set(summary.win_rates("seats")) == set(range(5))
+
+
+@settings(deadline=None, max_examples=10)
+@given(cuts=lists(integers(min_value=0, max_value=40), min_size=2, max_size=2))
+def test_merge_summaries(cuts):
+    """Test that summaries of parts of the games merge into the summary of
+    them all, however they are split."""
+
+    games = records(range(40), 5, 30) + records(range(40), 6, 30)
+    low, high = sorted(cuts)
+    parts = (games[:low], games[low:high], games[high:])
+
+    whole = Summary(8, 0)
+    for record in games:
+        whole.add(record)
+
+    summaries = []
+    for index, part in enumerate(parts):
+        summary = Summary(8, index)
+        for record in part:
+            summary.add(record)
+        summaries.append(summary)
+    first, second, third = summaries
+    merged = first.merge(second).merge(third)
+
+    for name in ("teams", "messages", "outcomes", "players", "seats"):
+        assert getattr(merged, name) == getattr(whole, name)
+    assert merged.games == whole.games == 80
+    assert_same_moments(merged.turns, [record["turns"] for record in games])
+    for players in (5, 6):
+        assert_same_moments(
+            merged.turns_by_players[players],
+            [r["turns"] for r in games if r["players"] == players],
+        )
+    assert merged.sample.seen == 80
+    assert len(merged.sample.items) == 8
+
+
+def test_make_jobs():
+    """Test that every game appears in exactly one chunk."""
+
+    jobs = list(make_jobs([Random], (5, 6), range(25), 10, 7, 3))
+
+    assert len(jobs) == 8
+    for number_of_players in (5, 6):
+        seeds = [
+            seed
+            for _, n, chunk, _, _ in jobs
+            if n == number_of_players
+            for seed in chunk
+        ]
+        assert seeds == list(range(25))
+
+
+def test_summarise_chunk():
+    """Test that a chunk is summarised from the records of its games."""
+
+    summary = summarise_chunk(([Random], 6, range(10, 20), 50, 4))
+
+    assert summary.games == 10
+    assert summary.teams == Counter(
+        record["winner"] for record in records(range(10, 20), 6, 50)
+    )
+
+
+def test_summarise():
+    """Test that a run is summarised the same across several processes as
+    it is in one."""
+
+    serial = summarise(seeds=range(60), max_turns=50, chunksize=25)
+    parallel = summarise(
+        seeds=range(60), max_turns=50, processes=2, chunksize=25
+    )
+
+    assert serial.games == parallel.games == 120
+    for name in ("teams", "outcomes", "players", "seats", "strategies"):
+        assert getattr(serial, name) == getattr(parallel, name)
+    assert serial.turns.mean == pytest.approx(parallel.turns.mean)
+    assert serial.sample.items == parallel.sample.items
@@ -1,11 +1,23 @@
-""" Tests for the strategy classes. """
+"""Tests for the strategy classes."""
 
+import multiprocessing
 import random
 from collections import Counter
 
-from hypothesis import given
+import pytest
+from hypothesis import given, settings
+from hypothesis.strategies import integers, sampled_from
 
-from dogma import Player
+from dogma import DogmaGame, Player
+from dogma.deck import EmptyDeckError
+from dogma.strategies import ISMCTS, Random, ismcts
+from dogma.strategies.ismcts import (
+    RESUME,
+    Node,
+    Search,
+    information_set,
+    run_search,
+)
 
 from .util import decks, playergroups, players, seeds
 
@@ -14,9 +26,8 @@ from .util import decks, playergroups, players, seeds
 def test_nominate(seed, group):
     """Test that a player can nominate successfully from a group."""
 
-    random.seed(seed)
-
     player, ex_dean, ex_editor = group[:3]
+    player.random.seed(seed)
     nomination = player.nominate(group[3:])
 
     assert isinstance(nomination, Player)
@@ -61,3 +72,279 @@ def test_random_denounce(group):
     assert isinstance(denounced_player, Player)
     assert denounced_player in group[1:]
     assert denounced_player is not player
+
+
+@given(group=playergroups(), deck=decks())
+def test_ismcts_without_game(group, deck):
+    """Test that a searching player acts at random when not in a game."""
+
+    player = ISMCTS("foo")
+
+    assert player.nominate(group) in group
+    assert player.vote(group[0]) in ("yes", "no")
+    assert player.agree_to_overrule() in (True, False)
+    assert player.denounce(group) in group
+
+    choices, reject, _ = player.choose_cards_to_submit(deck[:3], True)
+    assert Counter(choices + [reject]) == Counter(deck[:3])
+
+
+def test_ismcts_budget():
+    """Test that a searching player needs some budget."""
+
+    with pytest.raises(ValueError):
+        ISMCTS("foo", iterations=None)
+
+
+@settings(deadline=None, max_examples=10)
+@given(seed=seeds, seat=integers(min_value=0, max_value=4))
+def test_ismcts_game(seed, seat):
+    """Test that a searching player can play a whole game, keeping its tree
+    for the length of that game only."""
+
+    players = [Random(str(i)) for i in range(5)]
+    player = players[seat] = ISMCTS(str(seat), iterations=5)
+    game = DogmaGame(players, seed)
+
+    winner, _ = game.play(100)
+
+    assert winner in ("C", "M", None)
+    assert player.tree_game is game
+    assert all(isinstance(node, Node) for node in player.tree.values())
+
+    tree = player.tree
+    players = [Random(str(i)) for i in range(5)]
+    players[seat] = player
+    player.denounced = False
+    game = DogmaGame(players, seed)
+    game.assign_roles()
+    game.inform_mavericks()
+    game.dean = players[seat - 1]
+    player.vote(player)
+    assert player.tree is not tree
+
+
+@settings(deadline=None, max_examples=5)
+@given(seed=seeds)
+def test_ismcts_time_limit(seed):
+    """Test that a searching player can work to a time limit instead."""
+
+    players = [Random(str(i)) for i in range(5)]
+    player = players[0] = ISMCTS("0", iterations=None, time_limit=0.001)
+    game = DogmaGame(players, seed)
+    game.assign_roles()
+    game.inform_mavericks()
+    game.dean = players[1]
+
+    assert player.vote(players[2]) in ("yes", "no")
+    assert sum(node.visits for node in player.tree.values()) >= 1
+
+
+def test_ismcts_processes():
+    """Test that searches can run in parallel, with their trees added
+    together."""
+
+    players = [Random(str(i)) for i in range(5)]
+    player = players[0] = ISMCTS("0", iterations=8, processes=2)
+    game = DogmaGame(players, 0)
+    game.assign_roles()
+    game.inform_mavericks()
+    game.dean = players[1]
+
+    player.vote(players[2])
+    pool = player.pool()
+    player.vote(players[2])
+
+    key = information_set(game, "vote", 2)
+    assert player.tree[key].visits == 16
+    assert player.pool() is pool
+
+    player.close()
+    assert player._pool is None
+    player.close()
+
+
+def test_ismcts_processes_in_worker(monkeypatch):
+    """Test that a player cannot search in several processes from within a
+    worker process, which cannot start processes of its own."""
+
+    players = [Random(str(i)) for i in range(5)]
+    player = players[0] = ISMCTS("0", iterations=8, processes=2)
+    game = DogmaGame(players, 0)
+    game.assign_roles()
+    game.inform_mavericks()
+    game.dean = players[1]
+
+    worker = multiprocessing.Process(daemon=True)
+    monkeypatch.setattr(ismcts, "current_process", lambda: worker)
+    with pytest.raises(ValueError):
+        player.vote(players[2])
+    assert player._pool is None
+
+
+@given(seed=seeds)
+def test_ismcts_seen(seed):
+    """Test that the cards a searching player has seen are used for as long as
+    they are still on top of the deck."""
+
+    players = [Random(str(i)) for i in range(5)]
+    player = players[0] = ISMCTS("0")
+    game = DogmaGame(players, seed)
+    player.game = game
+    assert player.top_cards() == ()
+
+    player.seen = game.deck.peek()
+    assert player.top_cards() == tuple(game.journal_cards[:3])
+
+    game.draw_journals()
+    assert player.top_cards() == ()
+
+
+@given(seed=seeds, role=sampled_from("CMG"))
+def test_search_deal(seed, role):
+    """Test that the worlds dealt out in a search fit what the player
+    knows."""
+
+    players = [Random(str(i)) for i in range(5)]
+    game = DogmaGame(players, seed)
+    game.assign_roles()
+    published = Counter(game.draw_journals())
+    game.publications = {"H": published["H"], "G": published["G"]}
+    game.deck.discard(game.draw_journals(1)[0])
+    hand = game.draw_journals()
+
+    search = Search(
+        game.snapshot(),
+        0,
+        role,
+        1,
+        hand,
+        ("G", "G", "G", "G", "G", "G"),
+        {},
+        random.Random(seed),
+        0.7,
+        10,
+    )
+    snapshot = search.determine("dean")
+
+    assert snapshot.roles[0] == role
+    assert sorted(snapshot.roles) == ["C", "C", "C", "G", "M"]
+    if role != "C":
+        assert {snapshot.roles[0], snapshot.roles[1]} == {"G", "M"}
+
+    assert list(snapshot.journal_cards[:3]) == hand
+    assert len(snapshot.journal_cards) == 13
+    assert len(snapshot.discard_pile) == 1
+    assert snapshot.random is None
+
+    cards = Counter(snapshot.journal_cards + snapshot.discard_pile)
+    assert cards + published == {"H": 11, "G": 6}
+
+
+def test_node():
+    """Test that a node tries each action, then follows UCB1."""
+
+    state = random.Random(0)
+    node = Node(("a", "b"))
+    first = node.select(state, 0.7)
+    node.update(first, 1)
+    second = node.select(state, 0.7)
+    node.update(second, 0)
+
+    assert {first, second} == {"a", "b"}
+    assert node.select(state, 0.7) == first
+    node.update(first, 1)
+    assert node.best() == first
+
+    other = Node(("a", "b"))
+    other.update("b", 1)
+    node.merge(other)
+    assert node.visits == 4
+    assert node.stats[second][0] == 1 + (second == "b")
+
+
+def searching_game(seed, publications):
+    """Set up a game in which a searching player is the dean, with a number of
+    maverick publications behind them."""
+
+    players = [Random(str(i)) for i in range(5)]
+    player = players[0] = ISMCTS("0", iterations=20)
+    game = DogmaGame(players, seed)
+    game.assign_roles()
+    game.inform_mavericks()
+    game.publications["H"] = publications
+    game.journal_cards = ["H"] * (11 - publications) + ["G"] * 6
+    game.dean, game.editor = players[:2]
+
+    return game, player
+
+
+@settings(deadline=None, max_examples=10)
+@given(seed=seeds)
+def test_ismcts_overrule(seed):
+    """Test that a searching dean can answer a suggested overrule."""
+
+    game, player = searching_game(seed, 5)
+    game.overrule_available = True
+    player.passed = game.draw_journals(2)
+
+    assert player.agree_to_overrule() in (True, False)
+
+
+@settings(deadline=None, max_examples=10)
+@given(seed=seeds)
+def test_ismcts_denounce(seed):
+    """Test that a searching dean can denounce another player."""
+
+    game, player = searching_game(seed, 4)
+    candidates = game._get_players_for_denouncement()
+
+    assert player.denounce(candidates) in candidates
+
+
+@given(seed=seeds)
+def test_search_reward(seed):
+    """Test that a playout without a winner is worth a half."""
+
+    game, player = searching_game(seed, 0)
+    search = Search(game.snapshot(), 0, "C", None, [], (), {}, None, 0.7, 10)
+    search.sim = game
+
+    assert search.reward() == 0.5
+    game.winner = "C"
+    assert search.reward() == 1
+
+
+def test_run_search():
+    """Test that a search run in a worker sends back its tree."""
+
+    game, player = searching_game(0, 0)
+    search = Search(
+        game.snapshot(), 0, "C", None, [], (), {}, random.Random(0), 0.7, 10
+    )
+    tree = run_search(search, "nominate", (), 3, None)
+
+    assert sum(node.visits for node in tree.values()) >= 3
+
+
+def test_exhausted_playout(monkeypatch):
+    """Test that a playout which runs out of journals is worth a half."""
+
+    game, player = searching_game(0, 0)
+    search = Search(
+        game.snapshot(), 0, "C", None, [], (), {}, random.Random(0), 0.7, 10
+    )
+    resume = RESUME["nominate"]
+
+    def exhaust(sim, *args):
+        resume(sim, *args)
+        raise EmptyDeckError
+
+    monkeypatch.setitem(RESUME, "nominate", exhaust)
+    tree = search.run("nominate", (), 5)
+
+    nodes = list(tree.values())
+    assert sum(node.visits for node in nodes) >= 5
+    for node in nodes:
+        for n, total in node.stats.values():
+            assert total == n / 2
@@ -0,0 +1,150 @@
+"""Tests for the sweep over a grid of rules."""
+
+import json
+
+import pytest
+from hypothesis import given
+from hypothesis.strategies import integers, lists
+
+from dogma.game import OUTCOMES, STANDARD, Rules
+from dogma.strategies import all_strategies
+from dogma.sweep import (
+    Cell,
+    make_grid,
+    play_cell,
+    read_checkpoint,
+    run_sweep,
+    shard_of,
+    write_checkpoint,
+)
+from dogma.tournament import play_game
+
+AXES = {"journals_h": [10, 11], "denounce": [(4, 5), (4,)]}
+
+
+@given(
+    helio=lists(integers(min_value=5, max_value=15), min_size=1, unique=True),
+    geo=lists(integers(min_value=3, max_value=8), min_size=1, unique=True),
+    counts=lists(integers(min_value=5, max_value=10), min_size=1, unique=True),
+)
+def test_make_grid(helio, geo, counts):
+    """Test that the grid has a cell for every combination of values."""
+
+    cells = list(make_grid({"journals_h": helio, "win_g": geo}, counts))
+
+    assert len(cells) == len(set(cells)) == len(helio) * len(geo) * len(counts)
+    for cell in cells:
+        assert cell.rules.journals_h in helio
+        assert cell.rules.win_g in geo
+        assert cell.players in counts
+        assert (
+            cell.rules._replace(
+                journals_h=STANDARD.journals_h, win_g=STANDARD.win_g
+            )
+            == STANDARD
+        )
+
+
+def test_make_grid_unknown_rule():
+    """Test that a grid cannot sweep a rule that does not exist."""
+
+    with pytest.raises(ValueError):
+        list(make_grid({"journals": [1]}))
+
+
+@given(count=integers(min_value=1, max_value=5))
+def test_shard_of(count):
+    """Test that the shards of a grid split it between them."""
+
+    cells = list(make_grid(AXES, (5, 6)))
+    shards = [shard_of(iter(cells), (index, count)) for index in range(count)]
+
+    assert sorted(sum(shards, [])) == sorted(cells)
+    assert max(map(len, shards)) - min(map(len, shards)) <= 1
+    assert shard_of(iter(cells), None) == cells
+    with pytest.raises(ValueError):
+        shard_of(cells, (count, count))
+
+
+def test_cell_json():
+    """Test that a cell comes back from JSON as it went in."""
+
+    for cell in make_grid(AXES, (5, 7)):
+        data = json.loads(json.dumps(cell.to_json()))
+        assert Cell.from_json(data) == cell
+
+
+def test_play_cell():
+    """Test that a cell counts the outcomes of its games by their rules."""
+
+    cell = Cell(Rules(journals_h=9, win_h=4), 6)
+    _, counts = play_cell((cell, all_strategies, range(20), 100))
+
+    assert sum(counts) == 20
+    for seed in range(20):
+        outcome = play_game(all_strategies, 6, seed, 100, rules=cell.rules)
+        assert counts[OUTCOMES.index(outcome)]
+
+
+def test_run_sweep(tmp_path):
+    """Test that a sweep plays every cell and checkpoints it."""
+
+    path = str(tmp_path / "sweep.ndjson")
+    results = run_sweep(path, AXES, (5, 6), seeds=range(10), max_turns=100)
+
+    assert list(results) == list(make_grid(AXES, (5, 6)))
+    for cell, counts in results.items():
+        assert sum(counts.values()) == 10
+        _, expected = play_cell((cell, all_strategies, range(10), 100))
+        assert read_checkpoint(path)[cell] == expected
+
+
+def test_run_sweep_in_processes(tmp_path):
+    """Test that a sweep in a pool of workers gets the same results."""
+
+    path = str(tmp_path / "sweep.ndjson")
+    other = str(tmp_path / "other.ndjson")
+
+    assert run_sweep(path, AXES, seeds=range(10), processes=2) == run_sweep(
+        other, AXES, seeds=range(10)
+    )
+
+
+def test_resume(tmp_path, monkeypatch):
+    """Test that a sweep picks up where an interrupted one left off, without
+    playing any finished cell again, and that a torn line is thrown away."""
+
+    path = str(tmp_path / "sweep.ndjson")
+    cells = list(make_grid(AXES))
+    for cell in cells[:2]:
+        write_checkpoint(
+            path, cell, play_cell((cell, all_strategies, [], 1))[1]
+        )
+    with open(path, "a") as file:
+        file.write('{"cell": {"journals_h"')
+
+    played = []
+
+    def play(job):
+        played.append(job[0])
+        return play_cell(job)
+
+    monkeypatch.setattr("dogma.sweep.play_cell", play)
+    results = run_sweep(path, AXES, seeds=range(5))
+
+    assert played == cells[2:]
+    assert list(results) == cells
+    assert not sum(results[cells[0]].values())
+    assert sum(results[cells[-1]].values()) == 5
+    assert read_checkpoint(path).keys() == set(cells)
+
+
+def test_read_missing_checkpoint(tmp_path):
+    """Test that there is nothing done without a checkpoint."""
+
+    path = tmp_path / "sweep.ndjson"
+    assert read_checkpoint(str(path)) == {}
+
+    path.write_text('{"cell"')
+    assert read_checkpoint(str(path)) == {}
+    assert path.read_text() == '{"cell"'
@@ -0,0 +1,295 @@
+"""Tests for the tournament runner."""
+
+from collections import Counter
+
+import pytest
+from hypothesis import given, settings
+from hypothesis.strategies import integers, lists, sampled_from
+
+from dogma import DogmaGame
+from dogma.deck import EmptyDeckError
+from dogma.game import OUTCOMES
+from dogma.strategies import Random, all_strategies
+from dogma.tournament import (
+    Matchup,
+    all_lineups,
+    choose_lineup,
+    make_chunks,
+    play_batch,
+    play_chunk,
+    play_game,
+    play_lineup,
+    run_sequential,
+    run_tournament,
+    wilson,
+)
+
+from .util import Agreeable, seeds
+
+counts = lists(
+    integers(min_value=5, max_value=6), min_size=1, max_size=2, unique=True
+)
+
+
+@given(
+    number_of_players=integers(min_value=5, max_value=6),
+    seed=seeds,
+)
+def test_choose_lineup(number_of_players, seed):
+    """Test that a lineup depends only on its seed."""
+
+    lineup = choose_lineup(all_strategies, number_of_players, seed)
+
+    assert len(lineup) == number_of_players
+    assert set(lineup) <= set(all_strategies)
+    assert lineup == choose_lineup(all_strategies, number_of_players, seed)
+
+
+@given(number_of_players=integers(min_value=5, max_value=6), seed=seeds)
+def test_play_game(number_of_players, seed):
+    """Test that a single game can be played reproducibly from its seed."""
+
+    result = play_game(all_strategies, number_of_players, seed)
+
+    assert result[0] in ("C", "M", None)
+    assert isinstance(result[1], str)
+    assert result == play_game(all_strategies, number_of_players, seed)
+
+
+@given(number_of_players=integers(min_value=5, max_value=6), seed=seeds)
+def test_play_game_turn_limit(number_of_players, seed):
+    """Test that a game which runs out of turns is abandoned."""
+
+    winner, message = play_game(all_strategies, number_of_players, seed, 1)
+
+    assert winner is None or "rhetorical" in message
+    assert message is not None
+
+
+def test_play_game_exhausted_deck(monkeypatch):
+    """Test that a game which runs out of journal cards is abandoned."""
+
+    def exhaust(game, num=3):
+        raise EmptyDeckError
+
+    monkeypatch.setattr(DogmaGame, "draw_journals", exhaust)
+    winner, message = play_game(all_strategies, 5, 0)
+
+    assert winner is None
+    assert "run out" in message
+
+
+@given(player_counts=counts, chunksize=integers(min_value=1, max_value=10))
+def test_make_chunks(player_counts, chunksize):
+    """Test that every game appears in exactly one chunk."""
+
+    chunks = list(
+        make_chunks(all_strategies, player_counts, range(25), 10, chunksize)
+    )
+
+    for number_of_players in player_counts:
+        seeds_ = [
+            seed
+            for _, n, chunk, _ in chunks
+            if n == number_of_players
+            for seed in chunk
+        ]
+        assert seeds_ == list(range(25))
+
+    assert all(len(chunk) <= chunksize for _, _, chunk, _ in chunks)
+
+
+@given(number_of_players=sampled_from((5, 6)))
+def test_play_chunk(number_of_players):
+    """Test that a chunk reports the counts of its results."""
+
+    chunk = (all_strategies, number_of_players, range(10), None)
+    n, results = play_chunk(chunk)
+
+    assert n == number_of_players
+    assert sum(results.values()) == 10
+
+
+@settings(deadline=None, max_examples=5)
+@given(player_counts=counts)
+def test_run_tournament_in_serial(player_counts):
+    """Test that a tournament can be run in a single process."""
+
+    results = run_tournament(
+        player_counts=player_counts, seeds=range(20), processes=1
+    )
+
+    assert set(results) == set(player_counts)
+    for number_of_players, outcomes in results.items():
+        assert sum(outcomes.values()) == 20
+        assert (
+            outcomes
+            == play_chunk((all_strategies, number_of_players, range(20), 1000))[
+                1
+            ]
+        )
+
+
+def test_run_tournament_in_parallel():
+    """Test that a tournament gives the same results across several processes
+    as it does in one."""
+
+    serial = run_tournament(seeds=range(50), processes=1)
+    parallel = run_tournament(seeds=range(50), processes=2, chunksize=7)
+
+    assert parallel == serial
+
+
+@given(
+    number_of_players=integers(min_value=5, max_value=6),
+    seed=seeds,
+    max_turns=integers(min_value=1, max_value=20),
+)
+def test_play_lineup(number_of_players, seed, max_turns):
+    """Test that a lineup plays as it would if it were drawn at random."""
+
+    lineup = choose_lineup(all_strategies, number_of_players, seed)
+
+    assert play_lineup(lineup, seed, max_turns) == play_game(
+        all_strategies, number_of_players, seed, max_turns
+    )
+
+
+@given(
+    games=integers(min_value=0, max_value=10_000),
+    share=integers(min_value=0, max_value=100),
+)
+def test_wilson(games, share):
+    """Test that the Wilson interval holds the rate and narrows as games are
+    added."""
+
+    wins = games * share // 100
+    low, high = wilson(wins, games)
+
+    assert 0 <= low <= high <= 1
+    if games:
+        assert low - 1e-9 <= wins / games <= high + 1e-9
+        wider = wilson(wins, games, 3)
+        assert wider[0] <= low + 1e-9 and high <= wider[1] + 1e-9
+
+        narrower = wilson(4 * wins, 4 * games)
+        assert narrower[1] - narrower[0] < high - low
+    else:
+        assert (low, high) == (0, 1)
+
+
+def test_wilson_value():
+    """Test the Wilson interval against a value worked out by hand."""
+
+    low, high = wilson(5, 10)
+
+    assert low == pytest.approx(0.2366, abs=1e-4)
+    assert high == pytest.approx(0.7634, abs=1e-4)
+
+
+@given(number_of_players=integers(min_value=5, max_value=8))
+def test_all_lineups(number_of_players):
+    """Test that there is a lineup for every mix of strategies."""
+
+    strategies = [Random, Agreeable]
+    lineups = all_lineups(strategies, number_of_players)
+
+    assert len(lineups) == number_of_players + 1
+    assert {lineup.count(Agreeable) for lineup in lineups} == set(
+        range(number_of_players + 1)
+    )
+
+
+def test_matchup():
+    """Test that a matchup counts the conformists' wins out of the games that
+    were decided."""
+
+    matchup = Matchup([Random] * 5)
+    assert matchup.rate is None
+    assert matchup.interval() == (0, 1)
+    assert not matchup.settled(0.5)
+
+    matchup.results.update(
+        {OUTCOMES[1]: 2, OUTCOMES[3]: 5, OUTCOMES[4]: 1, OUTCOMES[5]: 4}
+    )
+    assert (matchup.wins, matchup.decided) == (6, 8)
+    assert matchup.rate == 0.75
+    assert matchup.interval() == wilson(6, 8)
+
+    low, high = matchup.interval()
+    assert matchup.settled(high - low)
+    assert not matchup.settled(0.1)
+    assert matchup.settled(0.1, threshold=low / 2)
+    assert not matchup.settled(0.1, threshold=0.5)
+
+
+def test_play_batch():
+    """Test that a batch hands back its index with its results."""
+
+    lineup = (Random,) * 5
+    index, results = play_batch((3, lineup, range(10), 100))
+
+    assert index == 3
+    assert results == Counter(
+        play_lineup(lineup, seed, 100) for seed in range(10)
+    )
+
+
+@settings(deadline=None, max_examples=5)
+@given(
+    width=sampled_from((0.2, 0.3, 0.5)),
+    batch_size=integers(min_value=5, max_value=50),
+)
+def test_run_sequential(width, batch_size):
+    """Test that each lineup stops once its interval is narrow enough or the
+    seeds run out, and that it has played the seeds in order."""
+
+    lineups = all_lineups([Random, Agreeable], 5)[:3]
+    matchups = run_sequential(
+        lineups, range(300), batch_size, width, max_turns=100
+    )
+
+    assert [matchup.lineup for matchup in matchups] == lineups
+    for matchup in matchups:
+        low, high = matchup.interval()
+        assert matchup.games == 300 or high - low <= width
+        assert matchup.games % batch_size == 0 or matchup.games == 300
+
+        seeds = range(matchup.games)
+        _, results = play_batch((0, matchup.lineup, seeds, 100))
+        assert matchup.results == results
+
+        last = matchup.games % batch_size or batch_size
+        if matchup.games > last:
+            seeds = range(matchup.games - last)
+            matchup.results = play_batch((0, matchup.lineup, seeds, 100))[1]
+            low, high = matchup.interval()
+            assert high - low > width
+
+
+def test_run_sequential_threshold():
+    """Test that a threshold stops a lineup whose interval has cleared it,
+    while a lineup that it does not clear plays on."""
+
+    lineups = [(Agreeable,) * 5, (Random,) * 5]
+    kwargs = dict(batch_size=20, width=0.05, max_turns=100)
+    loose = run_sequential(lineups, range(400), threshold=0.99, **kwargs)
+    tight = run_sequential(lineups, range(400), **kwargs)
+
+    for matchup in loose:
+        low, high = matchup.interval()
+        assert matchup.games == 400 or not low <= 0.99 <= high
+    assert sum(m.games for m in loose) < sum(m.games for m in tight)
+
+
+def test_run_sequential_in_parallel():
+    """Test that a sequential tournament gives the same results across
+    several processes as it does in one."""
+
+    lineups = all_lineups([Random, Agreeable], 5)
+    serial = run_sequential(lineups, range(200), 25, 0.3, max_turns=100)
+    parallel = run_sequential(
+        lineups, range(200), 25, 0.3, max_turns=100, processes=2
+    )
+
+    assert [m.results for m in parallel] == [m.results for m in serial]
@@ -0,0 +1,144 @@
+"""Tests for the sampler of hidden worlds."""
+
+import random
+from collections import Counter
+
+import pytest
+from hypothesis import given
+from hypothesis.strategies import integers, sampled_from
+
+from dogma import DogmaGame
+from dogma.game import Rules
+from dogma.inference import RoleBelief
+from dogma.strategies import Random
+from dogma.worlds import WorldSampler
+
+from .util import seeds
+
+
+def dealt_game(seed, number_of_players=5):
+    """Get a game part of the way through, with a publication, a discard and
+    a dean's hand in play."""
+
+    players = [Random(str(i)) for i in range(number_of_players)]
+    game = DogmaGame(players, seed)
+    game.assign_roles()
+    game.inform_mavericks()
+    published = Counter(game.draw_journals())
+    game.publications = {"H": published["H"], "G": published["G"]}
+    discard = game.draw_journals(1)
+    game.deck.discard(discard[0])
+    hand = game.draw_journals()
+
+    return game, published, discard, hand
+
+
+@given(seed=seeds, seat=integers(min_value=0, max_value=4))
+def test_sample(seed, seat):
+    """Test that every world fits what the player knows."""
+
+    game, published, discard, hand = dealt_game(seed)
+    player = game.player_at(seat)
+    top = game.journal_cards[:3]
+    sampler = WorldSampler.from_game(game, player, hand, top, discard)
+
+    for world in sampler.samples(20, random.Random(seed)):
+        assert world.roles[seat] == player.role
+        assert sorted(world.roles) == ["C", "C", "C", "G", "M"]
+        if player.partner is not None:
+            partner = game.seat_of(player.partner)
+            assert world.roles[partner] == player.partner.role
+
+        assert world.journal_cards[:3] == top
+        assert world.discard_pile == discard
+        assert len(world.journal_cards) == len(game.journal_cards)
+        assert world.random is None
+
+        cards = Counter(world.journal_cards + world.discard_pile + hand)
+        assert cards + published == {"H": 11, "G": 6}
+
+
+@given(
+    seed=seeds,
+    number_of_players=integers(min_value=5, max_value=10),
+    denounced=integers(min_value=1, max_value=4),
+)
+def test_possible_roles(seed, number_of_players, denounced):
+    """Test that a conformist considers every deal but those where they or a
+    denounced player are Galileo."""
+
+    game, *_ = dealt_game(seed, number_of_players)
+    conformist = next(p for p in game.seating.players if p.role == "C")
+    seat = game.seat_of(conformist)
+    victim = game.player_at((seat + denounced) % number_of_players)
+    game.seating.denounce(victim)
+
+    sampler = WorldSampler.from_game(game, conformist)
+    others = number_of_players - 1
+
+    assert len(sampler.roles) == len(set(sampler.roles))
+    assert len(sampler.roles) == (others - 1) * (others - 1)
+    assert all(roles[game.seat_of(victim)] != "G" for roles in sampler.roles)
+    assert all(roles[seat] == "C" for roles in sampler.roles)
+
+
+@given(seed=seeds, role=sampled_from("GM"))
+def test_mavericks_know_the_roles(seed, role):
+    """Test that a maverick only ever deals out the true roles."""
+
+    game, *_ = dealt_game(seed)
+    player = game.galileo if role == "G" else game.maverick
+    sampler = WorldSampler.from_game(game, player)
+
+    assert sampler.roles == [tuple(p.role for p in game.seating.players)]
+
+
+@given(seed=seeds)
+def test_inconsistent_cards(seed):
+    """Test that cards that cannot be where the player thinks they are, are
+    left to chance."""
+
+    game, _, _, hand = dealt_game(seed)
+    snapshot = game.snapshot()
+    sampler = WorldSampler(snapshot, 0, "C", None, hand, "H" * 12, "G" * 7)
+
+    assert sampler.top == sampler.handled == []
+
+    sampler = WorldSampler(snapshot, 0, "C", None, hand, (), "GG")
+    assert sampler.handled == []
+
+    cards, discards = sampler.deal_cards(random.Random(seed))
+    assert len(cards) == len(game.journal_cards)
+    assert len(discards) == 1
+
+
+@given(seed=seeds)
+def test_weighted_by_belief(seed):
+    """Test that a belief weights the deals, and that those it rules out are
+    never dealt."""
+
+    game, *_ = dealt_game(seed)
+    belief = RoleBelief(5, 0)
+    belief.not_galileo(1)
+    belief.published(2, 3, "H")
+    sampler = WorldSampler(game.snapshot(), 0, "C", belief=belief)
+    state = random.Random(seed)
+
+    assert len(sampler.roles) == 9
+    assert sampler.weights[-1] == pytest.approx(1)
+    assert all(sampler.deal_roles(state)[1] != "G" for _ in range(50))
+
+
+@given(seed=seeds)
+def test_rules(seed):
+    """Test that the cards left to place are counted from the game's own
+    deck."""
+
+    players = [Random(str(i)) for i in range(5)]
+    game = DogmaGame(players, seed, rules=Rules(journals_h=14, journals_g=3))
+    game.assign_roles()
+    game.inform_mavericks()
+    sampler = WorldSampler.from_game(game, game.galileo)
+    world = sampler.sample(random.Random(seed))
+
+    assert Counter(world.journal_cards) == {"H": 14, "G": 3}
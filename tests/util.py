@@ -1,15 +1,35 @@
-""" Standard and custom strategies for hypothesis tests. """
+"""Standard and custom strategies for hypothesis tests."""
 
 import random
 
 from hypothesis.strategies import composite, integers, lists, sampled_from, text
 
 from dogma import DogmaGame
-from dogma.strategies import all_strategies
+from dogma.game import Rules
+from dogma.strategies import Random, all_strategies
 
 seeds = integers(min_value=0, max_value=1000)
 names = lists(text(), unique=True, min_size=5, max_size=6)
 strategies = lists(sampled_from(all_strategies), min_size=5, max_size=6)
+small_rules = Rules(
+    journals_h=6,
+    journals_g=5,
+    win_h=4,
+    win_g=3,
+    rhetoric=2,
+    peek=(2,),
+    denounce=(3,),
+    overrule=(2, 3),
+    pressure=2,
+)
+
+
+class Agreeable(Random):
+    """A player who votes for every print team."""
+
+    def vote(self, nominee):
+
+        return "yes"
 
 
 @composite